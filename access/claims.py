@@ -0,0 +1,57 @@
+from django.conf import settings
+
+from access.constants import (
+    PERMISSIONS_CLAIM,
+    POLICY_VERSION_CLAIM,
+    ROLE_CLAIM,
+    ROLE_ID_CLAIM,
+)
+from access.epoch import policy_epoch
+from access.policy import permission_matrix
+
+
+def permission_claims_enabled():
+    """Включён ли режим токенов с правами (PERMISSION_CLAIMS_ENABLED)."""
+    return getattr(settings, 'PERMISSION_CLAIMS_ENABLED', False)
+
+
+def add_permission_claims(token, user):
+    """
+    Записать в токен роль пользователя и маски его прав по ресурсам.
+
+    Claims помечаются эпохой политики доступа, прочитанной до сборки
+    масок: если политика поменяется в процессе, токен просто окажется
+    устаревшим, а не получит права новее своей версии.
+    """
+    version = policy_epoch.current()
+    role = user.role
+    token[ROLE_CLAIM] = role.name if role else None
+    token[ROLE_ID_CLAIM] = user.role_id
+    token[PERMISSIONS_CLAIM] = permission_matrix.get_role_masks(user.role_id)
+    token[POLICY_VERSION_CLAIM] = version
+    return token
+
+
+def get_permission_claims(token):
+    """
+    Вернуть токен, если по его claims можно принимать решения.
+
+    None — режим выключен, в токене нет claims или их версия
+    не совпадает с текущей эпохой политики: тогда права берутся из БД.
+    """
+    if token is None or not permission_claims_enabled():
+        return None
+    version = token.get(POLICY_VERSION_CLAIM)
+    if version is None or version != policy_epoch.current():
+        return None
+    return token
+
+
+async def aget_permission_claims(token):
+    """get_permission_claims() для асинхронного кода."""
+    if token is None or not permission_claims_enabled():
+        return None
+    version = token.get(POLICY_VERSION_CLAIM)
+    if version is None or version != await policy_epoch.acurrent():
+        return None
+    return token
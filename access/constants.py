@@ -1,2 +1,29 @@
 NAME_MAX_LENGTH = 128
 NAME_STR_WIDTH = 32
+
+# Флаги AccessRule и их биты в скомпилированной матрице прав
+PERMISSION_FIELDS = (
+    'read_owned_permission',
+    'read_all_permission',
+    'create_permission',
+    'update_owned_permission',
+    'update_all_permission',
+    'delete_owned_permission',
+    'delete_all_permission',
+)
+PERMISSION_BITS = {
+    field: 1 << index for index, field in enumerate(PERMISSION_FIELDS)
+}
+
+# Канал Postgres NOTIFY для оповещений о смене эпохи политики доступа
+POLICY_EPOCH_CHANNEL = 'access_policy_epoch'
+# Интервал опроса эпохи (в секундах), если LISTEN/NOTIFY недоступен
+POLICY_EPOCH_POLL_INTERVAL = 1.0
+# Пауза перед переподключением слушателя после ошибки (в секундах)
+POLICY_EPOCH_RECONNECT_DELAY = 1.0
+
+# Claims токена с правами пользователя (включаются PERMISSION_CLAIMS_ENABLED)
+ROLE_CLAIM = 'role'
+ROLE_ID_CLAIM = 'role_id'
+PERMISSIONS_CLAIM = 'perms'
+POLICY_VERSION_CLAIM = 'pv'
@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import os
+import time
+from threading import Lock, Thread
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import F
+
+from access.constants import (
+    POLICY_EPOCH_CHANNEL,
+    POLICY_EPOCH_POLL_INTERVAL,
+    POLICY_EPOCH_RECONNECT_DELAY,
+)
+
+logger = logging.getLogger(__name__)
+
+# Как долго слушатель ждёт оповещения, прежде чем проверить соединение
+LISTEN_TIMEOUT = 5.0
+
+
+def in_event_loop():
+    """Выполняется ли код в потоке с запущенным циклом asyncio."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class PolicyEpoch:
+    """
+    Эпоха политики доступа, общая для всех процессов.
+
+    publish() увеличивает эпоху в БД и рассылает её через Postgres
+    NOTIFY. Каждый процесс держит фоновый поток с LISTEN, который
+    обновляет локальное значение эпохи; current() при этом не ходит
+    в БД. Кэши авторизации запоминают эпоху, с которой были собраны,
+    и лениво сбрасываются, когда current() её обгоняет.
+
+    Если LISTEN недоступен (SQLite в тестах, обрыв соединения),
+    current() опрашивает таблицу эпохи не чаще раза
+    в POLICY_EPOCH_POLL_INTERVAL секунд.
+    """
+
+    def __init__(self, using=DEFAULT_DB_ALIAS):
+        self.using = using
+        self._value = None
+        self._checked_at = 0.0
+        self._listening = False
+        self._listener_pid = None
+        self._lock = Lock()
+
+    @property
+    def channel(self):
+        return getattr(settings, 'POLICY_EPOCH_CHANNEL', POLICY_EPOCH_CHANNEL)
+
+    @property
+    def poll_interval(self):
+        return getattr(
+            settings, 'POLICY_EPOCH_POLL_INTERVAL', POLICY_EPOCH_POLL_INTERVAL
+        )
+
+    def _read(self):
+        from access.models import PolicyEpoch as PolicyEpochModel
+
+        value = (
+            PolicyEpochModel.objects.using(self.using)
+            .filter(pk=1)
+            .values_list('value', flat=True)
+            .first()
+        )
+        return value or 0
+
+    def _advance(self, value):
+        # Эпоха только растёт: запоздавшие оповещения ничего не откатывают
+        with self._lock:
+            if self._value is None or value > self._value:
+                self._value = value
+
+    def _poll_due(self):
+        if connections[self.using].vendor == 'postgresql':
+            self._ensure_listener()
+        if self._listening and self._value is not None:
+            return False
+        return (
+            self._value is None
+            or time.monotonic() - self._checked_at >= self.poll_interval
+        )
+
+    def _poll(self):
+        self._advance(self._read())
+        self._checked_at = time.monotonic()
+
+    def current(self):
+        """
+        Текущая известная процессу эпоха политики доступа.
+
+        В потоке цикла asyncio БД не опрашивается: асинхронный код
+        обновляет эпоху через acurrent() в начале запроса.
+        """
+        if self._poll_due() and not in_event_loop():
+            self._poll()
+        return self._value
+
+    async def acurrent(self):
+        """current() для асинхронного кода: опрос БД выполняется в потоке."""
+        if self._poll_due():
+            await sync_to_async(self._poll)()
+        return self._value
+
+    def publish(self):
+        """Увеличить эпоху и оповестить остальные процессы."""
+        from access.models import PolicyEpoch as PolicyEpochModel
+
+        connection = connections[self.using]
+        with transaction.atomic(using=self.using):
+            queryset = PolicyEpochModel.objects.using(self.using).filter(pk=1)
+            if not queryset.update(value=F('value') + 1):
+                PolicyEpochModel.objects.using(self.using).get_or_create(
+                    pk=1, defaults={'value': 1}
+                )
+            value = self._read()
+            if connection.vendor == 'postgresql':
+                # NOTIFY доставляется только после коммита транзакции
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        'SELECT pg_notify(%s, %s)', [self.channel, str(value)]
+                    )
+            transaction.on_commit(lambda: self._advance(value), using=self.using)
+        return value
+
+    def _ensure_listener(self):
+        # После fork поток слушателя родителя в дочернем процессе не живёт
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        with self._lock:
+            if self._listener_pid == pid:
+                return
+            self._listening = False
+            self._listener_pid = pid
+            Thread(
+                target=self._listen,
+                name='policy-epoch-listener',
+                daemon=True,
+            ).start()
+
+    def _listen(self):
+        from access.models import PolicyEpoch as PolicyEpochModel
+
+        table = PolicyEpochModel._meta.db_table
+        delay = getattr(
+            settings, 'POLICY_EPOCH_RECONNECT_DELAY', POLICY_EPOCH_RECONNECT_DELAY
+        )
+        while True:
+            raw_connection = None
+            try:
+                # Отдельное соединение мимо пула: слушатель держит его всегда
+                connection = connections[self.using]
+                raw_connection = connection.Database.connect(
+                    **connection.get_connection_params(), autocommit=True
+                )
+                with raw_connection.cursor() as cursor:
+                    cursor.execute(
+                        f'LISTEN {connection.ops.quote_name(self.channel)}'
+                    )
+                    # Перечитываем эпоху уже после подписки, чтобы
+                    # не пропустить изменения, сделанные до LISTEN
+                    cursor.execute(
+                        f'SELECT value FROM {table} WHERE id = 1'  # noqa: S608
+                    )
+                    row = cursor.fetchone()
+                self._advance(row[0] if row else 0)
+                self._listening = True
+
+                while True:
+                    for notify in raw_connection.notifies(timeout=LISTEN_TIMEOUT):
+                        self._advance(int(notify.payload))
+            except Exception:
+                logger.exception('Слушатель эпохи политики доступа упал')
+            finally:
+                self._listening = False
+                if raw_connection is not None:
+                    try:
+                        raw_connection.close()
+                    except Exception:
+                        logger.debug('Не удалось закрыть соединение слушателя')
+            time.sleep(delay)
+
+
+policy_epoch = PolicyEpoch()
@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-18 19:44
+
+from django.db import migrations, models
+
+
+def create_policy_epoch(apps, schema_editor):
+    PolicyEpoch = apps.get_model('access', 'PolicyEpoch')
+    PolicyEpoch.objects.using(schema_editor.connection.alias).get_or_create(pk=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('access', '0003_alter_role_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PolicyEpoch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('value', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_policy_epoch, migrations.RunPython.noop),
+    ]
@@ -61,3 +61,18 @@ class AccessRule(models.Model):
 
     def __str__(self):
         return f'{self.role} → {self.business_resource.name}'
+
+
+class PolicyEpoch(models.Model):
+    """
+    Эпоха политики доступа.
+
+    Единственная строка, значение которой монотонно растёт при каждом
+    изменении правил, ролей или ресурсов. По ней процессы понимают,
+    что их кэши авторизации устарели.
+    """
+
+    value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return str(self.value)
@@ -0,0 +1,102 @@
+from threading import Lock
+
+from asgiref.sync import sync_to_async
+
+from access.constants import PERMISSION_BITS, PERMISSION_FIELDS
+from access.epoch import policy_epoch
+
+
+class PermissionMatrix:
+    """
+    Скомпилированная матрица прав роль × бизнес-ресурс.
+
+    Загружается из AccessRule один раз на процесс при первом обращении
+    и хранит для каждой пары (role_id, resource_name) битовую маску
+    флагов *_permission. Проверка права — один поиск в словаре.
+    Сбрасывается сигналами при изменении AccessRule, Role
+    и BusinessResource (см. access.signals) в своём процессе
+    и лениво — при смене эпохи политики доступа в других процессах.
+    """
+
+    def __init__(self):
+        self._masks = None
+        self._epoch = None
+        self._generation = 0
+        self._lock = Lock()
+
+    def _load(self):
+        from access.models import AccessRule
+
+        masks = {}
+        # Матрица помечается эпохой основной БД — и читается оттуда же,
+        # а не с реплики, которая может отставать
+        rows = AccessRule.objects.using(policy_epoch.using).values_list(
+            'role_id', 'business_resource__name', *PERMISSION_FIELDS
+        )
+        for role_id, resource_name, *flags in rows:
+            mask = 0
+            for field, granted in zip(PERMISSION_FIELDS, flags, strict=True):
+                if granted:
+                    mask |= PERMISSION_BITS[field]
+            masks[(role_id, resource_name)] = mask
+        return masks
+
+    def get_masks(self):
+        """Словарь {(role_id, resource_name): маска}, загружается лениво."""
+        epoch = policy_epoch.current()
+        masks = self._masks
+        if masks is None or self._epoch != epoch:
+            with self._lock:
+                if self._masks is not None and self._epoch == epoch:
+                    return self._masks
+                generation = self._generation
+                masks = self._load()
+                # Матрицу сбросили во время загрузки — не кэшируем устаревшее
+                if generation == self._generation:
+                    self._masks = masks
+                    self._epoch = epoch
+        return masks
+
+    def get_mask(self, role_id, resource_name):
+        """Маска прав роли на ресурс; 0, если правила нет."""
+        if role_id is None or not resource_name:
+            return 0
+        return self.get_masks().get((role_id, resource_name), 0)
+
+    @staticmethod
+    def _select_role(masks, role_id):
+        return {
+            resource_name: mask
+            for (rule_role_id, resource_name), mask in masks.items()
+            if rule_role_id == role_id
+        }
+
+    def get_role_masks(self, role_id):
+        """Маски прав роли по всем ресурсам: {resource_name: маска}."""
+        if role_id is None:
+            return {}
+        return self._select_role(self.get_masks(), role_id)
+
+    async def aget_role_masks(self, role_id):
+        """get_role_masks() для асинхронного кода: загрузка — в потоке."""
+        if role_id is None:
+            return {}
+        epoch = await policy_epoch.acurrent()
+        masks = self._masks
+        if masks is None or self._epoch != epoch:
+            masks = await sync_to_async(self.get_masks)()
+        return self._select_role(masks, role_id)
+
+    def has_permission(self, role_id, resource_name, permission):
+        """Есть ли у роли флаг permission (имя поля AccessRule) на ресурс."""
+        return bool(
+            self.get_mask(role_id, resource_name) & PERMISSION_BITS[permission]
+        )
+
+    def invalidate(self):
+        """Сбросить матрицу: следующий запрос перезагрузит её из БД."""
+        self._generation += 1
+        self._masks = None
+
+
+permission_matrix = PermissionMatrix()
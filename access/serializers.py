@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import serializers
 
 from access.models import AccessRule, Role, RoleEnum
@@ -42,7 +43,10 @@ class AccessRuleSerializer(serializers.ModelSerializer):
         )
 
     def update(self, instance, validated_data):
-        for field, value in validated_data.items():
-            setattr(instance, field, value)
-        instance.save()
+        # Правило и новая эпоха политики (см. access.signals)
+        # фиксируются одной транзакцией
+        with transaction.atomic():
+            for field, value in validated_data.items():
+                setattr(instance, field, value)
+            instance.save()
         return instance
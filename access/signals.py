@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from access.epoch import policy_epoch
+from access.models import AccessRule, Role
+from access.policy import permission_matrix
+from business_objects.models import BusinessResource
+
+
+@receiver(post_save, sender=AccessRule)
+@receiver(post_delete, sender=AccessRule)
+@receiver(post_save, sender=Role)
+@receiver(post_delete, sender=Role)
+@receiver(post_save, sender=BusinessResource)
+@receiver(post_delete, sender=BusinessResource)
+def invalidate_permission_matrix(sender, **kwargs):  # noqa: ARG001
+    """
+    Сбрасывает матрицу прав при изменении правил, ролей и ресурсов
+    и публикует новую эпоху политики для остальных процессов.
+    """
+    permission_matrix.invalidate()
+    policy_epoch.publish()
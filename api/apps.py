@@ -1,5 +1,17 @@
+import os
+
 from django.apps import AppConfig
 
 
 class ApiConfig(AppConfig):
     name = 'api'
+
+    def ready(self):
+        import api.signals  # noqa: F401
+        from api.db_pool import forget_pools
+        from api.metrics import registry
+
+        # gunicorn --preload и т.п.: у каждого воркера свой пул соединений
+        # и свои метрики
+        os.register_at_fork(after_in_child=forget_pools)
+        os.register_at_fork(after_in_child=registry.after_fork)
@@ -0,0 +1,43 @@
+# Маршрутизация чтений на реплики (api.db_routing)
+REPLICA_STICKY_SECONDS = 5
+REPLICA_STICKY_CACHE_KEY = 'replica-sticky:{user_id}'
+
+# Профилирование запросов (api.profiling)
+PROFILING_HEADER = 'HTTP_X_PROFILE'
+PROFILING_RESPONSE_HEADER = 'X-Profile-Id'
+PROFILING_SIGNING_SALT = 'api.profiling'
+PROFILING_TOKEN_MAX_AGE = 3600
+PROFILING_SAMPLE_RATE = 0.0
+PROFILING_DIR_NAME = 'profiles'
+PROFILING_MAX_ENTRIES = 200
+PROFILING_MAX_QUERIES = 1000
+PROFILING_SQL_MAX_LENGTH = 2000
+PROFILING_TOP_FUNCTIONS = 40
+
+# Метрики Prometheus (api.metrics)
+METRICS_DIR_NAME = 'metrics'
+METRICS_FLUSH_INTERVAL = 5
+# Снимок процесса старше стольких интервалов считается снимком
+# завершившегося процесса: его gauge-метрики не учитываются
+METRICS_STALE_INTERVALS = 3
+# Снимок старше стольких интервалов — снимок завершившегося процесса:
+# его счётчики складываются в METRICS_AGGREGATE_FILE, а файл удаляется
+METRICS_DEAD_INTERVALS = 12
+METRICS_AGGREGATE_FILE = 'aggregate.json'
+METRICS_LOCK_FILE = '.lock'
+METRICS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+METRICS_LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+METRICS_QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 100)
+
+# Схема OpenAPI (api.schema)
+OPENAPI_TITLE = 'Authorization System API'
+OPENAPI_VERSION = 'v1'
+OPENAPI_DESCRIPTION = 'Документация для API авторизации и бизнес-объектов'
+# Форматы схемы (?format=...) и их типы содержимого
+OPENAPI_CONTENT_TYPES = {
+    'openapi': 'application/openapi+json',
+    'json': 'application/json',
+    'yaml': 'application/yaml',
+}
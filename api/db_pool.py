@@ -0,0 +1,66 @@
+import sys
+
+# Счётчики пула psycopg, которые отдаются в статистике
+POOL_STATS_FIELDS = (
+    'pool_min',
+    'pool_max',
+    'pool_size',
+    'pool_available',
+    'requests_waiting',
+    'requests_num',
+    'requests_queued',
+    'requests_wait_ms',
+    'requests_errors',
+    'usage_ms',
+    'returns_bad',
+    'connections_num',
+    'connections_ms',
+    'connections_errors',
+    'connections_lost',
+)
+
+
+def get_pools():
+    """
+    Уже открытые пулы соединений текущего процесса по алиасам БД.
+
+    Пул создаётся при первом обращении к алиасу, поэтому статистика
+    не открывает пулы сама и её можно снимать из любого потока.
+    """
+    # Бэкенд PostgreSQL не загружен — значит, и пулов нет
+    backend = sys.modules.get('django.db.backends.postgresql.base')
+    if backend is None:
+        return {}
+    return dict(backend.DatabaseWrapper._connection_pools)
+
+
+def get_pool_stats():
+    """
+    Статистика пулов соединений текущего процесса по алиасам БД.
+
+    requests_num — сколько раз соединение выдавалось из пула,
+    requests_wait_ms — суммарное ожидание свободного соединения,
+    pool_size/pool_available — открытые и свободные соединения.
+    Алиасы без пула (SQLite, POSTGRES_POOL=false) и ещё не открытые
+    пулы не попадают в ответ.
+    """
+    result = {}
+    for alias, pool in sorted(get_pools().items()):
+        stats = pool.get_stats()
+        result[alias] = {name: stats.get(name, 0) for name in POOL_STATS_FIELDS}
+    return result
+
+
+def forget_pools():
+    """
+    Забыть пулы, унаследованные от родителя при fork.
+
+    Потоки пула в дочернем процессе не живут, а его соединения остаются
+    у родителя, поэтому ребёнок создаёт свой пул при первом запросе.
+    Закрывать унаследованные соединения нельзя: это закрыло бы их
+    и у родителя.
+    """
+    # Бэкенд PostgreSQL не загружен — значит, и пулов нет
+    backend = sys.modules.get('django.db.backends.postgresql.base')
+    if backend is not None:
+        backend.DatabaseWrapper._connection_pools.clear()
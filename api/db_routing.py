@@ -0,0 +1,145 @@
+import logging
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+from api.constants import REPLICA_STICKY_CACHE_KEY, REPLICA_STICKY_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# Алиас БД для чтений текущего запроса; None — основная БД
+read_database = ContextVar('read_database', default=None)
+
+_warned_no_sticky_cache = False
+
+
+def get_replicas():
+    return [alias for alias in settings.DATABASES if alias != DEFAULT_DB_ALIAS]
+
+
+def sticky_seconds():
+    return getattr(settings, 'REPLICA_STICKY_SECONDS', REPLICA_STICKY_SECONDS)
+
+
+def get_sticky_cache():
+    """
+    Кэш отметок о записи (REPLICA_STICKY_CACHE_ALIAS) или None.
+
+    Кэш должен быть общим для всех процессов сервиса: иначе запрос,
+    попавший в другой процесс, не увидит записи пользователя и прочитает
+    отстающую реплику.
+    """
+    alias = getattr(settings, 'REPLICA_STICKY_CACHE_ALIAS', None)
+    return caches[alias] if alias else None
+
+
+def mark_user_wrote(user):
+    """Ближайшие REPLICA_STICKY_SECONDS читать за пользователя с основной БД."""
+    cache = get_sticky_cache()
+    if cache is not None:
+        cache.set(
+            REPLICA_STICKY_CACHE_KEY.format(user_id=user.pk), True, sticky_seconds()
+        )
+
+
+def choose_read_database(view_name, action, user):
+    """
+    БД для чтений действия action вьюсета view_name.
+
+    Реплика — если действие есть в REPLICA_READ_ACTIONS, реплики
+    и общий кэш отметок о записи настроены и пользователь недавно
+    ничего не записывал; иначе None.
+    """
+    global _warned_no_sticky_cache
+    replicas = get_replicas()
+    if not replicas:
+        return None
+    actions = getattr(settings, 'REPLICA_READ_ACTIONS', {}).get(view_name, ())
+    if action not in actions:
+        return None
+    cache = get_sticky_cache()
+    if cache is None:
+        # Без общего кэша пользователь мог бы не увидеть свою запись
+        if not _warned_no_sticky_cache:
+            logger.warning(
+                'Реплики не используются: не задан REPLICA_STICKY_CACHE_ALIAS'
+            )
+            _warned_no_sticky_cache = True
+        return None
+    if user.is_authenticated and cache.get(
+        REPLICA_STICKY_CACHE_KEY.format(user_id=user.pk)
+    ):
+        return None
+    return random.choice(replicas)  # noqa: S311
+
+
+class ReplicaRouter:
+    """
+    Роутер БД: записи — в основную БД, чтения — в реплику запроса.
+
+    Реплику выбирает ReplicaRoutingMixin вьюсета и кладёт в read_database;
+    вне таких запросов и внутри транзакций всё читается с основной БД.
+    Миграции применяются только к основной БД.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = read_database.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaRoutingMixin:
+    """
+    Миксин вьюсета: чтения безопасных действий — с реплики.
+
+    Аутентификация и пермишены выполняются до выбора реплики, то есть
+    на основной БД; выбранная реплика действует до конца обработки
+    и закрепляется за querysets из get_queryset(). После успешной
+    записи пользователь на REPLICA_STICKY_SECONDS читает с основной БД
+    (отметка хранится в общем кэше REPLICA_STICKY_CACHE_ALIAS).
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.read_database = None
+        if request.method in SAFE_METHODS:
+            self.read_database = choose_read_database(
+                type(self).__name__, self.action, request.user
+            )
+        self._read_database_token = read_database.set(self.read_database)
+
+    def route_queryset(self, queryset):
+        """Закрепить queryset за выбранной репликой (для ленивых выборок)."""
+        if getattr(self, 'read_database', None) is not None:
+            return queryset.using(self.read_database)
+        return queryset
+
+    def get_queryset(self):
+        return self.route_queryset(super().get_queryset())
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_read_database_token', None)
+        if token is not None:
+            read_database.reset(token)
+            self._read_database_token = None
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and request.user.is_authenticated
+        ):
+            mark_user_wrote(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
@@ -1,6 +1,13 @@
 from api.endpoints.access import AccessRuleViewSet
-from api.endpoints.auth import MyTokenObtainPairView, MyTokenRefreshView, logout_view
+from api.endpoints.auth import (
+    MyTokenObtainPairView,
+    MyTokenRefreshView,
+    logout_all_view,
+    logout_view,
+)
 from api.endpoints.business_objects import BusinessObjectViewSet
+from api.endpoints.docs import docs_view
+from api.endpoints.monitoring import db_pool_stats_view, metrics_view
 from api.endpoints.users import UserViewSet
 
 __all__ = (
@@ -9,5 +16,9 @@ __all__ = (
                                 'MyTokenObtainPairView',
                                 'MyTokenRefreshView',
                                 'UserViewSet',
+                                'db_pool_stats_view',
+                                'docs_view',
+                                'logout_all_view',
                                 'logout_view',
+                                'metrics_view',
 )
@@ -3,14 +3,26 @@ from rest_framework.permissions import IsAuthenticated
 
 from access.models import AccessRule
 from access.serializers import AccessRuleSerializer
+from api.db_routing import ReplicaRoutingMixin
+from api.metrics import MetricsMixin
 from api.permissions import IsAdminUserPermission
+from api.profiling import ProfilingMixin
+from audit.log import AuditActorMixin
 
 
-class AccessRuleViewSet(viewsets.ModelViewSet):
+class AccessRuleViewSet(
+    MetricsMixin,
+    ProfilingMixin,
+    AuditActorMixin,
+    ReplicaRoutingMixin,
+    viewsets.ModelViewSet
+):
     """
     Эндпоинт для админов для управления правилами доступа к бизнес-ресурсам.
     """
-    queryset = AccessRule.objects.all()
+    queryset = AccessRule.objects.select_related(
+        'role', 'business_resource'
+    ).order_by('id')
     serializer_class = AccessRuleSerializer
     permission_classes = [IsAuthenticated, IsAdminUserPermission]
 
@@ -0,0 +1,283 @@
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import exception_handler
+
+from access.serializers import AccessRuleSerializer
+from api.db_routing import choose_read_database, read_database
+from api.endpoints.access import AccessRuleViewSet
+from api.endpoints.business_objects import BusinessObjectViewSet
+from api.endpoints.users import UserViewSet
+from api.metrics import count_queries, observe_request
+from api.pagination import is_cursor_pagination_requested
+from api.permissions import (
+    BusinessResourcePermission,
+    IsAdminUserPermission,
+    IsSelfOrAdmin,
+)
+from api.profiling import profile_phase
+from business_objects.models import BusinessObject
+from business_objects.serializers import BusinessObjectReadSerializer
+from users.authentication import CachedJWTAuthentication
+from users.models import User
+from users.serializers import UserReadSerializer
+
+
+class AsyncReadView:
+    """
+    Асинхронная вью для горячих GET-запросов под ASGI.
+
+    GET обрабатывается в цикле asyncio без перехода в поток: токен,
+    пользователь и права берутся из кэшей процесса, запросы к БД идут
+    через async ORM. Решения о правах принимают те же пермишены, что
+    и в синхронных вьюсетах. Остальные методы и запросы, которые
+    async-реализация не покрывает (is_supported), передаются
+    синхронному вьюсету viewset с действиями actions.
+
+    Чтения идут на реплику по тем же правилам, что и в ReplicaRoutingMixin,
+    фазы профиля запроса — те же, что у ProfilingMixin, метрики —
+    те же, что у MetricsMixin.
+    """
+
+    viewset = None
+    actions = None
+    # Как при регистрации viewset в роутере: ресурс в журнале аудита
+    basename = None
+
+    def __init__(self, request, kwargs):
+        self.request = Request(request)
+        self.kwargs = kwargs
+
+    @classmethod
+    def as_view(cls):
+        sync_view = sync_to_async(cls.viewset.as_view(cls.actions))
+
+        async def view(request, **kwargs):
+            self = cls(request, kwargs)
+            if request.method != 'GET' or not self.is_supported():
+                return await sync_view(request, **kwargs)
+            started = time.perf_counter()
+            with count_queries() as queries:
+                response = await self.dispatch_get()
+            observe_request(
+                cls.viewset.__name__,
+                cls.actions['get'],
+                response.status_code,
+                time.perf_counter() - started,
+                queries[0],
+            )
+            return response
+
+        return csrf_exempt(view)
+
+    async def dispatch_get(self):
+        token = None
+        try:
+            with profile_phase('authentication'):
+                await self.authenticate()
+            token = read_database.set(choose_read_database(
+                self.viewset.__name__, self.actions['get'], self.request.user
+            ))
+            with profile_phase('serialization'):
+                data = await self.get()
+        except Exception as exc:
+            return self.handle_exception(exc)
+        finally:
+            if token is not None:
+                read_database.reset(token)
+        return self.render(data)
+
+    def is_supported(self):
+        return True
+
+    async def authenticate(self):
+        authenticator = CachedJWTAuthentication()
+        result = await authenticator.aauthenticate(self.request._request)
+        if result is None:
+            raise exceptions.NotAuthenticated
+        self.request.user, self.request.auth = result
+
+    async def get(self):
+        raise NotImplementedError
+
+    async def get_object(self, queryset):
+        # Ответы те же, что у get_object_or_404 в GenericAPIView
+        try:
+            with profile_phase('queryset'):
+                return await queryset.aget(pk=self.kwargs['pk'])
+        except queryset.model.DoesNotExist:
+            raise Http404(
+                f'No {queryset.model._meta.object_name} matches the given query.'
+            ) from None
+        except (TypeError, ValueError, ValidationError):
+            raise Http404 from None
+
+    async def paginate(self, queryset, serializer_class):
+        """Страница в формате пагинации проекта (PageNumberPagination)."""
+        paginator = api_settings.DEFAULT_PAGINATION_CLASS()
+        page_size = paginator.get_page_size(self.request)
+        django_paginator = paginator.django_paginator_class(queryset, page_size)
+        with profile_phase('queryset'):
+            django_paginator.count = await queryset.acount()
+            page_number = paginator.get_page_number(self.request, django_paginator)
+            try:
+                page = django_paginator.page(page_number)
+            except InvalidPage as exc:
+                raise exceptions.NotFound(paginator.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )) from exc
+            page.object_list = [obj async for obj in page.object_list]
+
+        paginator.page = page
+        paginator.request = self.request
+        serializer = serializer_class(
+            page.object_list, many=True, context={'request': self.request}
+        )
+        return paginator.get_paginated_response(serializer.data).data
+
+    def handle_exception(self, exc):
+        if isinstance(
+            exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)
+        ):
+            exc.auth_header = CachedJWTAuthentication().authenticate_header(
+                self.request
+            )
+        response = exception_handler(
+            exc, {'view': self, 'request': self.request}
+        )
+        if response is None:
+            raise exc
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() != 'content-type'
+        }
+        return self.render(response.data, response.status_code, headers)
+
+    def render(self, data, status=200, headers=None):
+        with profile_phase('render'):
+            content = JSONRenderer().render(data)
+        response = HttpResponse(
+            content,
+            content_type=JSONRenderer.media_type,
+            status=status,
+            headers=headers,
+        )
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+
+class BusinessObjectListView(AsyncReadView):
+    """Список бизнес-объектов ресурса (list BusinessObjectViewSet)."""
+    viewset = BusinessObjectViewSet
+    actions = {'get': 'list', 'post': 'create'}
+    basename = 'business-object'
+
+    def is_supported(self):
+        # Курсорная пагинация — в синхронном вьюсете
+        return not is_cursor_pagination_requested(self.request)
+
+    async def get(self):
+        request = self.request
+        permission = BusinessResourcePermission()
+        resource_name = request.query_params.get('resource')
+        if not resource_name:
+            raise exceptions.PermissionDenied
+
+        claims = await permission.aget_claims(request)
+        if not permission.is_resource_allowed(
+            user=request.user,
+            action='list',
+            resource_name=resource_name,
+            claims=claims
+        ):
+            raise exceptions.PermissionDenied
+
+        queryset = permission.filter_by_scope(
+            BusinessObjectReadSerializer.optimize_queryset(
+                BusinessObject.objects.all(),
+                request,
+                extra_columns=('resource', 'resource__name', 'owner', 'name')
+            ),
+            user=request.user,
+            resource_name=resource_name,
+            scope=permission.get_scope(
+                user=request.user,
+                action='list',
+                resource_name=resource_name,
+                claims=claims
+            )
+        )
+        return await self.paginate(queryset, BusinessObjectReadSerializer)
+
+
+class BusinessObjectDetailView(AsyncReadView):
+    """Один бизнес-объект (retrieve BusinessObjectViewSet)."""
+    viewset = BusinessObjectViewSet
+    actions = {'get': 'retrieve', 'patch': 'partial_update', 'delete': 'destroy'}
+    basename = 'business-object'
+
+    async def get(self):
+        request = self.request
+        permission = BusinessResourcePermission()
+        obj = await self.get_object(
+            BusinessObjectReadSerializer.optimize_queryset(
+                BusinessObject.objects.all(),
+                request,
+                extra_columns=('resource', 'resource__name', 'owner', 'name')
+            )
+        )
+        if not permission.is_object_allowed(
+            user=request.user,
+            action='retrieve',
+            resource_name=obj.resource.name,
+            owner_id=obj.owner_id,
+            claims=await permission.aget_claims(request),
+            object_id=obj.pk
+        ):
+            raise exceptions.PermissionDenied
+        return BusinessObjectReadSerializer(obj, context={'request': request}).data
+
+
+class UserDetailView(AsyncReadView):
+    """Профиль пользователя (retrieve UserViewSet)."""
+    viewset = UserViewSet
+    actions = {'get': 'retrieve', 'patch': 'partial_update', 'delete': 'destroy'}
+    basename = 'user'
+
+    async def get(self):
+        request = self.request
+        user = await self.get_object(
+            UserReadSerializer.optimize_queryset(
+                User.objects.select_related('role'),
+                request,
+                extra_columns=('username',)
+            )
+        )
+        # Пользователь из кэша аутентификации уже с ролью, а claims
+        # актуальны после aauthenticate: проверка не ходит в БД
+        if not IsSelfOrAdmin().has_object_permission(request, self, user):
+            raise exceptions.PermissionDenied
+        return UserReadSerializer(user, context={'request': request}).data
+
+
+class AccessRuleListView(AsyncReadView):
+    """Список правил доступа (list AccessRuleViewSet)."""
+    viewset = AccessRuleViewSet
+    actions = {'get': 'list'}
+    basename = 'access-rule'
+
+    async def get(self):
+        if not IsAdminUserPermission().has_permission(self.request, self):
+            raise exceptions.PermissionDenied
+        return await self.paginate(
+            AccessRuleViewSet.queryset.all(), AccessRuleSerializer
+        )
@@ -2,21 +2,42 @@ from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
-from users.serializers import MyTokenObtainPairSerializer
+from api.metrics import (
+    MetricsMixin,
+    auth_result,
+    login_attempts,
+    token_refreshes,
+    tokens_blacklisted,
+)
+from users.serializers import MyTokenObtainPairSerializer, MyTokenRefreshSerializer
+from users.throttling import LoginRateThrottle, RefreshRateThrottle
+from users.tokens import RefreshToken, revoke_user_tokens
 
 
-class MyTokenObtainPairView(TokenObtainPairView):
+class MyTokenObtainPairView(MetricsMixin, TokenObtainPairView):
     """Вью для получения пары токенов."""
     serializer_class = MyTokenObtainPairSerializer
     permission_classes = [AllowAny]
+    # Лимиты проверяются до хеширования пароля
+    throttle_classes = [LoginRateThrottle]
 
+    def finalize_response(self, request, response, *args, **kwargs):
+        # Сюда приходят и ответы на исключения: 401, 429 и т.д.
+        login_attempts.inc(result=auth_result(response.status_code))
+        return super().finalize_response(request, response, *args, **kwargs)
 
-class MyTokenRefreshView(TokenRefreshView):
+
+class MyTokenRefreshView(MetricsMixin, TokenRefreshView):
     """Вью для обновления access токена по refresh."""
+    serializer_class = MyTokenRefreshSerializer
     permission_classes = [AllowAny]
+    throttle_classes = [RefreshRateThrottle]
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token_refreshes.inc(result=auth_result(response.status_code))
+        return super().finalize_response(request, response, *args, **kwargs)
 
 
 @api_view(['POST'])
@@ -42,4 +63,17 @@ def logout_view(request):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+    tokens_blacklisted.inc(reason='logout')
     return Response({'detail': 'Успешный логаут.'}, status=status.HTTP_204_NO_CONTENT)
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def logout_all_view(request):
+    """
+    Выход на всех устройствах: отзываются все refresh токены пользователя.
+    Выданные access токены действуют до истечения срока.
+    """
+    revoked = revoke_user_tokens([request.user.pk])
+    tokens_blacklisted.inc(revoked, reason='logout_all')
+    return Response(status=status.HTTP_204_NO_CONTENT)
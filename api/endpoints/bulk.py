@@ -0,0 +1,280 @@
+from django.db import IntegrityError, transaction
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from access.claims import get_permission_claims
+from api.permissions import BusinessResourcePermission
+from business_objects.constants import BULK_BATCH_SIZE, BULK_MAX_LENGTH
+from business_objects.models import BusinessObject, BusinessResource
+from business_objects.serializers import (
+    BusinessObjectBulkCreateSerializer,
+    BusinessObjectBulkDestroySerializer,
+    BusinessObjectBulkUpdateSerializer,
+)
+
+BULK_ACTIONS = ('bulk_create', 'bulk_update', 'bulk_destroy')
+
+FORBIDDEN_ERROR = {'detail': 'Недостаточно прав для этого действия.'}
+NOT_FOUND_ERROR = {'detail': 'Объект не найден.'}
+NAME_TAKEN_ERROR = {'name': ['Объект с таким именем уже существует.']}
+CONFLICT_ERROR = {'detail': 'Конфликт имён, пачка не сохранена.'}
+
+
+class BusinessObjectBulkMixin:
+    """
+    Массовые операции с бизнес-объектами: /business-objects/bulk/.
+
+    - POST — создание списка объектов;
+    - PATCH — обновление списка объектов ({"id": ..., поля});
+    - DELETE — удаление по {"ids": [...]}.
+
+    Права проверяются один раз на пару (ресурс, действие) по правилам
+    BusinessResourcePermission, владение — по уже загруженным строкам.
+    Вся пачка пишется одной транзакцией: bulk_create, bulk_update или
+    один DELETE ... WHERE id IN. Ошибки возвращаются по каждому
+    элементу, корректные элементы при этом сохраняются.
+    """
+
+    def get_bulk_items(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise serializers.ValidationError(
+                {'detail': 'Ожидается непустой список объектов.'}
+            )
+        if len(items) > BULK_MAX_LENGTH:
+            raise serializers.ValidationError(
+                {'detail': f'Не больше {BULK_MAX_LENGTH} объектов за запрос.'}
+            )
+        return items
+
+    def validate_bulk_items(self, items, serializer_class, results):
+        """Проверить формат элементов; ошибки записываются в results."""
+        valid = []
+        for index, item in enumerate(items):
+            serializer = serializer_class(data=item)
+            if serializer.is_valid():
+                valid.append((index, serializer.validated_data))
+            else:
+                results[index] = {'index': index, 'errors': serializer.errors}
+        return valid
+
+    def get_bulk_scopes(self, request, resource_names, action):
+        """Область прав на action для каждого ресурса пачки — по разу."""
+        permission = BusinessResourcePermission()
+        claims = get_permission_claims(request.auth)
+        return {
+            resource_name: permission.get_scope(
+                user=request.user,
+                action=action,
+                resource_name=resource_name,
+                claims=claims
+            )
+            for resource_name in resource_names
+        }
+
+    def is_bulk_allowed(
+        self, request, scope, owner_id, *, action, resource_name, object_id=None
+    ):
+        """Решение по элементу пачки; учитывается в метриках и аудите."""
+        if scope == BusinessResourcePermission.SCOPE_OWNED:
+            allowed = owner_id == request.user.pk
+        else:
+            allowed = scope == BusinessResourcePermission.SCOPE_ALL
+        return BusinessResourcePermission().record_decision(
+            user=request.user,
+            action=action,
+            resource_name=resource_name,
+            allowed=allowed,
+            object_id=object_id,
+        )
+
+    def get_bulk_response(self, results, success_status):
+        has_errors = any('errors' in result for result in results)
+        return Response(
+            {'results': results},
+            status=status.HTTP_207_MULTI_STATUS if has_errors else success_status
+        )
+
+    @action(detail=False, methods=['post'], url_path='bulk', url_name='bulk')
+    def bulk_create(self, request):
+        """Массовое создание бизнес-объектов."""
+        items = self.get_bulk_items(request)
+        results = [None] * len(items)
+        valid = self.validate_bulk_items(
+            items, BusinessObjectBulkCreateSerializer, results
+        )
+
+        resource_names = {data['resource'] for _, data in valid}
+        resources = dict(
+            BusinessResource.objects.filter(name__in=resource_names)
+            .values_list('name', 'id')
+        )
+        scopes = self.get_bulk_scopes(request, resources, 'create')
+        taken = set(
+            BusinessObject.objects.filter(
+                name__in=[data['name'] for _, data in valid]
+            ).values_list('name', flat=True)
+        )
+
+        pending = []
+        for index, data in valid:
+            if data['resource'] not in resources:
+                error = {'resource': ['Ресурс не найден.']}
+            elif not self.is_bulk_allowed(
+                request,
+                scopes[data['resource']],
+                request.user.pk,
+                action='create',
+                resource_name=data['resource']
+            ):
+                error = FORBIDDEN_ERROR
+            elif data['name'] in taken:
+                error = NAME_TAKEN_ERROR
+            else:
+                error = None
+
+            if error:
+                results[index] = {'index': index, 'errors': error}
+                continue
+            # Повтор имени внутри пачки тоже конфликт
+            taken.add(data['name'])
+            pending.append((index, BusinessObject(
+                name=data['name'],
+                description=data.get('description', ''),
+                resource_id=resources[data['resource']],
+                owner=request.user,
+            )))
+
+        try:
+            with transaction.atomic():
+                created = BusinessObject.objects.bulk_create(
+                    [obj for _, obj in pending],
+                    batch_size=BULK_BATCH_SIZE
+                )
+        except IntegrityError:
+            return Response(CONFLICT_ERROR, status=status.HTTP_409_CONFLICT)
+
+        for (index, _), obj in zip(pending, created, strict=True):
+            results[index] = {'index': index, 'id': obj.pk}
+        return self.get_bulk_response(results, status.HTTP_201_CREATED)
+
+    @bulk_create.mapping.patch
+    def bulk_update(self, request):
+        """Массовое обновление бизнес-объектов."""
+        items = self.get_bulk_items(request)
+        results = [None] * len(items)
+        valid = self.validate_bulk_items(
+            items, BusinessObjectBulkUpdateSerializer, results
+        )
+
+        objects = BusinessObject.objects.select_related('resource').only(
+            'id', 'name', 'description', 'owner', 'resource', 'resource__name'
+        ).in_bulk([data['id'] for _, data in valid])
+        scopes = self.get_bulk_scopes(
+            request,
+            {obj.resource.name for obj in objects.values()},
+            'partial_update'
+        )
+        taken = dict(
+            BusinessObject.objects.filter(
+                name__in=[data['name'] for _, data in valid if 'name' in data]
+            ).values_list('name', 'id')
+        )
+
+        updated = {}
+        fields = set()
+        for index, data in valid:
+            obj = objects.get(data['id'])
+            if obj is None or obj.pk in updated:
+                error = NOT_FOUND_ERROR if obj is None else {
+                    'id': ['Объект уже есть в этой пачке.']
+                }
+            elif not self.is_bulk_allowed(
+                request,
+                scopes[obj.resource.name],
+                obj.owner_id,
+                action='partial_update',
+                resource_name=obj.resource.name,
+                object_id=obj.pk
+            ):
+                error = FORBIDDEN_ERROR
+            elif 'name' in data and taken.get(data['name'], obj.pk) != obj.pk:
+                error = NAME_TAKEN_ERROR
+            else:
+                error = None
+
+            if error:
+                results[index] = {'index': index, 'errors': error}
+                continue
+            changes = {
+                field: value for field, value in data.items() if field != 'id'
+            }
+            for field, value in changes.items():
+                setattr(obj, field, value)
+            if 'name' in changes:
+                taken[changes['name']] = obj.pk
+            fields.update(changes)
+            updated[obj.pk] = index
+
+        if fields:
+            try:
+                with transaction.atomic():
+                    BusinessObject.objects.bulk_update(
+                        [objects[pk] for pk in updated],
+                        sorted(fields),
+                        batch_size=BULK_BATCH_SIZE
+                    )
+            except IntegrityError:
+                return Response(CONFLICT_ERROR, status=status.HTTP_409_CONFLICT)
+
+        for pk, index in updated.items():
+            results[index] = {'index': index, 'id': pk}
+        return self.get_bulk_response(results, status.HTTP_200_OK)
+
+    @bulk_create.mapping.delete
+    def bulk_destroy(self, request):
+        """Массовое удаление бизнес-объектов."""
+        serializer = BusinessObjectBulkDestroySerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+
+        rows = {
+            pk: (resource_name, owner_id)
+            for pk, resource_name, owner_id in BusinessObject.objects.filter(
+                pk__in=ids
+            ).values_list('pk', 'resource__name', 'owner_id')
+        }
+        scopes = self.get_bulk_scopes(
+            request,
+            {resource_name for resource_name, _ in rows.values()},
+            'destroy'
+        )
+
+        results = []
+        allowed_ids = set()
+        for index, pk in enumerate(ids):
+            if pk not in rows:
+                results.append({'index': index, 'id': pk, 'errors': NOT_FOUND_ERROR})
+                continue
+            resource_name, owner_id = rows[pk]
+            if not self.is_bulk_allowed(
+                request,
+                scopes[resource_name],
+                owner_id,
+                action='destroy',
+                resource_name=resource_name,
+                object_id=pk
+            ):
+                results.append({'index': index, 'id': pk, 'errors': FORBIDDEN_ERROR})
+                continue
+            allowed_ids.add(pk)
+            results.append({'index': index, 'id': pk})
+
+        if allowed_ids:
+            # У бизнес-объекта нет зависимых строк и сигналов,
+            # поэтому Django удаляет их одним DELETE ... WHERE id IN
+            with transaction.atomic():
+                BusinessObject.objects.filter(pk__in=allowed_ids).delete()
+
+        return self.get_bulk_response(results, status.HTTP_200_OK)
@@ -1,39 +1,112 @@
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
+from access.claims import get_permission_claims
+from api.db_routing import ReplicaRoutingMixin
+from api.endpoints.bulk import BULK_ACTIONS, BusinessObjectBulkMixin
+from api.endpoints.export import BusinessObjectExportMixin
+from api.metrics import MetricsMixin
+from api.pagination import BusinessObjectCursorPagination, CursorPaginationMixin
 from api.permissions import BusinessResourcePermission
+from api.profiling import ProfilingMixin
 from business_objects.models import BusinessObject
 from business_objects.serializers import (
     BusinessObjectReadSerializer,
     BusinessObjectUpdateSerializer,
     BusinessObjectWriteSerializer,
+    PermissionCheckBatchSerializer,
 )
 
 
-class BusinessObjectViewSet(viewsets.ModelViewSet):
+class BusinessObjectViewSet(
+    MetricsMixin,
+    ProfilingMixin,
+    ReplicaRoutingMixin,
+    BusinessObjectBulkMixin,
+    BusinessObjectExportMixin,
+    CursorPaginationMixin,
+    viewsets.ModelViewSet
+):
     """CRUD для бизнес-объектов конкретного ресурса."""
     serializer_class = BusinessObjectReadSerializer
     permission_classes = [IsAuthenticated, BusinessResourcePermission]
+    cursor_pagination_class = BusinessObjectCursorPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
     resource_name = None
 
+    def get_permissions(self):
+        if self.action == 'check_access' or self.action in BULK_ACTIONS:
+            # Права проверяются внутри действия для каждого элемента
+            return [IsAuthenticated()]
+        return super().get_permissions()
+
     def get_serializer_class(self):
         if self.action == 'create':
             return BusinessObjectWriteSerializer
         if self.action == 'partial_update':
             return BusinessObjectUpdateSerializer
+        if self.action == 'check_access':
+            return PermissionCheckBatchSerializer
         return BusinessObjectReadSerializer
 
     def get_queryset(self):
+        if self.action in ('list', 'retrieve'):
+            # Только столбцы и связи, запрошенные через ?fields= и ?expand=,
+            # плюс ресурс и владелец для проверки прав на объект
+            # и name для позиции курсорной пагинации
+            queryset = BusinessObjectReadSerializer.optimize_queryset(
+                self.route_queryset(BusinessObject.objects.all()),
+                self.request,
+                extra_columns=('resource', 'resource__name', 'owner', 'name')
+            )
+        else:
+            # Владелец с ролью и ресурс нужны сериализатору и пермишену:
+            # подтягиваем их тем же запросом
+            queryset = BusinessObject.objects.select_related(
+                'owner__role', 'resource'
+            )
+
         # Query-параметр "resource" нужен только для list
         if self.action == 'list':
             resource_name = self.request.query_params.get('resource')
             if not resource_name:
                 return BusinessObject.objects.none()
-            return BusinessObject.objects.filter(resource__name=resource_name)
+            # Права на чтение применяются в SQL, а не проверкой каждого объекта
+            return BusinessResourcePermission().filter_queryset(
+                self.request,
+                queryset,
+                resource_name=resource_name,
+                action=self.action
+            )
 
-        return BusinessObject.objects.all()
+        return queryset
 
     def perform_create(self, serializer):
         # Сохраняем владельца при создании объекта
         serializer.save(owner=self.request.user)
+
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='check-permissions',
+        url_name='check_permissions'
+    )
+    def check_access(self, request):
+        """Пакетная проверка прав текущего пользователя на объекты и ресурсы."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        checks = serializer.validated_data['checks']
+        decisions = BusinessResourcePermission().check_many(
+            user=request.user,
+            checks=checks,
+            claims=get_permission_claims(request.auth)
+        )
+        return Response({
+            'results': [
+                {**check, 'allowed': allowed}
+                for check, allowed in zip(checks, decisions, strict=True)
+            ]
+        })
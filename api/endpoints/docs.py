@@ -0,0 +1,59 @@
+from django.http import Http404, HttpResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
+
+from api.constants import OPENAPI_CONTENT_TYPES
+from api.schema import get_schema_info, schema_cache
+
+
+def schema_kind(format):
+    return 'yaml' if format == 'yaml' else 'json'
+
+
+def schema_etag(request, format, **kwargs):  # noqa: ARG001
+    return schema_cache.get(schema_kind(format)).etag
+
+
+@cache_control(no_cache=True)
+@condition(etag_func=schema_etag)
+def schema_response(request, format, **kwargs):  # noqa: ARG001
+    # no-cache: браузер каждый раз сверяет ETag и получает 304
+    return HttpResponse(
+        schema_cache.get(schema_kind(format)).content,
+        content_type=OPENAPI_CONTENT_TYPES[format],
+    )
+
+
+def render_ui(request, ui):
+    from drf_yasg.openapi import Paths, Swagger
+    from drf_yasg.renderers import ReDocRenderer, SwaggerUIRenderer
+
+    renderer_class = SwaggerUIRenderer if ui == 'swagger' else ReDocRenderer
+    # Странице нужны только название и версия: пути грузит её скрипт
+    info = get_schema_info()
+    swagger = Swagger(
+        info=info,
+        _prefix='/',
+        _version=info._default_version,
+        paths=Paths(paths={}),
+    )
+    content = renderer_class().render(
+        swagger, renderer_class.media_type, {'request': request}
+    )
+    return HttpResponse(content, content_type='text/html; charset=utf-8')
+
+
+@require_GET
+def docs_view(request, ui):
+    """
+    Swagger UI или ReDoc, а с ?format=openapi|json|yaml — схема OpenAPI.
+
+    Схема не собирается на каждый запрос: она берётся из schema_cache
+    и отдаётся с ETag (повторный запрос с If-None-Match получает 304).
+    """
+    format = request.GET.get('format')
+    if format in OPENAPI_CONTENT_TYPES:
+        return schema_response(request, format)
+    if format not in (None, ui):
+        raise Http404
+    return render_ui(request, ui)
@@ -0,0 +1,37 @@
+from django.http import HttpResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.http import require_GET
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.response import Response
+
+from api.constants import METRICS_CONTENT_TYPE
+from api.db_pool import get_pool_stats
+from api.metrics import metrics_setting, registry
+from api.permissions import IsAdminUserPermission
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUserPermission])
+def db_pool_stats_view(request):  # noqa: ARG001
+    """
+    Статистика пулов соединений с БД процесса, обслужившего запрос.
+    Доступно только администраторам.
+    """
+    return Response(get_pool_stats())
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Метрики всех процессов сервиса в формате Prometheus.
+
+    Обычная вью Django, а не DRF: сборщик метрик не проходит
+    аутентификацию JWT и лимиты. Если задан METRICS_TOKEN, сборщик
+    передаёт его в заголовке Authorization: Bearer <токен>.
+    """
+    token = metrics_setting('METRICS_TOKEN', '')
+    if token and not constant_time_compare(
+        request.headers.get('Authorization', ''), f'Bearer {token}'
+    ):
+        return HttpResponse(status=401, headers={'WWW-Authenticate': 'Bearer'})
+    return HttpResponse(registry.render(), content_type=METRICS_CONTENT_TYPE)
@@ -2,10 +2,14 @@ from rest_framework import status, viewsets
 from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 
 from access.models import Role, RoleEnum
+from api.db_routing import ReplicaRoutingMixin
+from api.metrics import MetricsMixin, tokens_blacklisted
+from api.pagination import CursorPaginationMixin, UserCursorPagination
 from api.permissions import IsAdminUserPermission, IsSelfOrAdmin
+from api.profiling import ProfilingMixin
+from audit.log import AuditActorMixin
 from users.models import User
 from users.serializers import (
     UserCreateSerializer,
@@ -13,12 +17,22 @@ from users.serializers import (
     UserRoleUpdateSerializer,
     UserUpdateSerializer,
 )
+from users.throttling import RegistrationRateThrottle
+from users.tokens import deactivate_users
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(
+    MetricsMixin,
+    ProfilingMixin,
+    AuditActorMixin,
+    ReplicaRoutingMixin,
+    CursorPaginationMixin,
+    viewsets.ModelViewSet
+):
     """Вьюсет для пользователей."""
-    queryset = User.objects.all()
+    queryset = User.objects.select_related('role')
     permission_classes = [IsAuthenticated]
+    cursor_pagination_class = UserCursorPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
 
     def get_permissions(self):
@@ -30,6 +44,21 @@ class UserViewSet(viewsets.ModelViewSet):
         # Остальные действия только со своими профилями
         return [IsAuthenticated(), IsSelfOrAdmin()]
 
+    def get_throttles(self):
+        if self.action == 'create':
+            return [RegistrationRateThrottle()]
+        return super().get_throttles()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('list', 'retrieve'):
+            # Только столбцы, запрошенные через ?fields= и ?expand=,
+            # и username для позиции курсорной пагинации
+            return UserReadSerializer.optimize_queryset(
+                queryset, self.request, extra_columns=('username',)
+            )
+        return queryset
+
     def get_serializer_class(self):
         if self.action == 'create':
             return UserCreateSerializer
@@ -50,17 +79,14 @@ class UserViewSet(viewsets.ModelViewSet):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def destroy(self, request, *args, **kwargs):
-        """Деактивация пользователя вместо полного удаления."""
-        user = self.get_object()
-        user.is_active = False
-        user.save()
-
-        # Если передан refresh токен, добавляем его в blacklist
-        refresh_token = request.data.get('refresh')
-        if refresh_token:
-            token = RefreshToken(refresh_token)
-            token.blacklist()
+        """
+        Деактивация пользователя вместо полного удаления.
 
+        Все refresh токены пользователя отзываются.
+        """
+        user = self.get_object()
+        _, revoked = deactivate_users([user.pk])
+        tokens_blacklisted.inc(revoked, reason='deactivate')
         return Response(status=status.HTTP_204_NO_CONTENT)
 
     @action(
@@ -0,0 +1,669 @@
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import ExitStack
+from datetime import UTC, datetime
+from itertools import count
+from pathlib import Path
+
+import requests
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections, connection, connections
+from django.test import Client
+from django.test.utils import override_settings
+
+from access.models import AccessRule, RoleEnum
+from api.management.commands.generate_benchmark_data import (
+    BENCHMARK_EMAIL_DOMAIN,
+    BENCHMARK_PASSWORD,
+)
+from business_objects.models import BusinessResourceEnum
+from users.models import User
+
+# Операции нагрузки и их адреса в отчёте
+ENDPOINTS = {
+    'login': 'POST /api/auth/login/',
+    'list': 'GET /api/business-objects/?resource=',
+    'retrieve': 'GET /api/business-objects/{id}/',
+    'create': 'POST /api/business-objects/',
+    'patch': 'PATCH /api/business-objects/{id}/',
+    'delete': 'DELETE /api/business-objects/{id}/',
+}
+DEFAULT_MIX = 'login=1,list=10,retrieve=10,create=2,patch=2,delete=1'
+# Операции записи и права AccessRule, с которыми их выполняет пользователь
+WRITE_PERMISSIONS = {
+    'create': ('create_permission',),
+    'patch': ('update_all_permission', 'update_owned_permission'),
+    'delete': ('delete_all_permission', 'delete_owned_permission'),
+}
+# Доли ролей среди пользователей нагрузки
+DEFAULT_ROLES = 'admin=1,manager=1,user=2'
+PERCENTILES = (50, 95, 99)
+# Настройки, от которых зависят результаты: попадают в отчёт
+REPORTED_SETTINGS = (
+    'PERMISSION_CLAIMS_ENABLED',
+    'ASYNC_READ_ENDPOINTS',
+    'THROTTLE_CACHE_ALIAS',
+)
+
+
+def parse_mix(value):
+    """Разобрать смесь операций вида 'login=1,list=10' в {операция: вес}."""
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise CommandError(
+                f'Неизвестная операция "{name}", доступны: {", ".join(ENDPOINTS)}'
+            )
+        try:
+            mix[name] = float(weight)
+        except ValueError:
+            raise CommandError(f'Неверный вес операции "{part}"') from None
+    if not any(mix.values()):
+        raise CommandError('Смесь операций пуста.')
+    return mix
+
+
+def parse_roles(value):
+    """Разобрать доли ролей вида 'admin=1,user=2' в {роль: вес}."""
+    names = {role.lower(): role for role in RoleEnum.values}
+    roles = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        role = names.get(name.strip().lower())
+        if role is None:
+            raise CommandError(
+                f'Неизвестная роль "{name.strip()}", доступны: {", ".join(names)}'
+            )
+        try:
+            roles[role] = float(weight)
+        except ValueError:
+            raise CommandError(f'Неверная доля роли "{part}"') from None
+    if not any(weight > 0 for weight in roles.values()):
+        raise CommandError('Доли ролей пусты.')
+    return roles
+
+
+def split_by_weight(total, weights):
+    """Разделить total между ключами weights пропорционально весам."""
+    counts = dict.fromkeys(weights, 0)
+    positive = [key for key, weight in weights.items() if weight > 0]
+    for _ in range(total):
+        key = min(positive, key=lambda key: counts[key] / weights[key])
+        counts[key] += 1
+    return counts
+
+
+def percentile(values, percent):
+    """Перцентиль по ближайшему рангу; values отсортированы."""
+    if not values:
+        return None
+    rank = math.ceil(percent / 100 * len(values))
+    return values[max(rank, 1) - 1]
+
+
+class InProcessTransport:
+    """
+    Запросы к обработчику Django в этом же процессе (django.test.Client).
+
+    Проходят все middleware, аутентификация и пермишены; запросы к БД
+    считаются по всем алиасам из DATABASES.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+
+    def request(self, method, path, data=None, token=None):
+        client = getattr(self._local, 'client', None)
+        if client is None:
+            client = self._local.client = Client(HTTP_HOST='localhost')
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        queries = 0
+
+        def count_query(execute, *args):
+            nonlocal queries
+            queries += 1
+            return execute(*args)
+
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(count_query))
+            started = time.perf_counter()
+            response = client.generic(
+                method,
+                path,
+                json.dumps(data) if data is not None else '',
+                content_type='application/json',
+                headers=headers,
+            )
+            elapsed = time.perf_counter() - started
+        # Client не возвращает соединения в конце запроса, а сервер
+        # возвращает: иначе потоки замера исчерпали бы пул
+        close_old_connections()
+
+        body = None
+        if response.get('Content-Type', '').startswith('application/json'):
+            body = json.loads(response.content or 'null')
+        return response.status_code, body, elapsed, queries
+
+
+class HttpTransport:
+    """Запросы к запущенному серверу по HTTP, по сессии на поток."""
+
+    def __init__(self, base_url, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def request(self, method, path, data=None, token=None):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        headers = {'Authorization': f'Bearer {token}'} if token else {}
+        started = time.perf_counter()
+        response = session.request(
+            method,
+            self.base_url + path,
+            json=data,
+            headers=headers,
+            timeout=self.timeout,
+        )
+        elapsed = time.perf_counter() - started
+
+        body = None
+        if response.headers.get('Content-Type', '').startswith('application/json'):
+            body = response.json()
+        return response.status_code, body, elapsed, None
+
+
+def latency_summary(records):
+    """Среднее, перцентили времени ответа (мс) и SQL на запрос."""
+    latencies = sorted(record[2] * 1000 for record in records)
+    queries = [record[3] for record in records if record[3] is not None]
+    return {
+        'mean_ms': sum(latencies) / len(latencies) if latencies else None,
+        **{
+            f'p{percent}_ms': percentile(latencies, percent)
+            for percent in PERCENTILES
+        },
+        'queries_per_request': sum(queries) / len(queries) if queries else None,
+    }
+
+
+class Actor:
+    """
+    Пользователь нагрузки: токен, правила его роли, видимые ему объекты,
+    объекты, которые он вправе изменить, и созданные им (id, ресурс).
+    """
+
+    def __init__(self, pk, email, role, rules):
+        self.pk = pk
+        self.email = email
+        self.role = role
+        self.rules = rules
+        self.token = None
+        self.visible_ids = []
+        self.updatable_ids = []
+        self.created = deque()
+
+    def can(self, permission, resource):
+        rule = self.rules.get(resource)
+        return rule is not None and getattr(rule, permission)
+
+    def resources(self, *permissions):
+        """Ресурсы, на которые у роли есть хотя бы одно из прав."""
+        return [
+            resource for resource in BusinessResourceEnum.values
+            if any(self.can(permission, resource) for permission in permissions)
+        ]
+
+    def can_update(self, resource, owner_id):
+        return self.can('update_all_permission', resource) or (
+            owner_id == self.pk and self.can('update_owned_permission', resource)
+        )
+
+
+class Command(BaseCommand):
+    help = (
+        'Нагрузочный замер API: смесь логина, list, retrieve, create, patch '
+        'и delete бизнес-объектов от имени пользователей generate_benchmark_data '
+        'с заданными долями ролей; запись выполняют только роли с правом на неё. '
+        'Запросы идут в этом же процессе или по HTTP (--url). Для каждой '
+        'операции — пропускная способность, p50/p95/p99 и запросы к БД '
+        'на запрос; результаты можно сохранить в JSON и сравнить с прошлым.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--url',
+            help=(
+                'Адрес запущенного сервера, например http://localhost:8000; '
+                'без него запросы идут в этом же процессе.'
+            )
+        )
+        parser.add_argument(
+            '--mix',
+            default=DEFAULT_MIX,
+            help=f'Веса операций (по умолчанию {DEFAULT_MIX}).'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=1000,
+            help='Сколько запросов замерить.'
+        )
+        parser.add_argument(
+            '--warmup',
+            type=int,
+            default=50,
+            help='Сколько запросов выполнить до замера.'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=4,
+            help='Число параллельных клиентов (потоков).'
+        )
+        parser.add_argument(
+            '--actors',
+            type=int,
+            default=20,
+            help='Сколько сгенерированных пользователей задействовать.'
+        )
+        parser.add_argument(
+            '--roles',
+            default=DEFAULT_ROLES,
+            help=(
+                'Доли ролей среди пользователей нагрузки '
+                f'(по умолчанию {DEFAULT_ROLES}).'
+            )
+        )
+        parser.add_argument(
+            '--password',
+            default=BENCHMARK_PASSWORD,
+            help='Пароль сгенерированных пользователей.'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Зерно генератора случайных чисел.'
+        )
+        parser.add_argument(
+            '--timeout',
+            type=float,
+            default=30,
+            help='Таймаут HTTP-запроса в секундах.'
+        )
+        parser.add_argument(
+            '--throttle',
+            action='store_true',
+            help=(
+                'Не отключать лимиты частоты запросов в этом процессе. '
+                'Для --url лимиты задаются настройками сервера.'
+            )
+        )
+        parser.add_argument('--output', help='Сохранить результаты в JSON.')
+        parser.add_argument(
+            '--compare',
+            help='JSON прошлого прогона: вывести изменения относительно него.'
+        )
+
+    def handle(self, *args, **options):
+        self.mix = parse_mix(options['mix'])
+        roles = parse_roles(options['roles'])
+        self.password = options['password']
+        self.random = random.Random(options['seed'])  # noqa: S311
+        self.transport = (
+            HttpTransport(options['url'], options['timeout'])
+            if options['url'] else InProcessTransport()
+        )
+
+        with ExitStack() as stack:
+            if not options['url'] and not options['throttle']:
+                stack.enter_context(override_settings(REST_FRAMEWORK={
+                    **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}
+                }))
+            self.prepare(split_by_weight(options['actors'], roles))
+            self.run(options['warmup'], options['concurrency'])
+            self.records = []
+            elapsed = self.run(options['requests'], options['concurrency'])
+
+        results = {
+            'meta': {
+                'started_at': datetime.now(UTC).isoformat(),
+                'mode': 'http' if options['url'] else 'in-process',
+                'url': options['url'],
+                'database': None if options['url'] else connection.vendor,
+                'mix': self.mix,
+                'requests': options['requests'],
+                'concurrency': options['concurrency'],
+                'actors': dict(Counter(actor.role for actor in self.actors)),
+                'seed': options['seed'],
+                'throttle': bool(options['url'] or options['throttle']),
+                'elapsed': elapsed,
+                'settings': {
+                    name: getattr(settings, name, None) for name in REPORTED_SETTINGS
+                },
+            },
+            'endpoints': self.summarize(elapsed),
+        }
+        self.print_results(results['endpoints'])
+
+        if options['compare']:
+            previous = json.loads(
+                Path(options['compare']).read_text(encoding='utf-8')
+            )
+            self.print_comparison(previous['endpoints'], results['endpoints'])
+        if options['output']:
+            Path(options['output']).write_text(
+                json.dumps(results, ensure_ascii=False, indent=2), encoding='utf-8'
+            )
+            self.stdout.write(f'Результаты сохранены в {options["output"]}')
+        self.check_writes(results['endpoints'])
+
+    def select_actors(self, counts):
+        """Сгенерированные пользователи: по counts[роль] каждой роли."""
+        rules = {}
+        for rule in AccessRule.objects.select_related('role', 'business_resource'):
+            rules.setdefault(rule.role.name, {})[rule.business_resource.name] = rule
+        actors = []
+        for role, amount in counts.items():
+            users = list(
+                User.objects.filter(
+                    email__endswith=f'@{BENCHMARK_EMAIL_DOMAIN}', role__name=role
+                ).order_by('id').values_list('id', 'email')[:amount]
+            )
+            if len(users) < amount:
+                self.stderr.write(self.style.WARNING(
+                    f'Пользователей с ролью {role}: {len(users)} из {amount}.'
+                ))
+            actors.extend(
+                Actor(pk, email, role, rules.get(role, {})) for pk, email in users
+            )
+        if not actors:
+            raise CommandError(
+                'Нет пользователей нагрузки: сначала запустите '
+                'generate_benchmark_data.'
+            )
+        return actors
+
+    def prepare(self, counts):
+        """Войти от имени пользователей и собрать видимые им объекты."""
+        self.actors = []
+        self.records = []
+        for actor in self.select_actors(counts):
+            status, body, _, _ = self.transport.request(
+                'POST',
+                '/api/auth/login/',
+                {'email': actor.email, 'password': self.password},
+            )
+            if status == 429:
+                raise CommandError(
+                    f'Вход как {actor.email} ограничен лимитом частоты: '
+                    'поднимите DEFAULT_THROTTLE_RATES сервера или уменьшите '
+                    '--actors.'
+                )
+            if status != 200:
+                raise CommandError(
+                    f'Не удалось войти как {actor.email} ({status}): '
+                    'сначала запустите generate_benchmark_data.'
+                )
+            actor.token = body['access']
+            for resource in BusinessResourceEnum.values:
+                # expand= без связей: владелец приходит id
+                status, body, _, _ = self.transport.request(
+                    'GET',
+                    f'/api/business-objects/?resource={resource}'
+                    '&fields=id,owner&expand=',
+                    token=actor.token,
+                )
+                if status != 200:
+                    continue
+                for obj in body['results']:
+                    actor.visible_ids.append(obj['id'])
+                    if actor.can_update(resource, obj['owner']):
+                        actor.updatable_ids.append(obj['id'])
+            self.actors.append(actor)
+        self.all_ids = [pk for actor in self.actors for pk in actor.visible_ids]
+        self.operation_actors = self.select_operation_actors()
+
+    def select_operation_actors(self):
+        """
+        Пользователи для каждой операции: запись выполняют только роли
+        с правом на неё, чтобы замер записи не был замером отказов.
+        Удаляются только объекты, созданные самим пользователем, поэтому
+        удаляет тот, кто вправе удалить всё, что создаёт.
+        """
+        operation_actors = dict.fromkeys(self.mix, self.actors)
+        for operation, permissions in WRITE_PERMISSIONS.items():
+            if not self.mix.get(operation):
+                continue
+            actors = [actor for actor in self.actors if actor.resources(*permissions)]
+            if operation == 'delete':
+                actors = [
+                    actor for actor in actors
+                    if actor.resources('create_permission')
+                    and set(actor.resources('create_permission'))
+                    <= set(actor.resources(*permissions))
+                ]
+            if not actors:
+                raise CommandError(
+                    f'Ни у одного пользователя нагрузки нет прав на {operation}: '
+                    'проверьте --roles и правила доступа.'
+                )
+            operation_actors[operation] = actors
+        return operation_actors
+
+    def run(self, total, concurrency):
+        """Выполнить total запросов в concurrency потоков; вернуть время."""
+        counter = count()
+        operations = list(self.mix)
+        weights = list(self.mix.values())
+
+        def worker(seed):
+            rng = random.Random(seed)  # noqa: S311
+            while next(counter) < total:
+                operation = rng.choices(operations, weights)[0]
+                getattr(self, f'do_{operation}')(
+                    rng, rng.choice(self.operation_actors[operation])
+                )
+
+        threads = [
+            threading.Thread(target=worker, args=(self.random.random(),))
+            for _ in range(concurrency)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return time.perf_counter() - started
+
+    def call(self, operation, method, path, actor, data=None):
+        status, body, elapsed, queries = self.transport.request(
+            method, path, data, actor.token
+        )
+        # list.append атомарен: общий список записей без блокировки
+        self.records.append((operation, status, elapsed, queries))
+        return status, body
+
+    def pick_object(self, rng, actor, ids, created_filter=None):
+        """
+        В половине случаев — созданный actor объект (если его ресурс
+        проходит created_filter), иначе один из ids; None — выбрать нечего.
+        """
+        if actor.created and rng.random() < 0.5:
+            try:
+                pk, resource = rng.choice(actor.created)
+            except IndexError:
+                # Другой поток успел удалить последний созданный объект
+                pass
+            else:
+                if created_filter is None or created_filter(resource):
+                    return pk
+        return rng.choice(ids) if ids else None
+
+    def do_login(self, rng, actor):
+        self.call(
+            'login',
+            'POST',
+            '/api/auth/login/',
+            actor,
+            {'email': actor.email, 'password': self.password},
+        )
+
+    def do_list(self, rng, actor):
+        resource = rng.choice(BusinessResourceEnum.values)
+        self.call(
+            'list', 'GET', f'/api/business-objects/?resource={resource}', actor
+        )
+
+    def do_retrieve(self, rng, actor):
+        pk = self.pick_object(rng, actor, actor.visible_ids or self.all_ids)
+        self.call('retrieve', 'GET', f'/api/business-objects/{pk or 0}/', actor)
+
+    def do_create(self, rng, actor):
+        resource = rng.choice(actor.resources('create_permission'))
+        status, body = self.call(
+            'create',
+            'POST',
+            '/api/business-objects/',
+            actor,
+            {
+                'name': f'load-{uuid.uuid4().hex}',
+                'description': 'benchmark_api',
+                'resource': resource,
+            },
+        )
+        if status == 201:
+            actor.created.append((body['id'], resource))
+
+    def do_patch(self, rng, actor):
+        pk = self.pick_object(
+            rng,
+            actor,
+            actor.updatable_ids,
+            lambda resource: actor.can_update(resource, actor.pk),
+        )
+        if pk is None:
+            self.records.append(('patch', None, None, None))
+            return
+        self.call(
+            'patch',
+            'PATCH',
+            f'/api/business-objects/{pk}/',
+            actor,
+            {'description': f'benchmark_api {rng.random()}'},
+        )
+
+    def do_delete(self, rng, actor):
+        # Удаляются только объекты, созданные во время замера
+        try:
+            pk, _ = actor.created.popleft()
+        except IndexError:
+            self.records.append(('delete', None, None, None))
+            return
+        self.call('delete', 'DELETE', f'/api/business-objects/{pk}/', actor)
+
+    def summarize(self, elapsed):
+        groups = {operation: [] for operation in self.mix}
+        for record in self.records:
+            groups[record[0]].append(record)
+        groups['total'] = [
+            record for record in self.records if record[1] is not None
+        ]
+
+        # Время и SQL — по успешным ответам (2xx), отказы — отдельно
+        endpoints = {}
+        for operation, records in groups.items():
+            done = [record for record in records if record[1] is not None]
+            succeeded = [record for record in done if 200 <= record[1] < 300]
+            rejected = [record for record in done if not 200 <= record[1] < 300]
+            endpoints[operation] = {
+                'endpoint': ENDPOINTS.get(operation, '*'),
+                'requests': len(done),
+                'skipped': len(records) - len(done),
+                'statuses': dict(Counter(str(record[1]) for record in done)),
+                'rps': len(done) / elapsed if elapsed else 0,
+                **latency_summary(succeeded),
+                'rejected': latency_summary(rejected) if rejected else None,
+            }
+        return endpoints
+
+    def check_writes(self, endpoints):
+        """Ошибка, если операция записи не получила ни одного ответа 2xx."""
+        failed = [
+            operation
+            for operation in WRITE_PERMISSIONS
+            if operation in endpoints
+            and endpoints[operation]['requests']
+            and not any(
+                status.startswith('2')
+                for status in endpoints[operation]['statuses']
+            )
+        ]
+        if failed:
+            raise CommandError(
+                f'Ни одного успешного ответа на {", ".join(failed)}: у '
+                'пользователей нагрузки нет прав на запись, проверьте --roles '
+                'и правила доступа.'
+            )
+
+    def print_results(self, endpoints):
+        def number(value, digits=1):
+            return '-' if value is None else f'{value:.{digits}f}'
+
+        self.stdout.write(
+            f'{"операция":<10}{"запросов":>9}{"rps":>9}{"p50 мс":>9}'
+            f'{"p95 мс":>9}{"p99 мс":>9}{"SQL/запр":>10}  статусы'
+        )
+        for operation, row in endpoints.items():
+            statuses = ' '.join(
+                f'{status}×{amount}'
+                for status, amount in sorted(row['statuses'].items())
+            )
+            if row['skipped']:
+                statuses += f' пропущено×{row["skipped"]}'
+            self.stdout.write(
+                f'{operation:<10}{row["requests"]:>9}{number(row["rps"]):>9}'
+                f'{number(row["p50_ms"]):>9}{number(row["p95_ms"]):>9}'
+                f'{number(row["p99_ms"]):>9}'
+                f'{number(row["queries_per_request"]):>10}  {statuses}'
+            )
+            rejected = row.get('rejected')
+            if rejected:
+                self.stdout.write(
+                    f'{"  отказы":<10}{"":>9}{"":>9}'
+                    f'{number(rejected["p50_ms"]):>9}'
+                    f'{number(rejected["p95_ms"]):>9}'
+                    f'{number(rejected["p99_ms"]):>9}'
+                    f'{number(rejected["queries_per_request"]):>10}'
+                )
+
+    def print_comparison(self, previous, current):
+        def change(old, new):
+            if not old or new is None:
+                return '-'
+            return f'{(new - old) / old * 100:+.1f}%'
+
+        self.stdout.write('Изменение относительно прошлого прогона:')
+        self.stdout.write(
+            f'{"операция":<10}{"rps":>9}{"p50":>9}{"p95":>9}{"p99":>9}{"SQL":>9}'
+        )
+        for operation, row in current.items():
+            old = previous.get(operation)
+            if old is None:
+                continue
+            changes = ''.join(
+                f'{change(old[key], row[key]):>9}'
+                for key in ('rps', 'p50_ms', 'p95_ms', 'p99_ms', 'queries_per_request')
+            )
+            self.stdout.write(f'{operation:<10}{changes}')
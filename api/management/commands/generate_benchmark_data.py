@@ -0,0 +1,195 @@
+import random
+import time
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import CommandError
+from django.db import connection
+from django.utils import timezone
+
+from access.models import Role, RoleEnum
+from api.management.commands.import_data import DEFAULT_BATCH_SIZE
+from api.management.commands.import_data import Command as ImportCommand
+from business_objects.models import BusinessObject, BusinessResource
+from users.models import User
+
+BENCHMARK_EMAIL_DOMAIN = 'bench.example.com'
+BENCHMARK_OBJECT_PREFIX = 'bench-'
+BENCHMARK_PASSWORD = 'Password_123'  # noqa: S105
+# Доли ролей среди сгенерированных пользователей
+ROLE_SHARES = {
+    RoleEnum.ADMIN: 0.01,
+    RoleEnum.MANAGER: 0.14,
+    RoleEnum.USER: 0.85,
+}
+
+
+class Command(ImportCommand):
+    help = (
+        'Синтетические данные для нагрузочных замеров (benchmark_api): '
+        'пользователи с распределением ролей и бизнес-объекты '
+        'с перекосом владения по закону Ципфа. Вставка пачками через COPY '
+        '(PostgreSQL) или bulk_create, как в import_data.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--users',
+            type=int,
+            default=1000,
+            help='Сколько пользователей создать.'
+        )
+        parser.add_argument(
+            '--objects',
+            type=int,
+            default=10_000,
+            help='Сколько бизнес-объектов создать.'
+        )
+        parser.add_argument(
+            '--skew',
+            type=float,
+            default=1.1,
+            help=(
+                'Показатель Ципфа для владельцев объектов: 0 — равномерно, '
+                'больше — сильнее перекос в пользу "активных" пользователей.'
+            )
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Зерно генератора случайных чисел.'
+        )
+        parser.add_argument(
+            '--password',
+            default=BENCHMARK_PASSWORD,
+            help='Пароль всех сгенерированных пользователей.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Сколько строк вставлять за раз.'
+        )
+        parser.add_argument(
+            '--no-copy',
+            action='store_true',
+            help='Не использовать COPY даже на PostgreSQL.'
+        )
+        parser.add_argument(
+            '--clear',
+            action='store_true',
+            help='Сначала удалить ранее сгенерированные данные.'
+        )
+
+    def handle(self, *args, **options):
+        self.use_copy = (
+            connection.vendor == 'postgresql'
+            and not options['no_copy']
+        )
+        self.batch_size = options['batch_size']
+        self.now = timezone.now()
+        self.random = random.Random(options['seed'])  # noqa: S311
+        self.roles = dict(Role.objects.values_list('name', 'id'))
+        self.resources = list(BusinessResource.objects.values_list('id', flat=True))
+        missing = set(ROLE_SHARES) - set(self.roles)
+        if missing or not self.resources:
+            raise CommandError(
+                'Нет ролей или бизнес-ресурсов: сначала загрузите фикстуры '
+                'roles.json и business_resources.json.'
+            )
+
+        if options['clear']:
+            self.clear()
+        self.create_users(options['users'], options['password'])
+        self.create_business_objects(options['objects'], options['skew'])
+
+        # Статистика планировщика после массовой вставки
+        with connection.cursor() as cursor:
+            for model in (User, BusinessObject):
+                cursor.execute(
+                    f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}'
+                )
+
+    def clear(self):
+        deleted, _ = BusinessObject.objects.filter(
+            name__startswith=BENCHMARK_OBJECT_PREFIX
+        ).delete()
+        self.stdout.write(f'Удалено бизнес-объектов: {deleted}')
+        deleted, _ = User.objects.filter(
+            email__endswith=f'@{BENCHMARK_EMAIL_DOMAIN}'
+        ).delete()
+        self.stdout.write(f'Удалено строк с пользователями: {deleted}')
+
+    def insert_rows(self, model, rows, total):
+        started = time.monotonic()
+        inserted = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                inserted += self.insert(model, batch, inserted + len(batch))
+                batch = []
+                self.report(inserted, started)
+        if batch:
+            inserted += self.insert(model, batch, total)
+            self.report(inserted, started)
+
+    def create_users(self, count, password):
+        # Хеш один на всех: хешировать каждый пароль слишком долго
+        encoded = make_password(password)
+        start = User.objects.filter(
+            email__endswith=f'@{BENCHMARK_EMAIL_DOMAIN}'
+        ).count()
+        role_names = list(ROLE_SHARES)
+        role_weights = list(accumulate(ROLE_SHARES.values()))
+
+        def rows():
+            for number in range(start, start + count):
+                role = self.random.choices(role_names, cum_weights=role_weights)[0]
+                yield User(
+                    email=f'user{number}@{BENCHMARK_EMAIL_DOMAIN}',
+                    username=f'bench{number}',
+                    first_name='Bench',
+                    last_name=f'User {number}',
+                    password=encoded,
+                    role_id=self.roles[role],
+                    is_active=True,
+                    is_staff=False,
+                    is_superuser=False,
+                    date_joined=self.now,
+                )
+
+        self.stdout.write(f'Пользователи: {count}')
+        self.insert_rows(User, rows(), count)
+
+    def create_business_objects(self, count, skew):
+        owners = list(
+            User.objects.filter(email__endswith=f'@{BENCHMARK_EMAIL_DOMAIN}')
+            .order_by('pk')
+            .values_list('pk', flat=True)
+        )
+        if not owners:
+            raise CommandError('Нет сгенерированных пользователей-владельцев.')
+        # Ранг владельца случайный: "активные" разбросаны по ролям
+        self.random.shuffle(owners)
+        owner_weights = list(accumulate(
+            1 / rank ** skew for rank in range(1, len(owners) + 1)
+        ))
+        start = BusinessObject.objects.filter(
+            name__startswith=BENCHMARK_OBJECT_PREFIX
+        ).count()
+
+        def rows():
+            for number in range(start, start + count):
+                yield BusinessObject(
+                    name=f'{BENCHMARK_OBJECT_PREFIX}{number}',
+                    description=f'Синтетический объект {number}',
+                    resource_id=self.random.choice(self.resources),
+                    owner_id=self.random.choices(
+                        owners, cum_weights=owner_weights
+                    )[0],
+                )
+
+        self.stdout.write(f'Бизнес-объекты: {count}')
+        self.insert_rows(BusinessObject, rows(), count)
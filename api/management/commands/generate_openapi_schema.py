@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api.schema import generate_schema, schema_setting, write_schema
+
+
+class Command(BaseCommand):
+    help = (
+        'Собрать схему OpenAPI в файл при сборке: процессы сервиса читают '
+        'её из OPENAPI_SCHEMA_FILE и не обходят вьюсеты сами.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            default=schema_setting('OPENAPI_SCHEMA_FILE', ''),
+            help='Куда записать схему (по умолчанию OPENAPI_SCHEMA_FILE).'
+        )
+
+    def handle(self, *args, **options):
+        if not options['output']:
+            raise CommandError('Укажите --output или OPENAPI_SCHEMA_FILE.')
+        content = generate_schema()
+        write_schema(options['output'], content)
+        self.stdout.write(f'Схема записана в {options["output"]} ({len(content)} байт)')
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from api.constants import PROFILING_TOKEN_MAX_AGE
+from api.profiling import make_profiling_token
+
+
+class Command(BaseCommand):
+    help = (
+        'Выдать подписанный токен для заголовка X-Profile: запросы '
+        'с ним профилируются (ProfilingMiddleware).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--max-age',
+            type=int,
+            default=PROFILING_TOKEN_MAX_AGE,
+            help='Сколько секунд действует токен.'
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(make_profiling_token(options['max_age']))
@@ -0,0 +1,612 @@
+import atexit
+import fcntl
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+
+from api.constants import (
+    METRICS_AGGREGATE_FILE,
+    METRICS_DEAD_INTERVALS,
+    METRICS_DIR_NAME,
+    METRICS_FLUSH_INTERVAL,
+    METRICS_LATENCY_BUCKETS,
+    METRICS_LOCK_FILE,
+    METRICS_QUERY_BUCKETS,
+    METRICS_STALE_INTERVALS,
+)
+from api.db_pool import get_pools
+
+logger = logging.getLogger(__name__)
+
+# Счётчик SQL текущего запроса ([число]); None — запрос не учитывается
+query_counter = ContextVar('query_counter', default=None)
+
+# Результат входа и обновления токена по статусу ответа
+AUTH_RESULTS = {
+    200: 'success',
+    400: 'invalid',
+    401: 'failure',
+    429: 'throttled',
+}
+
+# Счётчики пула psycopg в метриках: поле get_stats, метрика, тип, описание
+POOL_METRICS = (
+    ('pool_size', 'api_db_pool_size', 'gauge', 'Открытые соединения пула'),
+    (
+        'pool_available',
+        'api_db_pool_available',
+        'gauge',
+        'Свободные соединения пула',
+    ),
+    (
+        'requests_waiting',
+        'api_db_pool_requests_waiting',
+        'gauge',
+        'Ожидающие соединения из пула',
+    ),
+    (
+        'requests_num',
+        'api_db_pool_requests_total',
+        'counter',
+        'Выдачи соединения из пула',
+    ),
+    (
+        'requests_wait_ms',
+        'api_db_pool_wait_milliseconds_total',
+        'counter',
+        'Суммарное ожидание соединения из пула, мс',
+    ),
+    (
+        'connections_lost',
+        'api_db_pool_connections_lost_total',
+        'counter',
+        'Соединения пула, не прошедшие проверку',
+    ),
+)
+
+
+def metrics_setting(name, default):
+    return getattr(settings, name, default)
+
+
+def read_snapshot(path):
+    """Снимок из файла или None, если файла уже нет."""
+    try:
+        snapshot = json.loads(path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+    snapshot.setdefault('process', path.stem)
+    return snapshot
+
+
+def write_snapshot(path, snapshot):
+    temporary = path.with_suffix('.tmp')
+    temporary.write_text(json.dumps(snapshot), encoding='utf-8')
+    # Читатель видит либо старый, либо новый снимок целиком
+    os.replace(temporary, path)
+
+
+class Metric:
+    """Метрика процесса: значения по наборам меток под своей блокировкой."""
+
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def _key(self, labels):
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def reset(self):
+        self._lock = threading.Lock()
+        self._values = {}
+
+    def snapshot(self):
+        with self._lock:
+            samples = [[list(key), value] for key, value in self._values.items()]
+        return {
+            'type': self.type,
+            'help': self.documentation,
+            'labelnames': list(self.labelnames),
+            'samples': samples,
+        }
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        registry.ensure_flusher()
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Histogram(Metric):
+    """
+    Гистограмма: на набор меток — число наблюдений в каждой корзине
+    (последняя — +Inf) и их сумма. Корзины не накопительные,
+    накопительными они становятся при выводе.
+    """
+
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=()):
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, labelnames)
+
+    def observe(self, value, **labels):
+        registry.ensure_flusher()
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [0] * (len(self.buckets) + 1) + [0]
+            entry[index] += 1
+            entry[-1] += value
+
+    def snapshot(self):
+        with self._lock:
+            samples = [
+                [list(key), list(value)] for key, value in self._values.items()
+            ]
+        return {
+            'type': self.type,
+            'help': self.documentation,
+            'labelnames': list(self.labelnames),
+            'buckets': list(self.buckets),
+            'samples': samples,
+        }
+
+
+class MetricsRegistry:
+    """
+    Метрики процесса и их сбор по всем процессам.
+
+    Каждый процесс (воркер gunicorn и т.п.) считает в памяти, а фоновый
+    поток раз в METRICS_FLUSH_INTERVAL секунд записывает снимок
+    в METRICS_DIR/<pid>-<uuid>.json. Снимки пишут только процессы
+    сервера (enable_flush() в backend/wsgi.py и backend/asgi.py),
+    а не команды manage.py. При сборе снимки всех процессов
+    складываются: счётчики и гистограммы — все, включая завершившиеся
+    процессы, gauge — только из свежих снимков. Снимки завершившихся
+    процессов сворачиваются в METRICS_AGGREGATE_FILE.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+        self._flush_enabled = False
+        self._flusher_pid = None
+        self._exit_flush = False
+        self._process = (None, None)
+
+    def register(self, metric):
+        self._metrics[metric.name] = metric
+        return metric
+
+    def register_collector(self, collector):
+        """
+        Функция, которая при снимке возвращает метрики в формате snapshot
+        с дополнительным ключом name: состояние кэшей, пулов и т.п.
+        """
+        self._collectors.append(collector)
+        return collector
+
+    @property
+    def directory(self):
+        return Path(metrics_setting(
+            'METRICS_DIR', Path(settings.BASE_DIR) / METRICS_DIR_NAME
+        ))
+
+    @property
+    def interval(self):
+        return metrics_setting('METRICS_FLUSH_INTERVAL', METRICS_FLUSH_INTERVAL)
+
+    @property
+    def process(self):
+        """
+        Имя снимка процесса: pid со случайным суффиксом, чтобы процесс
+        с повторно выданным pid не перезаписал снимок завершившегося.
+        """
+        pid, process = self._process
+        if pid != os.getpid():
+            pid = os.getpid()
+            process = f'{pid}-{uuid.uuid4().hex}'
+            self._process = (pid, process)
+        return process
+
+    def enable_flush(self):
+        """Записывать снимки этого процесса (и его дочерних) в METRICS_DIR."""
+        self._flush_enabled = True
+
+    def snapshot(self):
+        metrics = {name: metric.snapshot() for name, metric in self._metrics.items()}
+        for collector in self._collectors:
+            for metric in collector():
+                metrics[metric.pop('name')] = metric
+        return {'process': self.process, 'time': time.time(), 'metrics': metrics}
+
+    def flush(self):
+        directory = self.directory
+        directory.mkdir(parents=True, exist_ok=True)
+        write_snapshot(directory / f'{self.process}.json', self.snapshot())
+
+    def ensure_flusher(self):
+        # После fork поток записи родителя в дочернем процессе не живёт
+        pid = os.getpid()
+        if not self._flush_enabled or self._flusher_pid == pid:
+            return
+        with self._lock:
+            if self._flusher_pid == pid:
+                return
+            self._flusher_pid = pid
+            if not self._exit_flush:
+                # Последний снимок при штатном завершении процесса
+                atexit.register(self._flush_quietly)
+                self._exit_flush = True
+            threading.Thread(
+                target=self._flush_forever,
+                name='metrics-flusher',
+                daemon=True,
+            ).start()
+
+    def _flush_quietly(self):
+        try:
+            self.flush()
+        except Exception:
+            logger.exception('Не удалось записать снимок метрик')
+
+    def _flush_forever(self):
+        while True:
+            time.sleep(self.interval)
+            self._flush_quietly()
+
+    def after_fork(self):
+        """Дочерний процесс считает с нуля: значения родителя в его снимке."""
+        self._lock = threading.Lock()
+        for metric in self._metrics.values():
+            metric.reset()
+
+    def collect(self):
+        """Снимки всех процессов: свой — текущий, остальных — из METRICS_DIR."""
+        if self.directory.is_dir():
+            self.compact()
+        own = self.snapshot()
+        snapshots = [own]
+        for path in self.directory.glob('*.json'):
+            if path.name == METRICS_AGGREGATE_FILE or path.stem == own['process']:
+                continue
+            snapshot = read_snapshot(path)
+            # None — файл удалён между glob и чтением
+            if snapshot is not None:
+                snapshots.append(snapshot)
+        # Сводка читается после снимков: снимок, удалённый при сворачивании,
+        # в ней уже учтён, а прочитанный до удаления пропускается по folded
+        aggregate = read_snapshot(self.directory / METRICS_AGGREGATE_FILE)
+        if aggregate is not None:
+            snapshots = [
+                snapshot for snapshot in snapshots
+                if snapshot['process'] not in aggregate['folded']
+            ]
+            snapshots.append(aggregate)
+        return snapshots
+
+    def compact(self):
+        """
+        Сложить счётчики и гистограммы завершившихся процессов (снимок
+        старше METRICS_DEAD_INTERVALS интервалов) в METRICS_AGGREGATE_FILE
+        и удалить их снимки: каталог не растёт с каждым перезапуском воркера.
+        """
+        directory = self.directory
+        dead_after = self.interval * METRICS_DEAD_INTERVALS
+        now = time.time()
+        with open(directory / METRICS_LOCK_FILE, 'a') as lock:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Сворачивает другой процесс
+                return
+            aggregate_path = directory / METRICS_AGGREGATE_FILE
+            aggregate = read_snapshot(aggregate_path) or {
+                'time': 0, 'folded': {}, 'metrics': {}
+            }
+            dead = []
+            for path in directory.glob('*.json'):
+                if path == aggregate_path:
+                    continue
+                snapshot = read_snapshot(path)
+                if snapshot is not None and now - snapshot['time'] > dead_after:
+                    dead.append((path, snapshot))
+            if not dead:
+                return
+            # gauge не переносятся: в merge сводка и снимки не свежие
+            merged = self.merge([aggregate, *(snapshot for _, snapshot in dead)])
+            folded = {
+                process: folded_at
+                for process, folded_at in aggregate['folded'].items()
+                if now - folded_at <= dead_after
+            }
+            folded.update(dict.fromkeys(
+                (snapshot['process'] for _, snapshot in dead), now
+            ))
+            write_snapshot(aggregate_path, {
+                'process': 'aggregate',
+                'time': 0,
+                'folded': folded,
+                'metrics': {
+                    name: {
+                        **metric,
+                        'samples': [
+                            [list(key), value]
+                            for key, value in metric['samples'].items()
+                        ],
+                    }
+                    for name, metric in merged.items()
+                },
+            })
+            for path, _ in dead:
+                path.unlink(missing_ok=True)
+
+    def merge(self, snapshots):
+        stale_after = self.interval * METRICS_STALE_INTERVALS
+        now = time.time()
+        merged = {}
+        for snapshot in snapshots:
+            fresh = now - snapshot['time'] <= stale_after
+            for name, metric in snapshot['metrics'].items():
+                if metric['type'] == 'gauge' and not fresh:
+                    continue
+                target = merged.setdefault(name, {**metric, 'samples': {}})
+                if (target['labelnames'], target.get('buckets')) != (
+                    metric['labelnames'], metric.get('buckets')
+                ):
+                    # Снимок версии сервиса с другими метками или корзинами
+                    continue
+                samples = target['samples']
+                for labels, value in metric['samples']:
+                    key = tuple(labels)
+                    current = samples.get(key)
+                    if current is None:
+                        samples[key] = value
+                    elif isinstance(value, list):
+                        samples[key] = [
+                            a + b for a, b in zip(current, value, strict=True)
+                        ]
+                    else:
+                        samples[key] = current + value
+        return merged
+
+    def render(self):
+        """Метрики всех процессов в текстовом формате Prometheus."""
+        lines = []
+        for name, metric in sorted(self.merge(self.collect()).items()):
+            lines.append(f'# HELP {name} {escape_help(metric["help"])}')
+            lines.append(f'# TYPE {name} {metric["type"]}')
+            for key, value in sorted(metric['samples'].items()):
+                labels = list(zip(metric['labelnames'], key, strict=True))
+                if metric['type'] != 'histogram':
+                    lines.append(format_sample(name, labels, value))
+                    continue
+                *counts, total = value
+                bounds = [repr(float(bound)) for bound in metric['buckets']]
+                cumulative = 0
+                for bound, count in zip([*bounds, '+Inf'], counts, strict=True):
+                    cumulative += count
+                    lines.append(format_sample(
+                        f'{name}_bucket', [*labels, ('le', bound)], cumulative
+                    ))
+                lines.append(format_sample(f'{name}_count', labels, cumulative))
+                lines.append(format_sample(f'{name}_sum', labels, total))
+        return '\n'.join(lines) + '\n'
+
+
+def escape_help(text):
+    return text.replace('\\', r'\\').replace('\n', r'\n')
+
+
+def escape_label(value):
+    return escape_help(value).replace('"', r'\"')
+
+
+def format_sample(name, labels, value):
+    if not labels:
+        return f'{name} {value}'
+    pairs = ','.join(f'{label}="{escape_label(text)}"' for label, text in labels)
+    return f'{name}{{{pairs}}} {value}'
+
+
+registry = MetricsRegistry()
+
+request_duration = Histogram(
+    'api_request_duration_seconds',
+    'Время обработки запроса вью, включая рендер ответа',
+    ('view', 'action', 'status'),
+    buckets=METRICS_LATENCY_BUCKETS,
+)
+request_queries = Histogram(
+    'api_request_db_queries',
+    'Число SQL-запросов на запрос',
+    ('view', 'action'),
+    buckets=METRICS_QUERY_BUCKETS,
+)
+authorization_decisions = Counter(
+    'api_authorization_decisions_total',
+    'Решения BusinessResourcePermission',
+    ('resource', 'action', 'decision'),
+)
+login_attempts = Counter(
+    'api_login_attempts_total',
+    'Попытки входа по результату',
+    ('result',),
+)
+token_refreshes = Counter(
+    'api_token_refreshes_total',
+    'Обновления access токена по результату',
+    ('result',),
+)
+tokens_blacklisted = Counter(
+    'api_tokens_blacklisted_total',
+    'Refresh токены, добавленные в blacklist',
+    ('reason',),
+)
+
+
+def auth_result(status_code):
+    return AUTH_RESULTS.get(status_code, 'error')
+
+
+def count_sql(execute, sql, params, many, context):
+    """Обёртка выполнения SQL (connection.execute_wrapper): считает запросы."""
+    counter = query_counter.get()
+    if counter is not None:
+        counter[0] += 1
+    return execute(sql, params, many, context)
+
+
+@contextmanager
+def count_queries():
+    """Считать SQL-запросы блока; число — в counter[0] после выхода."""
+    counter = [0]
+    token = query_counter.set(counter)
+    try:
+        yield counter
+    finally:
+        query_counter.reset(token)
+
+
+def observe_request(view, action, status_code, duration, queries):
+    status = f'{status_code // 100}xx'
+    request_duration.observe(duration, view=view, action=action, status=status)
+    request_queries.observe(queries, view=view, action=action)
+
+
+class MetricsMixin:
+    """
+    Миксин вью DRF: время обработки и число SQL-запросов по действиям.
+
+    Время считается до конца рендера ответа. Для потоковых ответов
+    (export) — до начала отдачи, SQL во время отдачи не учитывается.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        started = time.perf_counter()
+        with count_queries() as queries:
+            response = super().dispatch(request, *args, **kwargs)
+        action = getattr(self, 'action', None) or request.method.lower()
+
+        def observe(response):
+            observe_request(
+                type(self).__name__,
+                action,
+                response.status_code,
+                time.perf_counter() - started,
+                queries[0],
+            )
+
+        if getattr(response, 'is_rendered', True):
+            observe(response)
+        else:
+            response.add_post_render_callback(observe)
+        return response
+
+
+@registry.register_collector
+def collect_caches():
+    from users import throttling
+    from users.authentication import jwt_cache, user_cache
+
+    caches = {'user': user_cache, 'jwt': jwt_cache}
+    backend = throttling._backend
+    if isinstance(backend, throttling.MemoryWindowBackend):
+        caches['throttle'] = backend._counters
+    stats = {name: cache.stats() for name, cache in caches.items()}
+    return [
+        {
+            'name': f'api_cache_{field}{suffix}',
+            'type': metric_type,
+            'help': documentation,
+            'labelnames': ['cache'],
+            'samples': [[[name], values[field]] for name, values in stats.items()],
+        }
+        for field, suffix, metric_type, documentation in (
+            ('hits', '_total', 'counter', 'Попадания в кэш процесса'),
+            ('misses', '_total', 'counter', 'Промахи кэша процесса'),
+            ('size', '', 'gauge', 'Записи в кэше процесса'),
+        )
+    ]
+
+
+@registry.register_collector
+def collect_db_pools():
+    stats = {alias: pool.get_stats() for alias, pool in get_pools().items()}
+    return [
+        {
+            'name': name,
+            'type': metric_type,
+            'help': documentation,
+            'labelnames': ['alias'],
+            'samples': [
+                [[alias], values.get(field, 0)] for alias, values in stats.items()
+            ],
+        }
+        for field, name, metric_type, documentation in POOL_METRICS
+    ]
+
+
+@registry.register_collector
+def collect_audit_log():
+    from audit.log import audit_log
+
+    stats = audit_log.stats()
+    return [
+        {
+            'name': name,
+            'type': metric_type,
+            'help': documentation,
+            'labelnames': [],
+            'samples': [[[], stats[field]]],
+        }
+        for field, name, metric_type, documentation in (
+            (
+                'queued',
+                'api_audit_events_queued',
+                'gauge',
+                'События аудита в очереди процесса',
+            ),
+            (
+                'written',
+                'api_audit_events_written_total',
+                'counter',
+                'Записанные события аудита',
+            ),
+            (
+                'dropped',
+                'api_audit_events_dropped_total',
+                'counter',
+                'События аудита, отброшенные из-за полной очереди',
+            ),
+            (
+                'failed',
+                'api_audit_events_failed_total',
+                'counter',
+                'События аудита, которые не удалось записать',
+            ),
+        )
+    ]
@@ -0,0 +1,71 @@
+from rest_framework.pagination import CursorPagination
+from rest_framework.response import Response
+
+
+def is_cursor_pagination_requested(request):
+    """Запрошена ли курсорная пагинация: ?pagination=cursor или ?cursor=."""
+    params = request.query_params
+    return 'cursor' in params or params.get('pagination') == 'cursor'
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset (курсорная) пагинация.
+
+    Страница выбирается условием по полю ordering, а не OFFSET,
+    поэтому любая страница стоит как первая. CursorPagination позиционирует
+    только по первому полю ordering и разрешает равные значения смещением:
+    настоящий keyset получается, только если это поле уникально.
+    COUNT(*) выполняется только по запросу: ?with_count=true.
+    """
+    count_query_param = 'with_count'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count = None
+        if request.query_params.get(self.count_query_param) == 'true':
+            self.count = queryset.count()
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        payload = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.count is not None:
+            payload = {'count': self.count, **payload}
+        return Response(payload)
+
+
+class BusinessObjectCursorPagination(KeysetPagination):
+    """Курсорная пагинация бизнес-объектов по уникальному name."""
+    ordering = ('name',)
+
+
+class UserCursorPagination(KeysetPagination):
+    """Курсорная пагинация пользователей по уникальному username."""
+    ordering = ('username',)
+
+
+class CursorPaginationMixin:
+    """
+    Миксин вьюсета с курсорной пагинацией по запросу.
+
+    По умолчанию используется общая пагинация проекта; с ?pagination=cursor
+    (и на следующих страницах, ссылки которых содержат ?cursor=) —
+    cursor_pagination_class.
+    """
+    cursor_pagination_class = None
+
+    def is_cursor_pagination(self):
+        return is_cursor_pagination_requested(self.request)
+
+    @property
+    def paginator(self):
+        if (
+            not hasattr(self, '_paginator')
+            and self.cursor_pagination_class is not None
+            and self.is_cursor_pagination()
+        ):
+            self._paginator = self.cursor_pagination_class()
+        return super().paginator
@@ -1,6 +1,12 @@
 from rest_framework.permissions import BasePermission
 
-from access.models import AccessRule, RoleEnum
+from access.claims import aget_permission_claims, get_permission_claims
+from access.constants import PERMISSION_BITS, PERMISSIONS_CLAIM, ROLE_CLAIM
+from access.models import RoleEnum
+from access.policy import permission_matrix
+from api.metrics import authorization_decisions
+from audit.log import audit_log
+from business_objects.models import BusinessObject, BusinessResourceEnum
 
 
 class BusinessResourcePermission(BasePermission):
@@ -24,24 +30,229 @@ class BusinessResourcePermission(BasePermission):
     # Соответствие действий view -> атрибуты AccessRule
     action_permission_map = {
         'list': ('read_all_permission', 'read_owned_permission'),
+        'export': ('read_all_permission', 'read_owned_permission'),
         'retrieve': ('read_all_permission', 'read_owned_permission'),
         'create': ('create_permission', None),
         'partial_update': ('update_all_permission', 'update_owned_permission'),
         'destroy': ('delete_all_permission', 'delete_owned_permission'),
     }
 
-    def get_rule(self, *, user, resource_name):
-        """Получить AccessRule или None."""
-        if not user.is_authenticated or not resource_name:
-            return None
+    # Области действия правила: все объекты ресурса или только свои
+    SCOPE_ALL = 'all'
+    SCOPE_OWNED = 'owned'
 
-        try:
-            return AccessRule.objects.get(
-                role=user.role,
-                business_resource__name=resource_name
+    def has_rule_permission(self, *, user, resource_name, permission, claims=None):
+        """
+        Проверить флаг AccessRule роли пользователя.
+
+        При актуальных claims токена (см. access.claims) решение
+        принимается по ним, иначе — по матрице прав.
+        """
+        if not user.is_authenticated or not resource_name or not permission:
+            return False
+
+        if claims is not None:
+            mask = claims[PERMISSIONS_CLAIM].get(resource_name, 0)
+            return bool(mask & PERMISSION_BITS[permission])
+
+        return permission_matrix.has_permission(
+            user.role_id, resource_name, permission
+        )
+
+    def get_scope(self, *, user, action, resource_name, claims=None):
+        """
+        Область действия action над объектами ресурса.
+
+        SCOPE_ALL — любые объекты, SCOPE_OWNED — только свои,
+        None — никакие.
+        """
+        perm_all, perm_owned = self.action_permission_map.get(action, (None, None))
+
+        if self.has_rule_permission(
+            user=user,
+            resource_name=resource_name,
+            permission=perm_all,
+            claims=claims
+        ):
+            return self.SCOPE_ALL
+
+        if self.has_rule_permission(
+            user=user,
+            resource_name=resource_name,
+            permission=perm_owned,
+            claims=claims
+        ):
+            return self.SCOPE_OWNED
+
+        return None
+
+    def record_decision(
+        self, *, user, action, resource_name, allowed, object_id=None
+    ):
+        """
+        Учесть решение в метриках и журнале аудита.
+
+        В метриках неизвестные ресурсы и действия собираются под одной
+        меткой, в журнал попадают как есть.
+        """
+        authorization_decisions.inc(
+            resource=(
+                resource_name
+                if resource_name in BusinessResourceEnum.values
+                else 'unknown'
+            ),
+            action=action if action in self.action_permission_map else 'unknown',
+            decision='allow' if allowed else 'deny',
+        )
+        audit_log.record_decision(
+            user=user,
+            action=action,
+            resource_name=resource_name,
+            allowed=allowed,
+            object_id=object_id,
+        )
+        return allowed
+
+    def filter_queryset(self, request, queryset, *, resource_name, action):
+        """
+        Отфильтровать queryset объектов ресурса по правам на action.
+
+        Правило превращается в условие WHERE: все объекты ресурса
+        (*_all_permission), только свои (*_owned_permission) или ничего.
+        """
+        scope = self.get_scope(
+            user=request.user,
+            action=action,
+            resource_name=resource_name,
+            claims=get_permission_claims(request.auth)
+        )
+        return self.filter_by_scope(
+            queryset, user=request.user, resource_name=resource_name, scope=scope
+        )
+
+    def filter_by_scope(self, queryset, *, user, resource_name, scope):
+        """Оставить в queryset объекты ресурса, попадающие в scope."""
+        queryset = queryset.filter(resource__name=resource_name)
+
+        if scope == self.SCOPE_ALL:
+            return queryset
+
+        if scope == self.SCOPE_OWNED:
+            return queryset.filter(owner_id=user.pk)
+
+        return queryset.none()
+
+    async def aget_claims(self, request):
+        """
+        Claims для проверок в асинхронном коде.
+
+        Актуальные claims токена или маски роли из матрицы прав в том же
+        формате: с ними методы пермишена не обращаются к БД и их можно
+        вызывать прямо из цикла asyncio.
+        """
+        claims = await aget_permission_claims(request.auth)
+        if claims is not None:
+            return claims
+        return {
+            PERMISSIONS_CLAIM: await permission_matrix.aget_role_masks(
+                request.user.role_id
             )
-        except AccessRule.DoesNotExist:
-            return None
+        }
+
+    def is_resource_allowed(self, *, user, action, resource_name, claims=None):
+        """
+        Решение для action над ресурсом без конкретного объекта.
+
+        Для list достаточно права хотя бы на свои объекты
+        (лишнее отсекает filter_queryset), для create — create_permission.
+        """
+        allowed = any(
+            self.has_rule_permission(
+                user=user,
+                resource_name=resource_name,
+                permission=permission,
+                claims=claims
+            )
+            for permission in self.action_permission_map.get(action, ())
+        )
+        return self.record_decision(
+            user=user, action=action, resource_name=resource_name, allowed=allowed
+        )
+
+    def is_object_allowed(
+        self, *, user, action, resource_name, owner_id, claims=None,
+        object_id=None
+    ):
+        """
+        Решение для action над объектом ресурса с владельцем owner_id.
+
+        object_id нужен только журналу аудита.
+        """
+        scope = self.get_scope(
+            user=user,
+            action=action,
+            resource_name=resource_name,
+            claims=claims
+        )
+        if scope == self.SCOPE_OWNED:
+            allowed = owner_id == user.pk
+        else:
+            allowed = scope == self.SCOPE_ALL
+        return self.record_decision(
+            user=user,
+            action=action,
+            resource_name=resource_name,
+            allowed=allowed,
+            object_id=object_id,
+        )
+
+    def check_many(self, *, user, checks, claims=None):
+        """
+        Пакетная проверка прав.
+
+        checks — список словарей с ключом action и одним из ключей
+        business_object_id или resource. Все объекты загружаются одним
+        запросом, правила берутся из матрицы прав, поэтому число запросов
+        не зависит от длины списка. Возвращает список bool в том же порядке.
+        """
+        object_ids = {
+            check['business_object_id']
+            for check in checks
+            if check.get('business_object_id') is not None
+        }
+        objects = {}
+        if object_ids:
+            rows = BusinessObject.objects.filter(pk__in=object_ids).values_list(
+                'pk', 'resource__name', 'owner_id'
+            )
+            objects = {
+                pk: (resource_name, owner_id)
+                for pk, resource_name, owner_id in rows
+            }
+
+        decisions = []
+        for check in checks:
+            object_id = check.get('business_object_id')
+            if object_id is None:
+                decisions.append(self.is_resource_allowed(
+                    user=user,
+                    action=check['action'],
+                    resource_name=check.get('resource'),
+                    claims=claims
+                ))
+                continue
+
+            # Несуществующий объект — всегда отказ
+            resource_name, owner_id = objects.get(object_id, (None, None))
+            decisions.append(resource_name is not None and self.is_object_allowed(
+                user=user,
+                action=check['action'],
+                resource_name=resource_name,
+                owner_id=owner_id,
+                claims=claims,
+                object_id=object_id
+            ))
+        return decisions
 
     def has_permission(self, request, view):
         action = view.action
@@ -50,70 +261,88 @@ class BusinessResourcePermission(BasePermission):
         if perm_all is None:
             return False
 
-        if view.action == 'list':
+        if view.action in ('list', 'export'):
             # Получаем имя бизнес-ресурса
             resource_name = request.query_params.get('resource')
             if not resource_name:
                 return False
 
-            # Получаем правило доступа из БД
-            rule = self.get_rule(
+            return self.is_resource_allowed(
                 user=request.user,
-                resource_name=resource_name
+                action=action,
+                resource_name=resource_name,
+                claims=get_permission_claims(request.auth)
             )
 
-            return bool(rule and getattr(rule, perm_all, False))
-
         if view.action == 'create':
             # Получаем имя бизнес-ресурса
             resource_name = request.data.get('resource')
             if not resource_name:
                 return False
 
-            # Получаем правило доступа
-            rule = self.get_rule(
+            return self.is_resource_allowed(
                 user=request.user,
-                resource_name=resource_name
+                action=action,
+                resource_name=resource_name,
+                claims=get_permission_claims(request.auth)
             )
 
-            return bool(rule and getattr(rule, perm_all, False))
-
         return True
 
     def has_object_permission(self, request, view, obj):
-        # Получаем имя правила доступа
-        perm_all, perm_owned = self.action_permission_map.get(view.action, (None, None))
-        if perm_all is None:
-            return False
-
-        # Получаем правило доступа
-        rule = self.get_rule(
+        return self.is_object_allowed(
             user=request.user,
-            resource_name=obj.resource.name
+            action=view.action,
+            resource_name=obj.resource.name,
+            owner_id=obj.owner_id,
+            claims=get_permission_claims(request.auth),
+            object_id=obj.pk
         )
-        if not rule:
-            return False
 
-        if getattr(rule, perm_all, False):
-            return True
 
-        if perm_owned and getattr(rule, perm_owned, False):
-            return obj.owner == request.user
+def record_admin_decision(request, view, allowed, object_id=None):
+    """
+    Записать в журнал аудита решение пермишена вне бизнес-ресурсов.
 
-        return False
+    Ресурс — basename вьюсета (user, access-rule) или имя URL,
+    действие — действие вьюсета или HTTP-метод.
+    """
+    action = getattr(view, 'action', None)
+    if action is None and getattr(view, 'actions', None):
+        action = view.actions.get(request.method.lower())
+    resource_name = getattr(view, 'basename', None)
+    if resource_name is None and request.resolver_match is not None:
+        resource_name = request.resolver_match.url_name
+    audit_log.record_decision(
+        user=request.user,
+        action=action or request.method.lower(),
+        resource_name=resource_name or '',
+        allowed=allowed,
+        object_id=object_id,
+    )
+    return allowed
 
 
 class IsAdminUserPermission(BasePermission):
     """Разрешает доступ только пользователям с ролью Admin."""
 
-    def has_permission(self, request, view):
+    def is_admin(self, request):
         user = request.user
+        if not user.is_authenticated:
+            return False
+        # Роль из актуальных claims токена — без запроса к БД
+        claims = get_permission_claims(request.auth)
+        if claims is not None:
+            return claims[ROLE_CLAIM] == RoleEnum.ADMIN
         # Если нет роли или пользователь не активен — запретить
-        if not user.is_authenticated or not user.role:
+        if not user.role:
             return False
         # Разрешаем только админам
         return user.role.name == RoleEnum.ADMIN
 
+    def has_permission(self, request, view):
+        return record_admin_decision(request, view, self.is_admin(request))
+
 
 class IsSelfOrAdmin(BasePermission):
     """
@@ -123,4 +352,8 @@ class IsSelfOrAdmin(BasePermission):
     """
     def has_object_permission(self, request, view, obj):
         # obj — это пользователь, к которому обращаются
-        return request.user.role.name == RoleEnum.ADMIN or obj == request.user
+        allowed = (
+            obj.pk == request.user.pk
+            or IsAdminUserPermission().is_admin(request)
+        )
+        return record_admin_decision(request, view, allowed, object_id=obj.pk)
@@ -0,0 +1,392 @@
+import cProfile
+import json
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+
+from api.constants import (
+    PROFILING_DIR_NAME,
+    PROFILING_HEADER,
+    PROFILING_MAX_ENTRIES,
+    PROFILING_MAX_QUERIES,
+    PROFILING_RESPONSE_HEADER,
+    PROFILING_SAMPLE_RATE,
+    PROFILING_SIGNING_SALT,
+    PROFILING_SQL_MAX_LENGTH,
+    PROFILING_TOKEN_MAX_AGE,
+    PROFILING_TOP_FUNCTIONS,
+)
+
+# Профиль текущего запроса; None — запрос не профилируется
+current_profile = ContextVar('current_profile', default=None)
+
+# Кадры, которые не считаются местом вызова SQL
+CALL_SITE_SKIPPED = (
+    f'django{os.sep}db{os.sep}',
+    f'asgiref{os.sep}',
+    f'concurrent{os.sep}futures{os.sep}',
+    f'{os.sep}threading.py',
+)
+
+
+def profiling_setting(name, default):
+    return getattr(settings, name, default)
+
+
+def make_profiling_token(max_age=PROFILING_TOKEN_MAX_AGE):
+    """Подписанное значение заголовка X-Profile, действующее max_age секунд."""
+    return signing.dumps(
+        {'until': time.time() + max_age}, salt=PROFILING_SIGNING_SALT
+    )
+
+
+def is_valid_profiling_token(token):
+    try:
+        payload = signing.loads(token, salt=PROFILING_SIGNING_SALT)
+    except signing.BadSignature:
+        return False
+    return isinstance(payload, dict) and payload.get('until', 0) > time.time()
+
+
+def format_frame(frame):
+    filename = frame.f_code.co_filename
+    base_dir = str(settings.BASE_DIR)
+    if filename.startswith(base_dir):
+        filename = str(Path(filename).relative_to(base_dir))
+    else:
+        filename = filename.rpartition('site-packages/')[2]
+    return f'{filename}:{frame.f_lineno} in {frame.f_code.co_name}'
+
+
+def get_call_site():
+    """
+    Откуда выполнен SQL: ближайший кадр кода проекта, а если его нет
+    (например, get_object из DRF) — ближайший кадр вне django.db.
+    В потоках async ORM кадров вызывающего кода нет: там None.
+    """
+    base_dir = str(settings.BASE_DIR)
+    fallback = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename != __file__:
+            if filename.startswith(base_dir) and 'site-packages' not in filename:
+                return format_frame(frame)
+            if fallback is None and not any(
+                part in filename for part in CALL_SITE_SKIPPED
+            ):
+                fallback = frame
+        frame = frame.f_back
+    return format_frame(fallback) if fallback is not None else None
+
+
+class RequestProfile:
+    """
+    Профиль одного запроса: фазы обработки, SQL и профиль Python.
+
+    Время фаз исключающее: вложенная фаза (например, проверка прав
+    на объект внутри выборки) не засчитывается внешней.
+    """
+
+    def __init__(self, request):
+        self.id = f'{datetime.now(UTC):%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}'
+        self.method = request.method
+        self.path = request.get_full_path()
+        self.phases = {}
+        self.queries = []
+        self.dropped_queries = 0
+        self.profiler = None
+        self._stack = []
+        self._mark = None
+        self._started = time.perf_counter()
+        self.total = None
+
+    def _charge(self, now):
+        if self._stack:
+            name = self._stack[-1]
+            self.phases[name] = self.phases.get(name, 0) + now - self._mark
+        self._mark = now
+
+    def enter(self, name):
+        self._charge(time.perf_counter())
+        self._stack.append(name)
+
+    def exit(self):
+        self._charge(time.perf_counter())
+        if self._stack:
+            self._stack.pop()
+
+    def record_query(self, alias, sql, duration):
+        if len(self.queries) >= profiling_setting(
+            'PROFILING_MAX_QUERIES', PROFILING_MAX_QUERIES
+        ):
+            self.dropped_queries += 1
+            return
+        max_length = profiling_setting(
+            'PROFILING_SQL_MAX_LENGTH', PROFILING_SQL_MAX_LENGTH
+        )
+        self.queries.append({
+            'alias': alias,
+            'sql': sql[:max_length],
+            'duration_ms': duration * 1000,
+            'call_site': get_call_site(),
+        })
+
+    def start_python_profile(self):
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Другой профиль уже включён (Python 3.12+: один на процесс)
+            return
+        self.profiler = profiler
+
+    def stop_python_profile(self):
+        if self.profiler is not None:
+            self.profiler.disable()
+
+    def finish(self):
+        self.stop_python_profile()
+        self.total = time.perf_counter() - self._started
+
+    def top_functions(self):
+        if self.profiler is None:
+            return []
+        stats = pstats.Stats(self.profiler).stats
+        rows = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+        limit = profiling_setting('PROFILING_TOP_FUNCTIONS', PROFILING_TOP_FUNCTIONS)
+        return [
+            {
+                'function': f'{filename}:{line}({name})',
+                'calls': calls,
+                'tottime_ms': tottime * 1000,
+                'cumtime_ms': cumtime * 1000,
+            }
+            for (filename, line, name), (_, calls, tottime, cumtime, _) in (
+                rows[:limit]
+            )
+        ]
+
+    def as_dict(self, response, user):
+        phases = {name: value * 1000 for name, value in self.phases.items()}
+        phases['other'] = max(self.total * 1000 - sum(phases.values()), 0)
+        return {
+            'id': self.id,
+            'method': self.method,
+            'path': self.path,
+            'status': response.status_code,
+            'user_id': user.pk if user is not None and user.is_authenticated else None,
+            'total_ms': self.total * 1000,
+            'phases_ms': phases,
+            'query_count': len(self.queries) + self.dropped_queries,
+            'sql_ms': sum(query['duration_ms'] for query in self.queries),
+            'queries': self.queries,
+            'dropped_queries': self.dropped_queries,
+            'python_profile': self.profiler is not None,
+            'top_functions': self.top_functions(),
+        }
+
+
+@contextmanager
+def profile_phase(name):
+    """Засчитать время блока фазе name, если запрос профилируется."""
+    profile = current_profile.get()
+    if profile is None:
+        yield
+        return
+    profile.enter(name)
+    try:
+        yield
+    finally:
+        profile.exit()
+
+
+def record_sql(execute, sql, params, many, context):
+    """
+    Обёртка выполнения SQL (connection.execute_wrapper).
+
+    Ставится на каждое соединение (api.signals) и вне профилируемых
+    запросов сразу передаёт выполнение дальше.
+    """
+    profile = current_profile.get()
+    if profile is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        profile.record_query(
+            context['connection'].alias, sql, time.perf_counter() - started
+        )
+
+
+class ProfileStore:
+    """
+    Ограниченное хранилище профилей на диске.
+
+    Каждый профиль — JSON со сводкой и SQL плюс .prof (pstats) с профилем
+    Python; хранится не больше PROFILING_MAX_ENTRIES последних профилей.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def directory(self):
+        return Path(profiling_setting(
+            'PROFILING_DIR', Path(settings.BASE_DIR) / PROFILING_DIR_NAME
+        ))
+
+    def save(self, profile, data):
+        directory = self.directory
+        directory.mkdir(parents=True, exist_ok=True)
+        if profile.profiler is not None:
+            profile.profiler.dump_stats(directory / f'{profile.id}.prof')
+        (directory / f'{profile.id}.json').write_text(
+            json.dumps(data, ensure_ascii=False, indent=2), encoding='utf-8'
+        )
+        self.prune(directory)
+
+    def prune(self, directory):
+        max_entries = profiling_setting('PROFILING_MAX_ENTRIES', PROFILING_MAX_ENTRIES)
+        with self._lock:
+            # Имена начинаются с времени создания: сортировка по имени
+            entries = sorted(directory.glob('*.json'))
+            for path in entries[:max(len(entries) - max_entries, 0)]:
+                path.unlink(missing_ok=True)
+                path.with_suffix('.prof').unlink(missing_ok=True)
+
+
+profile_store = ProfileStore()
+
+
+class ProfilingMiddleware:
+    """
+    Профилирование отдельных запросов.
+
+    Запрос профилируется, если в заголовке X-Profile передан токен
+    из make_profiling_token (команда profiling_token), или случайно
+    с вероятностью PROFILING_SAMPLE_RATE. Для остальных запросов
+    middleware только читает заголовок. Результат пишется в profile_store,
+    id профиля возвращается в заголовке X-Profile-Id.
+
+    Профиль Python снимается в потоке запроса: под ASGI в него попадают
+    и другие задачи цикла, а код в sync_to_async — нет. SQL и фазы
+    собираются полностью в обоих режимах.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def should_profile(self, request):
+        token = request.META.get(PROFILING_HEADER)
+        if token is not None:
+            return is_valid_profiling_token(token)
+        rate = profiling_setting('PROFILING_SAMPLE_RATE', PROFILING_SAMPLE_RATE)
+        return rate > 0 and random.random() < rate  # noqa: S311
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.should_profile(request):
+            return self.get_response(request)
+
+        profile = RequestProfile(request)
+        token = current_profile.set(profile)
+        profile.start_python_profile()
+        try:
+            response = self.get_response(request)
+        finally:
+            profile.finish()
+            current_profile.reset(token)
+        return self.save(request, profile, response)
+
+    async def __acall__(self, request):
+        if not self.should_profile(request):
+            return await self.get_response(request)
+
+        profile = RequestProfile(request)
+        token = current_profile.set(profile)
+        profile.start_python_profile()
+        try:
+            response = await self.get_response(request)
+        finally:
+            profile.finish()
+            current_profile.reset(token)
+        return self.save(request, profile, response)
+
+    def process_template_response(self, request, response):
+        # Ответы DRF рендерятся после вью: фаза render до конца рендера
+        profile = current_profile.get()
+        if profile is not None:
+            profile.enter('render')
+            response.add_post_render_callback(lambda _: profile.exit())
+        return response
+
+    def save(self, request, profile, response):
+        user = getattr(request, 'user', None)
+        profile_store.save(profile, profile.as_dict(response, user))
+        response[PROFILING_RESPONSE_HEADER] = profile.id
+        return response
+
+
+class ProfilingMixin:
+    """
+    Миксин вьюсета: фазы обработки для профиля запроса.
+
+    authentication, permission, queryset (выборка объекта или страницы)
+    и serialization — остальное время обработчика действия, в основном
+    сериализация ответа и сохранение данных.
+    """
+
+    def perform_authentication(self, request):
+        with profile_phase('authentication'):
+            super().perform_authentication(request)
+
+    def check_permissions(self, request):
+        with profile_phase('permission'):
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with profile_phase('permission'):
+            super().check_object_permissions(request, obj)
+
+    def get_object(self):
+        with profile_phase('queryset'):
+            return super().get_object()
+
+    def paginate_queryset(self, queryset):
+        with profile_phase('queryset'):
+            return super().paginate_queryset(queryset)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        profile = current_profile.get()
+        if profile is not None:
+            profile.enter('serialization')
+            self._profile_handler = profile
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        profile = getattr(self, '_profile_handler', None)
+        if profile is not None:
+            profile.exit()
+            self._profile_handler = None
+        return super().finalize_response(request, response, *args, **kwargs)
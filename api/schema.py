@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+from pathlib import Path
+from threading import RLock
+
+from django.conf import settings
+
+from api.constants import OPENAPI_DESCRIPTION, OPENAPI_TITLE, OPENAPI_VERSION
+
+
+def schema_setting(name, default):
+    return getattr(settings, name, default)
+
+
+def get_schema_info():
+    from drf_yasg import openapi
+
+    return openapi.Info(
+        title=OPENAPI_TITLE,
+        default_version=OPENAPI_VERSION,
+        description=OPENAPI_DESCRIPTION,
+    )
+
+
+def generate_schema():
+    """
+    Собрать схему OpenAPI всех эндпоинтов (JSON).
+
+    Обходит все вьюсеты и сериализаторы, поэтому drf_yasg загружается
+    только здесь. Схема публичная и без адреса сервера: она одна
+    для всех пользователей и хостов. Вьюсеты получают синтетический
+    GET без параметров, как при запросе документации: без запроса
+    они не могут выбрать, например, пагинацию.
+    """
+    from django.test import RequestFactory
+    from drf_yasg.codecs import OpenAPICodecJson
+    from drf_yasg.generators import OpenAPISchemaGenerator
+    from rest_framework.request import Request
+
+    request = Request(RequestFactory().get('/'))
+    # url='': адрес синтетического запроса не попадает в схему
+    schema = OpenAPISchemaGenerator(get_schema_info(), url='').get_schema(
+        request=request, public=True
+    )
+    return OpenAPICodecJson(validators=[]).encode(schema)
+
+
+def json_to_yaml(content):
+    from drf_yasg.codecs import yaml_sane_dump
+
+    return yaml_sane_dump(
+        json.loads(content, object_pairs_hook=OrderedDict), binary=True
+    )
+
+
+def write_schema(path, content):
+    """Записать схему атомарно: читающие процессы не видят половину файла."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+    tmp_path.write_bytes(content)
+    os.replace(tmp_path, path)
+
+
+class SchemaDocument:
+    """Схема в одном формате и её ETag."""
+
+    def __init__(self, content):
+        self.content = content
+        self.etag = hashlib.sha256(content).hexdigest()
+
+
+class SchemaCache:
+    """
+    Схема OpenAPI процесса.
+
+    Схема собирается один раз — при первом запросе документации —
+    или читается из OPENAPI_SCHEMA_FILE, заранее собранного командой
+    generate_openapi_schema, и дальше отдаётся из памяти. YAML строится
+    из JSON при первом запросе. С OPENAPI_SCHEMA_CACHE = False схема
+    собирается заново на каждый запрос (при разработке).
+    """
+
+    def __init__(self):
+        self._lock = RLock()
+        self._documents = {}
+
+    def get(self, kind):
+        """Документ 'json' или 'yaml'."""
+        if not schema_setting('OPENAPI_SCHEMA_CACHE', True):
+            content = generate_schema()
+            return SchemaDocument(
+                json_to_yaml(content) if kind == 'yaml' else content
+            )
+        document = self._documents.get(kind)
+        if document is not None:
+            return document
+        with self._lock:
+            document = self._documents.get(kind)
+            if document is None:
+                if kind == 'yaml':
+                    content = json_to_yaml(self.get('json').content)
+                else:
+                    content = self.load()
+                document = self._documents[kind] = SchemaDocument(content)
+        return document
+
+    def load(self):
+        path = schema_setting('OPENAPI_SCHEMA_FILE', '')
+        if path and Path(path).is_file():
+            return Path(path).read_bytes()
+        return generate_schema()
+
+    def clear(self):
+        with self._lock:
+            self._documents = {}
+
+
+schema_cache = SchemaCache()
@@ -0,0 +1,100 @@
+from rest_framework import serializers
+
+# Query-параметры выборочных полей и раскрытия связей
+FIELDS_QUERY_PARAM = 'fields'
+EXPAND_QUERY_PARAM = 'expand'
+
+
+def parse_field_options(request):
+    """
+    Разобрать ?fields= и ?expand= запроса.
+
+    Возвращает пару множеств (fields, expand); None — параметр не передан.
+    """
+    if request is None:
+        return None, None
+
+    def parse(param):
+        value = request.query_params.get(param)
+        if value is None:
+            return None
+        return {name.strip() for name in value.split(',') if name.strip()}
+
+    return parse(FIELDS_QUERY_PARAM), parse(EXPAND_QUERY_PARAM)
+
+
+class DynamicFieldsMixin:
+    """
+    Миксин сериализатора чтения с выборочными полями и раскрытием связей.
+
+    - ?fields=id,name — в ответе только перечисленные поля;
+    - ?expand=owner — связи из collapsed_fields, не перечисленные
+      в expand, отдаются id или slug вместо вложенного объекта.
+      Без ?expand все связи вложены, как раньше.
+
+    Параметры читает только корневой сериализатор: вложенные
+    сериализаторы всегда отдаются целиком.
+    """
+
+    # Имя связи -> (класс плоского поля, kwargs)
+    collapsed_fields = {}
+    # Имя связи -> (столбцы для раскрытой связи, столбцы для свёрнутой)
+    related_columns = {}
+
+    def _is_root(self):
+        parent = self.parent
+        if parent is None:
+            return True
+        return isinstance(parent, serializers.ListSerializer) and parent.parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if not self._is_root():
+            return fields
+
+        requested, expand = parse_field_options(self.context.get('request'))
+        if expand is not None:
+            for name, (field_class, kwargs) in self.collapsed_fields.items():
+                if name in fields and name not in expand:
+                    fields[name] = field_class(**kwargs)
+        if requested is not None:
+            fields = {
+                name: field for name, field in fields.items() if name in requested
+            }
+        return fields
+
+    @classmethod
+    def get_selected_fields(cls, request):
+        """Поля ответа и раскрываемые связи с учётом параметров запроса."""
+        requested, expand = parse_field_options(request)
+        fields = set(cls.Meta.fields)
+        if requested is not None:
+            fields &= requested
+        expanded = set(cls.collapsed_fields)
+        if expand is not None:
+            expanded &= expand
+        return fields, expanded
+
+    @classmethod
+    def optimize_queryset(cls, queryset, request, extra_columns=()):
+        """
+        Загрузить только столбцы и связи, нужные ответу.
+
+        extra_columns — столбцы, нужные помимо ответа (например,
+        для проверки прав на объект).
+        """
+        fields, expanded = cls.get_selected_fields(request)
+        columns = set(extra_columns)
+        for name in fields:
+            if name not in cls.related_columns:
+                columns.add(name)
+                continue
+            expanded_columns, collapsed_columns = cls.related_columns[name]
+            columns.update(
+                expanded_columns if name in expanded else collapsed_columns
+            )
+
+        related = {
+            column.rsplit('__', 1)[0] for column in columns if '__' in column
+        }
+        return queryset.select_related(*related).only(*columns)
@@ -0,0 +1,19 @@
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+from api.metrics import count_sql
+from api.profiling import record_sql
+
+
+@receiver(connection_created)
+def install_sql_recorder(sender, connection, **kwargs):  # noqa: ARG001
+    """Ставит запись SQL для профилирования на новое соединение с БД."""
+    if record_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_sql)
+
+
+@receiver(connection_created)
+def install_query_counter(sender, connection, **kwargs):  # noqa: ARG001
+    """Ставит подсчёт SQL-запросов для метрик на новое соединение с БД."""
+    if count_sql not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_sql)
@@ -0,0 +1,12 @@
+from django.conf import settings
+
+FIXTURES = [
+    settings.BASE_DIR / 'fixtures' / f'{name}.json'
+    for name in (
+        'roles',
+        'users',
+        'business_resources',
+        'business_objects',
+        'access_rules',
+    )
+]
@@ -0,0 +1,72 @@
+from unittest import mock
+
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.tests import FIXTURES
+from audit.log import audit_log
+from users.models import User
+from users.tokens import RefreshToken
+
+
+class AdminDecisionAuditTests(TestCase):
+    """Решения пермишенов администраторских разделов попадают в журнал."""
+
+    fixtures = FIXTURES
+
+    def client_for(self, email):
+        client = APIClient()
+        token = RefreshToken.for_user(User.objects.get(email=email)).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client
+
+    def assert_decision(self, response, status_code, **decision):
+        self.assertEqual(response.status_code, status_code)
+        self.record_decision.assert_called_once_with(**decision)
+
+    def setUp(self):
+        patcher = mock.patch.object(audit_log, 'record_decision')
+        self.record_decision = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_update_role_denied(self):
+        user = User.objects.get(email='user@example.com')
+        response = self.client_for('user@example.com').patch(
+            f'/api/users/{user.pk}/update-role/', {'role': 1}, format='json'
+        )
+        self.assert_decision(
+            response,
+            403,
+            user=user,
+            action='update_role',
+            resource_name='user',
+            allowed=False,
+            object_id=None,
+        )
+
+    def test_access_rules_denied(self):
+        response = self.client_for('manager@example.com').get('/api/access-rules/')
+        self.assert_decision(
+            response,
+            403,
+            user=User.objects.get(email='manager@example.com'),
+            action='list',
+            resource_name='access-rule',
+            allowed=False,
+            object_id=None,
+        )
+
+    def test_admin_updates_other_user(self):
+        user = User.objects.get(email='user@example.com')
+        response = self.client_for('admin@example.com').patch(
+            f'/api/users/{user.pk}/', {'first_name': 'New'}, format='json'
+        )
+        self.assert_decision(
+            response,
+            200,
+            user=User.objects.get(email='admin@example.com'),
+            action='partial_update',
+            resource_name='user',
+            allowed=True,
+            object_id=user.pk,
+        )
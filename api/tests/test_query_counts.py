@@ -0,0 +1,96 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from api.tests import FIXTURES
+from users.models import User
+from users.tokens import RefreshToken
+
+
+class QueryCountTests(TestCase):
+    """
+    Число SQL-запросов на чтение не зависит от размера страницы:
+    список — COUNT и страница, объект — один запрос. Число запросов
+    на запись (create, partial_update, destroy) тоже фиксировано.
+
+    Первый запрос прогревает кэши процесса (пользователь, матрица прав),
+    считаются запросы следующих.
+    """
+
+    fixtures = FIXTURES
+
+    def setUp(self):
+        self.client = APIClient()
+        admin = User.objects.get(email='admin@example.com')
+        token = RefreshToken.for_user(admin).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+
+    def assert_get_queries(self, url, num):
+        self.assertEqual(self.client.get(url).status_code, 200)
+        with self.assertNumQueries(num):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def assert_write_queries(self, method, url, num, status_code, data=None):
+        with self.assertNumQueries(num):
+            response = getattr(self.client, method)(url, data, format='json')
+        self.assertEqual(response.status_code, status_code)
+        return response
+
+    def test_business_objects(self):
+        response = self.assert_get_queries(
+            '/api/business-objects/?resource=products', 2
+        )
+        self.assertGreater(len(response.data['results']), 1)
+        object_id = response.data['results'][0]['id']
+        self.assert_get_queries(f'/api/business-objects/{object_id}/', 1)
+
+        response = self.assert_write_queries(
+            'post',
+            '/api/business-objects/',
+            3,
+            201,
+            {'name': 'new', 'description': '', 'resource': 'products'},
+        )
+        url = f'/api/business-objects/{response.data["id"]}/'
+        self.assert_write_queries('patch', url, 2, 200, {'description': 'x'})
+        self.assert_write_queries('delete', url, 2, 204)
+
+    def test_users(self):
+        response = self.assert_get_queries('/api/users/', 2)
+        self.assertGreater(len(response.data['results']), 1)
+        self.assert_get_queries(
+            f'/api/users/{response.data["results"][0]["id"]}/', 1
+        )
+
+        self.assert_write_queries(
+            'post',
+            '/api/users/',
+            5,
+            201,
+            {
+                'email': 'new@example.com',
+                'username': 'new',
+                'first_name': 'New',
+                'last_name': 'User',
+                'password': 'Password_123',
+                'password_confirm': 'Password_123',
+            },
+        )
+        url = f'/api/users/{User.objects.get(email="new@example.com").pk}/'
+        self.assert_write_queries('patch', url, 2, 200, {'first_name': 'Old'})
+        # Деактивация, отзыв токенов и новая эпоха прав
+        self.assert_write_queries('delete', url, 11, 204)
+
+    def test_access_rules(self):
+        response = self.assert_get_queries('/api/access-rules/', 2)
+        self.assertGreater(len(response.data['results']), 1)
+        url = f'/api/access-rules/{response.data["results"][0]["id"]}/'
+        self.assert_get_queries(url, 1)
+
+        self.assert_write_queries(
+            'patch', url, 8, 200, {'read_all_permission': True}
+        )
+        # Правила доступа не создаются и не удаляются через API
+        self.assert_write_queries('post', '/api/access-rules/', 0, 405, {})
+        self.assert_write_queries('delete', url, 0, 405)
@@ -0,0 +1,43 @@
+import json
+
+from django.test import SimpleTestCase, override_settings
+from drf_yasg.views import get_schema_view
+from rest_framework.permissions import AllowAny
+from rest_framework.test import APIRequestFactory
+
+from api.schema import get_schema_info, schema_cache
+
+
+@override_settings(OPENAPI_SCHEMA_FILE='')
+class SchemaCacheTests(SimpleTestCase):
+    """Схема из schema_cache совпадает со схемой, собранной по запросу."""
+
+    def setUp(self):
+        schema_cache.clear()
+        self.addCleanup(schema_cache.clear)
+
+    def request_schema(self):
+        # Как прежний эндпоинт документации
+        view = get_schema_view(
+            get_schema_info(), public=True, permission_classes=(AllowAny,)
+        )
+        response = view.without_ui()(
+            APIRequestFactory().get('/swagger/', {'format': 'openapi'})
+        )
+        schema = json.loads(response.render().content)
+        # Адрес сервера из запроса в кэшированную схему не входит
+        schema.pop('host')
+        schema.pop('schemes')
+        return schema
+
+    def test_cached_schema_matches_request_schema(self):
+        cached = json.loads(schema_cache.get('json').content)
+
+        self.assertEqual(cached, self.request_schema())
+        parameters = {
+            parameter['name']
+            for parameter in cached['paths']['/business-objects/']['get'][
+                'parameters'
+            ]
+        }
+        self.assertIn('page', parameters)
@@ -1,4 +1,5 @@
-from django.urls import include, path
+from django.conf import settings
+from django.urls import include, path, re_path
 from rest_framework.routers import DefaultRouter
 
 from api.endpoints import (
@@ -6,7 +7,10 @@ from api.endpoints import (
                            MyTokenObtainPairView,
                            MyTokenRefreshView,
                            UserViewSet,
+                           db_pool_stats_view,
+                           logout_all_view,
                            logout_view,
+                           metrics_view,
 )
 from api.endpoints.access import AccessRuleViewSet
 
@@ -20,4 +24,29 @@ urlpatterns = [
     path('auth/login/', MyTokenObtainPairView.as_view(), name='token_obtain_pair'),
     path('auth/refresh/', MyTokenRefreshView.as_view(), name='token_refresh'),
     path('auth/logout/', logout_view, name='logout'),
+    path('auth/logout-all/', logout_all_view, name='logout_all'),
+    path('stats/db-pool/', db_pool_stats_view, name='db_pool_stats'),
+    path('metrics/', metrics_view, name='metrics'),
 ]
+
+if getattr(settings, 'ASYNC_READ_ENDPOINTS', False):
+    from api.endpoints.async_reads import (
+        AccessRuleListView,
+        BusinessObjectDetailView,
+        BusinessObjectListView,
+        UserDetailView,
+    )
+
+    # Те же адреса, что у роутера: GET обслуживается асинхронно,
+    # остальные методы передаются синхронным вьюсетам. Детальные адреса
+    # только с числовым id, чтобы не перехватывать export/, bulk/ и т.п.
+    urlpatterns = [
+        path('business-objects/', BusinessObjectListView.as_view()),
+        re_path(
+            r'^business-objects/(?P<pk>[0-9]+)/$',
+            BusinessObjectDetailView.as_view()
+        ),
+        re_path(r'^users/(?P<pk>[0-9]+)/$', UserDetailView.as_view()),
+        path('access-rules/', AccessRuleListView.as_view()),
+        *urlpatterns,
+    ]
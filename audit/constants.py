@@ -0,0 +1,16 @@
+KIND_MAX_LENGTH = 32
+ACTION_MAX_LENGTH = 32
+RESOURCE_MAX_LENGTH = 128
+
+# Очередь событий процесса (audit.log): сколько событий ждут записи,
+# сколько секунд запрос ждёт места в полной очереди (0 — сразу
+# отбросить событие), размер пачки и как долго она набирается
+AUDIT_QUEUE_SIZE = 10_000
+AUDIT_QUEUE_TIMEOUT = 0.0
+AUDIT_BATCH_SIZE = 1000
+AUDIT_FLUSH_INTERVAL = 1.0
+# Пауза записи после ошибки БД (в секундах)
+AUDIT_RETRY_DELAY = 1.0
+
+# Сколько месячных секций таблицы событий создавать вперёд (PostgreSQL)
+AUDIT_PARTITIONS_AHEAD = 1
@@ -0,0 +1,283 @@
+import atexit
+import logging
+import os
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import UTC, datetime
+from threading import Condition, Event, Lock, Thread
+
+from django.conf import settings
+from django.db import connections, router
+
+from audit.constants import (
+    ACTION_MAX_LENGTH,
+    AUDIT_BATCH_SIZE,
+    AUDIT_FLUSH_INTERVAL,
+    AUDIT_PARTITIONS_AHEAD,
+    AUDIT_QUEUE_SIZE,
+    AUDIT_QUEUE_TIMEOUT,
+    AUDIT_RETRY_DELAY,
+    RESOURCE_MAX_LENGTH,
+)
+from audit.models import AuditEvent, AuditEventKind
+from audit.partitions import ensure_partitions, month_start, next_month
+
+logger = logging.getLogger(__name__)
+
+# Сколько секунд процесс при завершении ждёт записи оставшихся событий
+DRAIN_TIMEOUT = 5.0
+
+# Кто выполняет текущий запрос: автор изменений в журнале (AuditActorMixin)
+current_actor = ContextVar('audit_actor', default=None)
+
+# Поля события в порядке кортежа очереди (после времени создания)
+EVENT_FIELDS = (
+    'kind',
+    'actor_id',
+    'action',
+    'resource',
+    'object_id',
+    'allowed',
+    'changes',
+)
+
+
+def audit_setting(name, default):
+    return getattr(settings, name, default)
+
+
+class AuditLog:
+    """
+    Журнал аудита с записью в фоне.
+
+    Поток запроса только добавляет кортеж в очередь процесса (deque:
+    без блокировок и без пробуждения других потоков), а поток записи
+    раз в AUDIT_FLUSH_INTERVAL секунд или как только набралась пачка
+    AUDIT_BATCH_SIZE забирает события и пишет их одним COPY (PostgreSQL)
+    или bulk_create. В очереди не больше AUDIT_QUEUE_SIZE событий:
+    сверх этого запрос ждёт места не дольше AUDIT_QUEUE_TIMEOUT секунд,
+    затем событие отбрасывается и учитывается в dropped. События пачек,
+    которые не удалось записать, учитываются в failed.
+
+    Настройки читаются при запуске потока записи, в каждом процессе
+    один раз.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._events = deque()
+        self._wakeup = Event()
+        self._space = Condition()
+        self._stopping = False
+        self._writer = None
+        self._writer_pid = None
+        self._exit_drain = False
+        self._partitions = set()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+
+    def record(
+        self, kind, *, actor_id=None, action='', resource='', object_id=None,
+        allowed=None, changes=None
+    ):
+        self._ensure_writer()
+        if not self._enabled:
+            return
+        events = self._events
+        if len(events) >= self._max_size and not self._wait_for_space():
+            with self._lock:
+                self.dropped += 1
+            return
+        events.append((
+            time.time(), kind, actor_id, action, resource, object_id, allowed,
+            changes,
+        ))
+        if len(events) == self._batch_size:
+            # Пачка набралась раньше интервала
+            self._wakeup.set()
+
+    def record_decision(
+        self, *, user, action, resource_name, allowed, object_id=None
+    ):
+        self.record(
+            AuditEventKind.AUTHORIZATION,
+            actor_id=user.pk,
+            action=action or '',
+            resource=resource_name or '',
+            object_id=object_id,
+            allowed=allowed,
+        )
+
+    def stats(self):
+        """Счётчики процесса для метрик."""
+        return {
+            'queued': len(self._events),
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+        }
+
+    def _wait_for_space(self):
+        if self._timeout <= 0:
+            return False
+        self._wakeup.set()
+        with self._space:
+            return self._space.wait_for(
+                lambda: len(self._events) < self._max_size, self._timeout
+            )
+
+    def _ensure_writer(self):
+        # После fork поток записи родителя в дочернем процессе не живёт,
+        # а события его очереди родитель запишет сам
+        pid = os.getpid()
+        if self._writer_pid == pid:
+            return
+        with self._lock:
+            if self._writer_pid == pid:
+                return
+            self._enabled = audit_setting('AUDIT_LOG_ENABLED', True)
+            self._max_size = audit_setting('AUDIT_QUEUE_SIZE', AUDIT_QUEUE_SIZE)
+            self._timeout = audit_setting('AUDIT_QUEUE_TIMEOUT', AUDIT_QUEUE_TIMEOUT)
+            self._batch_size = audit_setting('AUDIT_BATCH_SIZE', AUDIT_BATCH_SIZE)
+            self._interval = audit_setting(
+                'AUDIT_FLUSH_INTERVAL', AUDIT_FLUSH_INTERVAL
+            )
+            self._events = deque()
+            self._wakeup = Event()
+            self._space = Condition()
+            self._stopping = False
+            self._partitions = set()
+            self.written = self.dropped = self.failed = 0
+            self._writer = None
+            self._writer_pid = pid
+            if not self._enabled:
+                return
+            if not self._exit_drain:
+                # Оставшиеся события — при штатном завершении процесса
+                atexit.register(self.drain)
+                self._exit_drain = True
+            self._writer = Thread(
+                target=self._write_forever, name='audit-writer', daemon=True
+            )
+            self._writer.start()
+
+    def _take_batch(self):
+        # Забирает из очереди только поток записи
+        popleft = self._events.popleft
+        return [
+            popleft() for _ in range(min(len(self._events), self._batch_size))
+        ]
+
+    def _write_forever(self):
+        while True:
+            if len(self._events) < self._batch_size and not self._stopping:
+                self._wakeup.wait(self._interval)
+                self._wakeup.clear()
+            stopping = self._stopping
+            batch = self._take_batch()
+            if batch:
+                written = self.write(batch)
+                with self._space:
+                    self._space.notify_all()
+                if not written and not stopping:
+                    time.sleep(audit_setting('AUDIT_RETRY_DELAY', AUDIT_RETRY_DELAY))
+            if stopping and not self._events:
+                return
+
+    def drain(self):
+        """
+        Дождаться записи оставшихся событий процесса.
+
+        Вызывается при завершении процесса; после него события
+        не записываются.
+        """
+        if self._writer is None or self._writer_pid != os.getpid():
+            return
+        self._stopping = True
+        self._wakeup.set()
+        self._writer.join(DRAIN_TIMEOUT)
+
+    def write(self, batch):
+        """Записать пачку событий. Возвращает, удалось ли."""
+        objects = [
+            AuditEvent(
+                created_at=datetime.fromtimestamp(created, UTC),
+                **dict(zip(EVENT_FIELDS, fields, strict=True)),
+            )
+            for created, *fields in batch
+        ]
+        for obj in objects:
+            obj.action = obj.action[:ACTION_MAX_LENGTH]
+            obj.resource = obj.resource[:RESOURCE_MAX_LENGTH]
+
+        connection = connections[router.db_for_write(AuditEvent)]
+        try:
+            # Соединение закрыто после прошлой пачки, а bulk_create на SQLite
+            # берёт лимиты из открытого соединения
+            connection.ensure_connection()
+            if connection.vendor == 'postgresql':
+                self.ensure_partitions(connection, objects)
+                self.copy(connection, objects)
+            else:
+                AuditEvent.objects.using(connection.alias).bulk_create(objects)
+        except Exception:
+            logger.exception('Не удалось записать пачку событий аудита')
+            with self._lock:
+                self.failed += len(objects)
+            return False
+        finally:
+            # Соединение потока записи не держим между пачками
+            connection.close()
+        with self._lock:
+            self.written += len(objects)
+        return True
+
+    def ensure_partitions(self, connection, objects):
+        months = {month_start(obj.created_at) for obj in objects}
+        for start in list(months):
+            # Секции вперёд, чтобы смена месяца не ждала DDL
+            for _ in range(
+                audit_setting('AUDIT_PARTITIONS_AHEAD', AUDIT_PARTITIONS_AHEAD)
+            ):
+                start = next_month(start)
+                months.add(start)
+        missing = months - self._partitions
+        if missing:
+            ensure_partitions(connection, missing)
+            self._partitions |= missing
+
+    def copy(self, connection, objects):
+        """Вставить пачку через COPY ... FROM STDIN, как import_data."""
+        fields = [
+            field for field in AuditEvent._meta.concrete_fields
+            if not field.primary_key
+        ]
+        quote = connection.ops.quote_name
+        columns = ', '.join(quote(field.column) for field in fields)
+        sql = f'COPY {quote(AuditEvent._meta.db_table)} ({columns}) FROM STDIN'
+        with connection.cursor() as cursor, cursor.copy(sql) as copy:
+            for obj in objects:
+                copy.write_row([
+                    field.get_db_prep_save(getattr(obj, field.attname), connection)
+                    for field in fields
+                ])
+
+
+audit_log = AuditLog()
+
+
+class AuditActorMixin:
+    """Миксин вьюсета: изменения в журнале аудита записываются от его имени."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._audit_actor = current_actor.set(request.user.pk)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_audit_actor', None)
+        if token is not None:
+            current_actor.reset(token)
+            self._audit_actor = None
+        return super().finalize_response(request, response, *args, **kwargs)
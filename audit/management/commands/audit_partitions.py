@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, router
+from django.utils import timezone
+
+from audit.constants import AUDIT_PARTITIONS_AHEAD
+from audit.models import AuditEvent
+from audit.partitions import (
+    drop_partitions_before,
+    ensure_partitions,
+    list_partitions,
+    month_start,
+    next_month,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        'Месячные секции журнала аудита (PostgreSQL): создание секций '
+        'вперёд и удаление старых месяцев целиком.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--ahead',
+            type=int,
+            default=AUDIT_PARTITIONS_AHEAD,
+            help='Сколько секций после текущего месяца создать.'
+        )
+        parser.add_argument(
+            '--keep-months',
+            type=int,
+            default=None,
+            help=(
+                'Удалить секции старше стольких месяцев, считая текущий. '
+                'Без параметра ничего не удаляется.'
+            )
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[router.db_for_write(AuditEvent)]
+        if connection.vendor != 'postgresql':
+            raise CommandError('Журнал аудита секционируется только на PostgreSQL.')
+        keep_months = options['keep_months']
+        if keep_months is not None and keep_months < 1:
+            raise CommandError('--keep-months должен быть не меньше 1.')
+
+        current = month_start(timezone.now())
+        months = [current]
+        for _ in range(options['ahead']):
+            months.append(next_month(months[-1]))
+        ensure_partitions(connection, months)
+
+        if keep_months is not None:
+            oldest = current
+            for _ in range(keep_months - 1):
+                # Начало предыдущего месяца
+                oldest = month_start(oldest - timedelta(days=1))
+            for name in drop_partitions_before(connection, oldest):
+                self.stdout.write(f'Удалена секция {name}')
+
+        for _, name in sorted(list_partitions(connection).items()):
+            self.stdout.write(name)
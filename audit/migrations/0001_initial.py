@@ -0,0 +1,92 @@
+# Generated by Django 6.0 on 2026-10-18 23:05
+
+from django.db import migrations, models
+
+# На PostgreSQL таблица секционирована по месяцам created_at: первичный
+# ключ включает ключ секционирования, а сами секции создаются
+# при записи (audit.partitions). UPDATE и DELETE запрещает триггер,
+# старые месяцы удаляются целиком через DROP секции.
+POSTGRES_CREATE_SQL = (
+    """
+    CREATE TABLE audit_event (
+        id bigint GENERATED BY DEFAULT AS IDENTITY,
+        created_at timestamp with time zone NOT NULL,
+        kind varchar(32) NOT NULL,
+        actor_id bigint NULL,
+        action varchar(32) NOT NULL,
+        resource varchar(128) NOT NULL,
+        object_id bigint NULL,
+        allowed boolean NULL,
+        changes jsonb NULL,
+        PRIMARY KEY (id, created_at)
+    ) PARTITION BY RANGE (created_at)
+    """,
+    'CREATE INDEX audit_created_at_idx ON audit_event (created_at)',
+    'CREATE INDEX audit_actor_created_at_idx '
+    'ON audit_event (actor_id, created_at)',
+    """
+    CREATE FUNCTION audit_event_append_only() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        RAISE EXCEPTION 'audit_event is append-only';
+    END
+    $$
+    """,
+    'CREATE TRIGGER audit_event_append_only '
+    'BEFORE UPDATE OR DELETE ON audit_event '
+    'FOR EACH ROW EXECUTE FUNCTION audit_event_append_only()',
+)
+POSTGRES_DROP_SQL = (
+    'DROP TABLE audit_event CASCADE',
+    'DROP FUNCTION audit_event_append_only()',
+)
+
+
+def create_audit_table(apps, schema_editor):
+    AuditEvent = apps.get_model('audit', 'AuditEvent')
+    if schema_editor.connection.vendor != 'postgresql':
+        schema_editor.create_model(AuditEvent)
+        return
+    for sql in POSTGRES_CREATE_SQL:
+        schema_editor.execute(sql)
+
+
+def drop_audit_table(apps, schema_editor):
+    AuditEvent = apps.get_model('audit', 'AuditEvent')
+    if schema_editor.connection.vendor != 'postgresql':
+        schema_editor.delete_model(AuditEvent)
+        return
+    for sql in POSTGRES_DROP_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(state_operations=[
+            migrations.CreateModel(
+                name='AuditEvent',
+                fields=[
+                    ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                    ('created_at', models.DateTimeField()),
+                    ('kind', models.CharField(choices=[('authorization', 'Решение о доступе'), ('access_rule', 'Изменение правила доступа'), ('user_role', 'Смена роли пользователя')], max_length=32)),
+                    ('actor_id', models.BigIntegerField(null=True)),
+                    ('action', models.CharField(max_length=32)),
+                    ('resource', models.CharField(blank=True, max_length=128)),
+                    ('object_id', models.BigIntegerField(null=True)),
+                    ('allowed', models.BooleanField(null=True)),
+                    ('changes', models.JSONField(null=True)),
+                ],
+                options={
+                    'db_table': 'audit_event',
+                    'indexes': [models.Index(fields=['created_at'], name='audit_created_at_idx'), models.Index(fields=['actor_id', 'created_at'], name='audit_actor_created_at_idx')],
+                },
+            ),
+        ]),
+        migrations.RunPython(create_audit_table, drop_audit_table),
+    ]
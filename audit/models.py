@@ -0,0 +1,51 @@
+from django.db import models
+
+from audit.constants import (
+    ACTION_MAX_LENGTH,
+    KIND_MAX_LENGTH,
+    RESOURCE_MAX_LENGTH,
+)
+
+
+class AuditEventKind(models.TextChoices):
+    """Виды событий журнала аудита."""
+    AUTHORIZATION = 'authorization', 'Решение о доступе'
+    ACCESS_RULE = 'access_rule', 'Изменение правила доступа'
+    USER_ROLE = 'user_role', 'Смена роли пользователя'
+
+
+class AuditEvent(models.Model):
+    """
+    Событие журнала аудита.
+
+    Таблица только для добавления: на PostgreSQL она секционирована
+    по месяцам created_at, а UPDATE и DELETE запрещены триггером;
+    старые месяцы удаляются целиком (команда audit_partitions).
+    Пользователи и объекты хранятся как id без внешних ключей,
+    чтобы запись переживала их удаление.
+    """
+
+    created_at = models.DateTimeField()
+    kind = models.CharField(
+        max_length=KIND_MAX_LENGTH,
+        choices=AuditEventKind.choices,
+    )
+    actor_id = models.BigIntegerField(null=True)
+    action = models.CharField(max_length=ACTION_MAX_LENGTH)
+    resource = models.CharField(max_length=RESOURCE_MAX_LENGTH, blank=True)
+    object_id = models.BigIntegerField(null=True)
+    allowed = models.BooleanField(null=True)
+    changes = models.JSONField(null=True)
+
+    class Meta:
+        db_table = 'audit_event'
+        indexes = [
+            models.Index(fields=['created_at'], name='audit_created_at_idx'),
+            models.Index(
+                fields=['actor_id', 'created_at'],
+                name='audit_actor_created_at_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.created_at:%Y-%m-%d %H:%M:%S} {self.kind} {self.action}'
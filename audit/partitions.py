@@ -0,0 +1,70 @@
+from datetime import UTC, datetime
+
+from audit.models import AuditEvent
+
+
+def month_start(moment):
+    """Начало месяца moment в UTC: граница секции таблицы событий."""
+    moment = moment.astimezone(UTC)
+    return datetime(moment.year, moment.month, 1, tzinfo=UTC)
+
+
+def next_month(start):
+    if start.month == 12:
+        return start.replace(year=start.year + 1, month=1)
+    return start.replace(month=start.month + 1)
+
+
+def partition_name(start):
+    return f'{AuditEvent._meta.db_table}_p{start:%Y%m}'
+
+
+def ensure_partitions(connection, months):
+    """
+    Создать месячные секции, начинающиеся в months, если их ещё нет.
+
+    Секции создают и процессы, пишущие журнал, и команда
+    audit_partitions: одновременное создание одной секции безопасно.
+    """
+    quote = connection.ops.quote_name
+    table = quote(AuditEvent._meta.db_table)
+    with connection.cursor() as cursor:
+        for start in sorted(months):
+            # Границы — даты из datetime, а не пользовательские данные
+            cursor.execute(
+                f'CREATE TABLE IF NOT EXISTS {quote(partition_name(start))} '
+                f'PARTITION OF {table} FOR VALUES '
+                f"FROM ('{start.isoformat()}') "
+                f"TO ('{next_month(start).isoformat()}')"
+            )
+
+
+def list_partitions(connection):
+    """Секции таблицы событий: {начало месяца: имя}."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class parent ON parent.oid = pg_inherits.inhparent '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE parent.relname = %s',
+            [AuditEvent._meta.db_table]
+        )
+        names = [name for (name,) in cursor.fetchall()]
+    prefix = f'{AuditEvent._meta.db_table}_p'
+    return {
+        datetime.strptime(name.removeprefix(prefix), '%Y%m').replace(tzinfo=UTC): name
+        for name in names
+        if name.startswith(prefix)
+    }
+
+
+def drop_partitions_before(connection, start):
+    """Удалить секции месяцев раньше start. Возвращает имена удалённых."""
+    dropped = []
+    with connection.cursor() as cursor:
+        for month, name in sorted(list_partitions(connection).items()):
+            if month >= start:
+                break
+            cursor.execute(f'DROP TABLE {connection.ops.quote_name(name)}')
+            dropped.append(name)
+    return dropped
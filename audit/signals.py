@@ -0,0 +1,95 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from access.constants import PERMISSION_FIELDS
+from access.models import AccessRule
+from audit.log import audit_log, current_actor
+from audit.models import AuditEventKind
+from users.models import User
+
+# Поля AccessRule, изменения которых попадают в журнал
+ACCESS_RULE_FIELDS = ('role_id', 'business_resource_id', *PERMISSION_FIELDS)
+
+
+def loaded_values(instance, fields):
+    # Отложенные поля (only/defer) не читаем: это был бы запрос к БД
+    return {
+        field: instance.__dict__[field]
+        for field in fields
+        if field in instance.__dict__
+    }
+
+
+def resource_name(rule):
+    # Имя ресурса — только если он уже загружен вместе с правилом
+    if AccessRule.business_resource.is_cached(rule):
+        return rule.business_resource.name
+    return ''
+
+
+@receiver(post_init, sender=AccessRule)
+def remember_access_rule(sender, instance, **kwargs):  # noqa: ARG001
+    instance._audit_values = loaded_values(instance, ACCESS_RULE_FIELDS)
+
+
+@receiver(post_save, sender=AccessRule)
+def audit_access_rule_save(sender, instance, created, **kwargs):  # noqa: ARG001
+    """Записывает в журнал созданное правило или изменённые флаги."""
+    old = {} if created else instance._audit_values
+    new = loaded_values(instance, ACCESS_RULE_FIELDS)
+    changes = {
+        field: [old.get(field), value]
+        for field, value in new.items()
+        if field not in old or old[field] != value
+    }
+    instance._audit_values = new
+    if not changes:
+        return
+    audit_log.record(
+        AuditEventKind.ACCESS_RULE,
+        actor_id=current_actor.get(),
+        action='create' if created else 'update',
+        resource=resource_name(instance),
+        object_id=instance.pk,
+        changes=changes,
+    )
+
+
+@receiver(post_delete, sender=AccessRule)
+def audit_access_rule_delete(sender, instance, **kwargs):  # noqa: ARG001
+    audit_log.record(
+        AuditEventKind.ACCESS_RULE,
+        actor_id=current_actor.get(),
+        action='delete',
+        resource=resource_name(instance),
+        object_id=instance.pk,
+        changes={
+            field: [value, None]
+            for field, value in instance._audit_values.items()
+        },
+    )
+
+
+@receiver(post_init, sender=User)
+def remember_user_role(sender, instance, **kwargs):  # noqa: ARG001
+    instance._audit_role_id = instance.__dict__.get('role_id')
+
+
+@receiver(post_save, sender=User)
+def audit_user_role(sender, instance, created, update_fields, **kwargs):  # noqa: ARG001
+    """Записывает в журнал смену роли пользователя (и роль нового)."""
+    if update_fields is not None and not {'role', 'role_id'} & update_fields:
+        # Например, last_login при входе: роль не менялась
+        return
+    old = None if created else instance._audit_role_id
+    new = instance.__dict__.get('role_id')
+    instance._audit_role_id = new
+    if old == new:
+        return
+    audit_log.record(
+        AuditEventKind.USER_ROLE,
+        actor_id=current_actor.get(),
+        action='create' if created else 'update',
+        object_id=instance.pk,
+        changes={'role_id': [old, new]},
+    )
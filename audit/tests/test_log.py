@@ -0,0 +1,34 @@
+from django.test import TransactionTestCase, override_settings
+
+from audit.log import AuditLog
+from audit.models import AuditEvent, AuditEventKind
+
+
+@override_settings(AUDIT_LOG_ENABLED=True, AUDIT_BATCH_SIZE=10)
+class AuditLogTests(TransactionTestCase):
+    """
+    Поток записи сохраняет события пачками в своём соединении.
+
+    TransactionTestCase: поток записи не видит транзакцию теста.
+    """
+
+    def test_batches_are_written(self):
+        log = AuditLog()
+        for number in range(25):
+            log.record(
+                AuditEventKind.AUTHORIZATION,
+                actor_id=number,
+                action='retrieve',
+                resource='products',
+                allowed=number % 2 == 0,
+            )
+        log.drain()
+
+        self.assertEqual(
+            log.stats(), {'queued': 0, 'written': 25, 'dropped': 0, 'failed': 0}
+        )
+        self.assertEqual(
+            sorted(AuditEvent.objects.values_list('actor_id', flat=True)),
+            list(range(25)),
+        )
+        self.assertEqual(AuditEvent.objects.filter(allowed=True).count(), 13)
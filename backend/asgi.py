@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_asgi_application()
+
+# Снимки метрик пишут только процессы сервера, не команды manage.py
+from api.metrics import registry  # noqa: E402
+
+registry.enable_flush()
@@ -46,10 +46,12 @@ INSTALLED_APPS = [
     'api',
     'access',
     'business_objects',
+    'audit',
     'drf_yasg'
 ]
 
 MIDDLEWARE = [
+    'api.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -80,14 +82,45 @@ WSGI_APPLICATION = 'backend.wsgi.application'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 10
+    'PAGE_SIZE': 10,
+    # Сколько доверенных прокси перед сервисом: лимиты по IP берут адрес
+    # клиента из X-Forwarded-For только за ними. 0 — только REMOTE_ADDR,
+    # иначе клиент подменил бы заголовок и обошёл лимиты
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '0')),
+    # Лимиты users.throttling: вход, обновление токена, регистрация
+    'DEFAULT_THROTTLE_RATES': {
+        'login_ip': '20/min',
+        'login_email': '5/min',
+        'login': '600/min',
+        'refresh_ip': '60/min',
+        'refresh': '3000/min',
+        'register_ip': '10/hour',
+        'register': '300/min',
+    },
+}
+
+# Кэш по умолчанию — в памяти процесса; REDIS_URL добавляет общий
+# для всех процессов кэш 'shared' (например, redis://redis:6379/0)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
 }
+if os.getenv('REDIS_URL'):
+    CACHES['shared'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.getenv('REDIS_URL'),
+    }
+
+# Алиас кэша Django для счётчиков лимитов, общих для всех процессов;
+# без него счётчики хранятся в памяти каждого процесса
+THROTTLE_CACHE_ALIAS = os.getenv('THROTTLE_CACHE_ALIAS') or None
 
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=5),
@@ -97,19 +130,124 @@ SIMPLE_JWT = {
     'AUTH_HEADER_TYPES': ('Bearer',),
 }
 
+# Кэш пользователей с ролями для CachedJWTAuthentication
+USER_CACHE_MAX_SIZE = 10_000
+USER_CACHE_TTL = 60  # секунд
+
+# Кэш проверенных access токенов для CachedJWTAuthentication
+JWT_CACHE_MAX_SIZE = 50_000
+JWT_CACHE_TTL = 300  # секунд, но не дольше exp токена
+
+# Роль и маски прав в claims access токена: проверки прав без запросов к БД
+PERMISSION_CLAIMS_ENABLED = os.getenv('PERMISSION_CLAIMS_ENABLED', '') == 'true'
+
+# Асинхронные GET для горячих эндпоинтов чтения (имеет смысл под ASGI)
+ASYNC_READ_ENDPOINTS = os.getenv('ASYNC_READ_ENDPOINTS', '') == 'true'
+
+# Отозванные refresh токены проверяются в памяти (users.revocation)
+TOKEN_REVOCATION_SYNC_INTERVAL = 1.0  # секунд
+TOKEN_REVOCATION_RELOAD_INTERVAL = 60.0  # секунд
+TOKEN_REVOCATION_SYNC_OVERLAP = 30.0  # секунд
+
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
+def postgres_database(host):
+    database = {
         'ENGINE': 'django.db.backends.postgresql',
         'NAME': os.getenv('POSTGRES_DB', 'django'),
         'USER': os.getenv('POSTGRES_USER', 'django'),
         'PASSWORD': os.getenv('POSTGRES_PASSWORD', '123'),
-        'HOST': os.getenv('POSTGRES_HOST', 'django'),
-        'PORT': os.getenv('POSTGRES_PORT', 5432)
+        'HOST': host,
+        'PORT': os.getenv('POSTGRES_PORT', 5432),
+        # С пулом соединение проверяется перед выдачей из пула
+        'CONN_HEALTH_CHECKS': True,
+    }
+    if os.getenv('POSTGRES_POOL', 'true') == 'true':
+        # Пул psycopg в каждом процессе (WSGI и ASGI): соединение
+        # возвращается в пул в конце запроса, а не закрывается
+        database['OPTIONS'] = {'pool': {
+            'min_size': int(os.getenv('POSTGRES_POOL_MIN_SIZE', 2)),
+            'max_size': int(os.getenv('POSTGRES_POOL_MAX_SIZE', 10)),
+            'timeout': float(os.getenv('POSTGRES_POOL_TIMEOUT', 10)),
+            'max_idle': float(os.getenv('POSTGRES_POOL_MAX_IDLE', 300)),
+            'max_lifetime': float(os.getenv('POSTGRES_POOL_MAX_LIFETIME', 3600)),
+        }}
+    return database
+
+
+def sqlite_database(name):
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / name,
     }
+
+
+# Реплики для чтения (api.db_routing): хосты Postgres через запятую
+# или, для локальной проверки с DB_ENGINE=sqlite, файлы SQLite
+if os.getenv('DB_ENGINE') == 'sqlite':
+    DATABASES = {'default': sqlite_database('db.sqlite3')}
+    replicas = [
+        sqlite_database(name)
+        for name in os.getenv('SQLITE_REPLICA_NAMES', '').split(',') if name
+    ]
+else:
+    DATABASES = {'default': postgres_database(os.getenv('POSTGRES_HOST', 'django'))}
+    replicas = [
+        postgres_database(host)
+        for host in os.getenv('POSTGRES_REPLICA_HOSTS', '').split(',') if host
+    ]
+
+for number, replica in enumerate(replicas, start=1):
+    # В тестах реплика — та же БД, что и основная
+    DATABASES[f'replica_{number}'] = {**replica, 'TEST': {'MIRROR': 'default'}}
+
+DATABASE_ROUTERS = ['api.db_routing.ReplicaRouter']
+
+# Действия вьюсетов, чьи чтения уходят на реплики
+REPLICA_READ_ACTIONS = {
+    'BusinessObjectViewSet': ('list', 'retrieve', 'export', 'check_access'),
+    'UserViewSet': ('list', 'retrieve'),
+    'AccessRuleViewSet': ('list', 'retrieve'),
 }
+# Сколько секунд после записи пользователь читает с основной БД
+REPLICA_STICKY_SECONDS = 5
+# Алиас общего для всех процессов кэша, где хранятся отметки о записи
+# (например, shared). Без него реплики не используются: отметка в памяти
+# одного процесса не защищает от устаревших чтений в другом. Для одного
+# процесса (runserver) подойдёт default
+REPLICA_STICKY_CACHE_ALIAS = os.getenv('REPLICA_STICKY_CACHE_ALIAS') or None
+
+# Профилирование запросов (api.profiling): доля случайно профилируемых
+# запросов и каталог, где хранятся последние PROFILING_MAX_ENTRIES профилей
+PROFILING_SAMPLE_RATE = float(os.getenv('PROFILING_SAMPLE_RATE', 0))
+PROFILING_DIR = BASE_DIR / 'profiles'
+PROFILING_MAX_ENTRIES = 200
+
+# Метрики Prometheus (api.metrics): каталог снимков процессов, общий
+# для всех воркеров сервиса, как часто процесс пишет свой снимок
+# и токен сборщика для /api/metrics/ (пустой — без проверки)
+METRICS_DIR = Path(os.getenv('METRICS_DIR') or BASE_DIR / 'metrics')
+METRICS_FLUSH_INTERVAL = 5
+METRICS_TOKEN = os.getenv('METRICS_TOKEN', '')
+
+# Журнал аудита (audit.log): решения о доступе, изменения правил доступа
+# и ролей пишутся в фоне пачками; события сверх AUDIT_QUEUE_SIZE
+# в очереди процесса отбрасываются (запрос ждёт не дольше
+# AUDIT_QUEUE_TIMEOUT секунд) и учитываются в метриках
+AUDIT_LOG_ENABLED = os.getenv('AUDIT_LOG_ENABLED', 'true') == 'true'
+AUDIT_QUEUE_SIZE = 10_000
+AUDIT_QUEUE_TIMEOUT = 0.0
+
+# Тесты: журнал аудита выключен и дописывается до удаления тестовых БД
+TEST_RUNNER = 'backend.test_runner.TestRunner'
+
+# Схема OpenAPI для /swagger/ и /redoc/ (api.schema) собирается один раз
+# на процесс и отдаётся с ETag. OPENAPI_SCHEMA_FILE — схема, заранее
+# собранная командой generate_openapi_schema (пусто — собирать при первом
+# запросе); OPENAPI_SCHEMA_CACHE=false — собирать на каждый запрос
+OPENAPI_SCHEMA_FILE = os.getenv('OPENAPI_SCHEMA_FILE', '')
+OPENAPI_SCHEMA_CACHE = os.getenv('OPENAPI_SCHEMA_CACHE', 'true') == 'true'
 
 
 # Password validation
@@ -131,6 +269,28 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Первый хешер — предпочтительный: старые хеши (pbkdf2 в фикстурах)
+# проверяются остальными и перехешируются им при успешном входе
+PASSWORD_HASHERS = [
+    'users.hashers.Argon2PasswordHasher',
+    'users.hashers.ScryptPasswordHasher',
+    'users.hashers.PBKDF2PasswordHasher',
+]
+
+# Стоимость хеширования и пул потоков, в котором оно выполняется
+PASSWORD_HASHING = {
+    'ARGON2_TIME_COST': 2,
+    'ARGON2_MEMORY_COST': 19_456,  # КиБ
+    'ARGON2_PARALLELISM': 1,
+    'SCRYPT_WORK_FACTOR': 2**14,
+    'SCRYPT_BLOCK_SIZE': 8,
+    'SCRYPT_PARALLELISM': 1,
+    'POOL_SIZE': None,  # по числу ядер
+    'POOL_QUEUE': 32,
+    'POOL_TIMEOUT': 10,  # секунд
+}
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/6.0/topics/i18n/
 
@@ -0,0 +1,28 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+from audit.log import audit_log
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Запуск тестов без фоновой записи в журнал аудита.
+
+    Журнал аудита в тестах выключен: тесты журнала включают его сами
+    через override_settings. События, которые всё же попали в очередь
+    процесса, записываются до удаления тестовых БД — при завершении
+    процесса настройки снова указывают на рабочую БД.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._audit_settings = override_settings(AUDIT_LOG_ENABLED=False)
+        self._audit_settings.enable()
+
+    def teardown_databases(self, old_config, **kwargs):
+        audit_log.drain()
+        super().teardown_databases(old_config, **kwargs)
+
+    def teardown_test_environment(self, **kwargs):
+        self._audit_settings.disable()
+        super().teardown_test_environment(**kwargs)
@@ -1,21 +1,9 @@
 from django.urls import include, path
-from drf_yasg import openapi
-from drf_yasg.views import get_schema_view
-from rest_framework import permissions
-
-schema_view = get_schema_view(
-   openapi.Info(
-      title='Authorization System API',
-      default_version='v1',
-      description='Документация для API авторизации и бизнес-объектов',
-   ),
-   public=True,
-   permission_classes=(permissions.AllowAny,),
-)
 
+from api.endpoints import docs_view
 
 urlpatterns = [
     path('api/', include('api.urls')),
-    path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
-    path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
+    path('swagger/', docs_view, {'ui': 'swagger'}, name='schema-swagger-ui'),
+    path('redoc/', docs_view, {'ui': 'redoc'}, name='schema-redoc'),
 ]
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 application = get_wsgi_application()
+
+# Снимки метрик пишут только процессы сервера, не команды manage.py
+from api.metrics import registry  # noqa: E402
+
+registry.enable_flush()
@@ -1,2 +1,14 @@
 NAME_MAX_LENGTH = 128
 NAME_STR_WIDTH = 32
+
+# Действия над конкретным объектом и над ресурсом в целом
+OBJECT_ACTIONS = ('retrieve', 'partial_update', 'destroy')
+RESOURCE_ACTIONS = ('list', 'create')
+# Максимум проверок в одном запросе пакетной проверки прав
+PERMISSION_CHECKS_MAX_LENGTH = 1000
+# Максимум объектов в одном запросе массовых операций
+BULK_MAX_LENGTH = 10_000
+# Размер пачки INSERT/UPDATE в массовых операциях
+BULK_BATCH_SIZE = 1000
+# Сколько строк читается с курсора БД и отдаётся клиенту за раз при экспорте
+EXPORT_CHUNK_SIZE = 2000
@@ -0,0 +1,23 @@
+# Generated by Django 6.0 on 2026-10-18 20:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('business_objects', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='businessobject',
+            index=models.Index(fields=['resource', 'name'], name='bo_resource_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='businessobject',
+            index=models.Index(fields=['resource', 'owner', 'name'], name='bo_resource_owner_name_idx'),
+        ),
+    ]
@@ -46,6 +46,17 @@ class BusinessObject(models.Model):
     class Meta:
         ordering = ('name',)
         default_related_name = 'business_objects'
+        indexes = [
+            # Списки ресурса: все объекты или только свои, по порядку name
+            models.Index(
+                fields=['resource', 'name'],
+                name='bo_resource_name_idx'
+            ),
+            models.Index(
+                fields=['resource', 'owner', 'name'],
+                name='bo_resource_owner_name_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.name[:NAME_STR_WIDTH]
@@ -1,5 +1,13 @@
 from rest_framework import serializers
 
+from api.serializers import DynamicFieldsMixin
+from business_objects.constants import (
+    BULK_MAX_LENGTH,
+    NAME_MAX_LENGTH,
+    OBJECT_ACTIONS,
+    PERMISSION_CHECKS_MAX_LENGTH,
+    RESOURCE_ACTIONS,
+)
 from business_objects.models import BusinessObject, BusinessResource
 from users.serializers import UserReadSerializer
 
@@ -15,11 +23,42 @@ class BusinessResourceSerializer(serializers.ModelSerializer):
         )
 
 
-class BusinessObjectReadSerializer(serializers.ModelSerializer):
-    """Сериализатор для чтения бизнес-объекта."""
+class BusinessObjectReadSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Сериализатор для чтения бизнес-объекта.
+
+    Поддерживает ?fields= и ?expand=owner,resource: свёрнутый владелец
+    отдаётся id, свёрнутый ресурс — именем (см. DynamicFieldsMixin).
+    """
     owner = UserReadSerializer(read_only=True)
     resource = BusinessResourceSerializer(read_only=True)
 
+    collapsed_fields = {
+        'owner': (serializers.PrimaryKeyRelatedField, {'read_only': True}),
+        'resource': (
+            serializers.SlugRelatedField,
+            {'slug_field': 'name', 'read_only': True}
+        ),
+    }
+    related_columns = {
+        'owner': (
+            (
+                'owner',
+                'owner__email',
+                'owner__username',
+                'owner__first_name',
+                'owner__last_name',
+                'owner__role',
+                'owner__role__name',
+            ),
+            ('owner',),
+        ),
+        'resource': (
+            ('resource', 'resource__name', 'resource__description'),
+            ('resource', 'resource__name'),
+        ),
+    }
+
     class Meta:
         model = BusinessObject
         fields = (
@@ -62,3 +101,61 @@ class BusinessObjectUpdateSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         return BusinessObjectReadSerializer(instance).data
+
+
+class PermissionCheckSerializer(serializers.Serializer):
+    """
+    Одна проверка прав: action над объектом (business_object_id)
+    или над ресурсом (resource) для list и create.
+    """
+    action = serializers.ChoiceField(choices=OBJECT_ACTIONS + RESOURCE_ACTIONS)
+    business_object_id = serializers.IntegerField(required=False)
+    resource = serializers.CharField(required=False)
+
+    def validate(self, data):
+        if data['action'] in OBJECT_ACTIONS and 'business_object_id' not in data:
+            raise serializers.ValidationError(
+                {'business_object_id': 'Для этого действия нужен id объекта.'}
+            )
+        if data['action'] in RESOURCE_ACTIONS and 'resource' not in data:
+            raise serializers.ValidationError(
+                {'resource': 'Для этого действия нужно имя ресурса.'}
+            )
+        return data
+
+
+class PermissionCheckBatchSerializer(serializers.Serializer):
+    """Сериализатор пакетной проверки прав на бизнес-объекты."""
+    checks = PermissionCheckSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=PERMISSION_CHECKS_MAX_LENGTH
+    )
+
+
+class BusinessObjectBulkCreateSerializer(serializers.Serializer):
+    """
+    Элемент массового создания бизнес-объектов.
+
+    Проверяет только формат: ресурсы, уникальность имён и права
+    проверяются для всей пачки сразу (см. BusinessObjectBulkMixin).
+    """
+    name = serializers.CharField(max_length=NAME_MAX_LENGTH)
+    description = serializers.CharField(required=False, allow_blank=True)
+    resource = serializers.CharField()
+
+
+class BusinessObjectBulkUpdateSerializer(serializers.Serializer):
+    """Элемент массового обновления бизнес-объектов."""
+    id = serializers.IntegerField()
+    name = serializers.CharField(max_length=NAME_MAX_LENGTH, required=False)
+    description = serializers.CharField(required=False, allow_blank=True)
+
+
+class BusinessObjectBulkDestroySerializer(serializers.Serializer):
+    """Сериализатор массового удаления бизнес-объектов."""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        allow_empty=False,
+        max_length=BULK_MAX_LENGTH
+    )
@@ -0,0 +1,133 @@
+import copy
+import hashlib
+import time
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from access.epoch import policy_epoch
+from users.cache import LRUCache
+from users.constants import (
+    JWT_CACHE_MAX_SIZE,
+    JWT_CACHE_TTL,
+    USER_CACHE_MAX_SIZE,
+    USER_CACHE_TTL,
+)
+
+# Пользователи вместе с ролью по id; сбрасывается сигналами users.signals
+# и целиком — при смене эпохи политики доступа
+user_cache = LRUCache(
+    max_size=getattr(settings, 'USER_CACHE_MAX_SIZE', USER_CACHE_MAX_SIZE),
+    ttl=getattr(settings, 'USER_CACHE_TTL', USER_CACHE_TTL),
+    epoch=policy_epoch.current,
+)
+
+# Проверенные access токены по sha256 сырого токена: повторный запрос
+# с тем же токеном не декодирует его и не проверяет подпись заново
+jwt_cache = LRUCache(
+    max_size=getattr(settings, 'JWT_CACHE_MAX_SIZE', JWT_CACHE_MAX_SIZE),
+    ttl=getattr(settings, 'JWT_CACHE_TTL', JWT_CACHE_TTL),
+)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT аутентификация, берущая токен и пользователя из кэша.
+
+    Проверенный токен кэшируется до своего exp, так что проверка
+    подписи повторяется только на промахе. Отзываются только refresh
+    токены: access токен действует до своего exp (5 минут), поэтому
+    отзывы на этом пути не проверяются.
+
+    Пользователь загружается одним запросом вместе с ролью и кэшируется
+    по id, поэтому ни аутентификация, ни пермишены, обращающиеся
+    к user.role, не ходят в БД на каждый запрос.
+    """
+
+    def _decode_token(self, raw_token):
+        key = hashlib.sha256(raw_token).hexdigest()
+        token = jwt_cache.get(key)
+        if token is None:
+            token = super().get_validated_token(raw_token)
+            ttl = min(token['exp'] - time.time(), jwt_cache.ttl)
+            if ttl > 0:
+                jwt_cache.set(key, token, ttl=ttl)
+        return token
+
+    def get_validated_token(self, raw_token):
+        return self._decode_token(raw_token)
+
+    def _get_user_id(self, validated_token):
+        try:
+            return validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _('Token contained no recognizable user identification')
+            ) from e
+
+    def _check_user(self, user, validated_token):
+        # Каждый запрос получает свою копию: закэшированный объект общий
+        user = copy.copy(user)
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        if api_settings.CHECK_REVOKE_TOKEN and validated_token.get(
+            api_settings.REVOKE_TOKEN_CLAIM
+        ) != get_md5_hash_password(user.password):
+            raise AuthenticationFailed(
+                _("The user's password has been changed."),
+                code='password_changed'
+            )
+
+        return user
+
+    def _user_not_found(self):
+        return AuthenticationFailed(_('User not found'), code='user_not_found')
+
+    def get_user(self, validated_token):
+        user_id = self._get_user_id(validated_token)
+        key = str(user_id)
+        user = user_cache.get(key)
+        if user is None:
+            try:
+                user = self.user_model.objects.select_related('role').get(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist as e:
+                raise self._user_not_found() from e
+            user_cache.set(key, user)
+        return self._check_user(user, validated_token)
+
+    async def aauthenticate(self, request):
+        """
+        authenticate() для асинхронных вью.
+
+        Эпоха политики обновляется в потоке только когда подошло время,
+        пользователь на промахе кэша загружается через async ORM.
+        """
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        await policy_epoch.acurrent()
+        token = self._decode_token(raw_token)
+
+        user_id = self._get_user_id(token)
+        user = user_cache.get(str(user_id))
+        if user is None:
+            try:
+                user = await self.user_model.objects.select_related('role').aget(
+                    **{api_settings.USER_ID_FIELD: user_id}
+                )
+            except self.user_model.DoesNotExist as e:
+                raise self._user_not_found() from e
+            user_cache.set(str(user_id), user)
+        return self._check_user(user, token), token
@@ -0,0 +1,76 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+
+class LRUCache:
+    """
+    Потокобезопасный LRU-кэш с ограниченным размером и временем жизни.
+
+    Если передан epoch — функция, возвращающая текущую эпоху политики
+    доступа, — кэш целиком очищается, как только эпоха меняется.
+    """
+
+    def __init__(self, max_size, ttl, epoch=None):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._epoch = epoch
+        self._current_epoch = None
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def _check_epoch(self):
+        if self._epoch is None:
+            return
+        epoch = self._epoch()
+        if epoch != self._current_epoch:
+            with self._lock:
+                self._data.clear()
+                self._current_epoch = epoch
+
+    def get(self, key, default=None):
+        self._check_epoch()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            value, expires_at = item
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        """Сохранить значение; ttl — время жизни в секундах вместо общего."""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """Размер и счётчики попаданий для подбора max_size."""
+        return {
+            'size': len(self._data),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+    def __len__(self):
+        return len(self._data)
@@ -1,3 +1,38 @@
 NAME_MAX_LENGTH = 128
 EMAIL_MAX_LENGTH = 128
 USERNAME_STR_WIDTH = 32
+
+# Кэш пользователей для JWT аутентификации
+USER_CACHE_MAX_SIZE = 10_000
+USER_CACHE_TTL = 60
+
+# Кэш проверенных access токенов; время жизни не больше срока токена
+JWT_CACHE_MAX_SIZE = 50_000
+JWT_CACHE_TTL = 300
+
+# Политика хеширования паролей по умолчанию (см. settings.PASSWORD_HASHING)
+PASSWORD_HASHING_DEFAULTS = {
+    'ARGON2_TIME_COST': 2,
+    'ARGON2_MEMORY_COST': 19_456,  # КиБ
+    'ARGON2_PARALLELISM': 1,
+    'SCRYPT_WORK_FACTOR': 2**14,
+    'SCRYPT_BLOCK_SIZE': 8,
+    'SCRYPT_PARALLELISM': 1,
+    'POOL_SIZE': None,  # по числу ядер
+    'POOL_QUEUE': 32,
+    'POOL_TIMEOUT': 10,  # секунд
+}
+
+# Отозванные refresh токены (users.revocation)
+TOKEN_REVOCATION_SYNC_INTERVAL = 1.0  # секунд между догрузками новых отзывов
+TOKEN_REVOCATION_RELOAD_INTERVAL = 60.0  # секунд между полными перечитываниями
+# Окно перечитывания догрузки: отзывы, закоммиченные не по порядку id
+TOKEN_REVOCATION_SYNC_OVERLAP = 30.0  # секунд
+TOKEN_REVOCATION_BLOOM_CAPACITY = 100_000
+TOKEN_REVOCATION_BLOOM_ERROR_RATE = 0.001
+TOKEN_PURGE_BATCH_SIZE = 5000
+TOKEN_REVOKE_USERS_CHUNK_SIZE = 1000
+
+# Ограничение частоты входа, обновления токена и регистрации
+THROTTLE_MAX_KEYS = 100_000  # счётчиков в памяти процесса
+THROTTLE_CACHE_KEY_PREFIX = 'throttle'
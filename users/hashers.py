@@ -0,0 +1,156 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from users.constants import PASSWORD_HASHING_DEFAULTS
+
+
+def hashing_setting(name):
+    """Параметр политики хеширования из settings.PASSWORD_HASHING."""
+    return getattr(settings, 'PASSWORD_HASHING', {}).get(
+        name, PASSWORD_HASHING_DEFAULTS[name]
+    )
+
+
+class PasswordHashingBusy(APIException):
+    """Очередь хеширования паролей переполнена."""
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Сервер перегружен, повторите попытку позже.'
+    default_code = 'password_hashing_busy'
+
+
+class HashingPool:
+    """
+    Ограниченный пул потоков для хеширования паролей.
+
+    Хеширование занимает CPU на сотни миллисекунд, поэтому одновременно
+    выполняется не больше POOL_SIZE хешей, ещё POOL_QUEUE ждут в очереди,
+    а остальные запросы сразу получают 503, не отнимая CPU у остального
+    API. argon2, scrypt и pbkdf2 отпускают GIL, так что потоки пула
+    действительно работают параллельно.
+    """
+
+    def __init__(self):
+        self._executor = None
+        self._slots = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _mark_worker(self):
+        self._local.in_pool = True
+
+    def _get_executor(self):
+        # После fork потоки пула родителя в дочернем процессе не живут
+        pid = os.getpid()
+        if self._pid != pid:
+            with self._lock:
+                if self._pid != pid:
+                    size = hashing_setting('POOL_SIZE') or os.cpu_count() or 1
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=size,
+                        thread_name_prefix='password-hashing',
+                        initializer=self._mark_worker,
+                    )
+                    self._slots = threading.BoundedSemaphore(
+                        size + hashing_setting('POOL_QUEUE')
+                    )
+                    self._pid = pid
+        return self._executor
+
+    def run(self, func):
+        # Вложенные вызовы (verify -> encode) выполняются в том же потоке
+        if getattr(self._local, 'in_pool', False):
+            return func()
+
+        executor = self._get_executor()
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise PasswordHashingBusy
+        try:
+            future = executor.submit(func)
+        except BaseException:
+            slots.release()
+            raise
+        # Место освобождается, когда хеш действительно посчитан (или снят
+        # с очереди), а не когда запрос перестал его ждать: иначе после
+        # таймаутов работа в пуле копится сверх POOL_QUEUE
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=hashing_setting('POOL_TIMEOUT'))
+        except FutureTimeoutError as e:
+            future.cancel()
+            raise PasswordHashingBusy from e
+
+    @contextmanager
+    def bypass(self):
+        """Хешировать в текущем потоке, мимо пула (для замеров)."""
+        in_pool = getattr(self._local, 'in_pool', False)
+        self._local.in_pool = True
+        try:
+            yield
+        finally:
+            self._local.in_pool = in_pool
+
+
+hashing_pool = HashingPool()
+
+
+class PooledHasherMixin:
+    """Выполняет encode и verify хешера в пуле hashing_pool."""
+
+    def encode(self, *args, **kwargs):
+        return hashing_pool.run(partial(super().encode, *args, **kwargs))
+
+    def verify(self, password, encoded):
+        return hashing_pool.run(partial(super().verify, password, encoded))
+
+
+class Argon2PasswordHasher(PooledHasherMixin, hashers.Argon2PasswordHasher):
+    """Argon2id с параметрами из PASSWORD_HASHING."""
+
+    @property
+    def time_cost(self):
+        return hashing_setting('ARGON2_TIME_COST')
+
+    @property
+    def memory_cost(self):
+        return hashing_setting('ARGON2_MEMORY_COST')
+
+    @property
+    def parallelism(self):
+        return hashing_setting('ARGON2_PARALLELISM')
+
+
+class ScryptPasswordHasher(PooledHasherMixin, hashers.ScryptPasswordHasher):
+    """scrypt с параметрами из PASSWORD_HASHING."""
+
+    @property
+    def work_factor(self):
+        return hashing_setting('SCRYPT_WORK_FACTOR')
+
+    @property
+    def block_size(self):
+        return hashing_setting('SCRYPT_BLOCK_SIZE')
+
+    @property
+    def parallelism(self):
+        return hashing_setting('SCRYPT_PARALLELISM')
+
+
+class PBKDF2PasswordHasher(PooledHasherMixin, hashers.PBKDF2PasswordHasher):
+    """
+    PBKDF2 для проверки старых хешей (fixtures/users.json).
+
+    Не стоит первым в PASSWORD_HASHERS, поэтому при успешном входе
+    Django сам перехеширует пароль предпочтительным хешером.
+    """
+
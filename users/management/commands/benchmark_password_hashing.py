@@ -0,0 +1,64 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import get_hashers
+from django.core.management.base import BaseCommand
+
+from users.hashers import hashing_pool
+
+BENCHMARK_PASSWORD = 'Password_123'  # noqa: S105
+
+
+class Command(BaseCommand):
+    help = (
+        'Замер скорости проверки паролей каждым хешером из PASSWORD_HASHERS: '
+        'входов в секунду на одно ядро и при параллельной нагрузке. Хеши '
+        'считаются в потоках замера, мимо ограниченного пула хеширования: '
+        'замеряется пропускная способность ядер, а не размер пула.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=20,
+            help='Сколько проверок пароля выполнить на каждый поток.'
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=os.cpu_count() or 1,
+            help='Число параллельных "клиентов" для замера под нагрузкой.'
+        )
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        threads = options['threads']
+        cores = os.cpu_count() or 1
+
+        for hasher in get_hashers():
+            encoded = hasher.encode(BENCHMARK_PASSWORD, hasher.salt())
+
+            def verify_many(hasher=hasher, encoded=encoded):
+                # Через пул замер упёрся бы в POOL_SIZE, а сверх POOL_QUEUE
+                # потоков получил бы PasswordHashingBusy
+                with hashing_pool.bypass():
+                    for _ in range(iterations):
+                        hasher.verify(BENCHMARK_PASSWORD, encoded)
+
+            started = time.perf_counter()
+            verify_many()
+            single = iterations / (time.perf_counter() - started)
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                for future in [executor.submit(verify_many) for _ in range(threads)]:
+                    future.result()
+            parallel = threads * iterations / (time.perf_counter() - started)
+
+            self.stdout.write(
+                f'{hasher.algorithm}: {single:.1f} входов/с на ядро, '
+                f'{parallel:.1f} входов/с в {threads} потоках '
+                f'({parallel / min(threads, cores):.1f} на ядро)'
+            )
@@ -0,0 +1,52 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+from users.constants import TOKEN_PURGE_BATCH_SIZE
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаление истёкших refresh токенов (и их записей в blacklist) '
+        'небольшими пачками, каждая в своей короткой транзакции.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=TOKEN_PURGE_BATCH_SIZE,
+            help='Сколько токенов удалять за одну транзакцию.'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.0,
+            help='Пауза между пачками в секундах.'
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        now = aware_utcnow()
+        total = 0
+        while True:
+            ids = list(
+                OutstandingToken.objects.filter(expires_at__lte=now)
+                .order_by('id')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            # Записи BlacklistedToken удаляются каскадом в той же транзакции
+            with transaction.atomic():
+                OutstandingToken.objects.filter(pk__in=ids).delete()
+            total += len(ids)
+            self.stdout.write(f'Удалено {total} истёкших токенов')
+            if len(ids) < batch_size:
+                break
+            if options['sleep']:
+                time.sleep(options['sleep'])
+        self.stdout.write(f'Готово: удалено {total} истёкших токенов')
@@ -0,0 +1,257 @@
+import hashlib
+import logging
+import math
+import time
+from datetime import UTC, datetime
+from threading import Lock, Thread
+
+from django.conf import settings
+from django.db import connections
+
+from users.constants import (
+    TOKEN_REVOCATION_BLOOM_CAPACITY,
+    TOKEN_REVOCATION_BLOOM_ERROR_RATE,
+    TOKEN_REVOCATION_RELOAD_INTERVAL,
+    TOKEN_REVOCATION_SYNC_INTERVAL,
+    TOKEN_REVOCATION_SYNC_OVERLAP,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Фильтр Блума по строковым ключам.
+
+    Отвечает "точно нет" или "возможно есть" с долей ложных
+    срабатываний около error_rate, пока ключей не больше capacity.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = max(capacity, 1)
+        self.size = max(
+            int(-self.capacity * math.log(error_rate) / math.log(2) ** 2), 8
+        )
+        self.hash_count = max(round(self.size / self.capacity * math.log(2)), 1)
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key):
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, key):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(key)
+        )
+
+
+class RevocationStore:
+    """
+    Отозванные refresh токены в памяти процесса.
+
+    Источник истины — таблицы token_blacklist, но проверка токена
+    не ходит в БД: jti ищется сначала в фильтре Блума (почти все
+    действующие токены отсеиваются на нём), затем в точном словаре
+    jti -> время истечения. Новые отзывы догружаются из БД не чаще
+    раза в TOKEN_REVOCATION_SYNC_INTERVAL секунд; раз
+    в TOKEN_REVOCATION_RELOAD_INTERVAL словарь и фильтр собираются
+    заново — без истёкших токенов — в фоновом потоке, не задерживая
+    запрос.
+
+    Догрузка читает строки с id больше нижней границы, а граница
+    сдвигается только до отзывов старше TOKEN_REVOCATION_SYNC_OVERLAP
+    секунд. Отзыв, чья транзакция закоммичена позже строк с большими id,
+    поэтому не теряется, пока его транзакция короче этого окна.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._bloom = None
+        self._floor_id = 0
+        self._synced_at = 0.0
+        self._loaded_at = None
+        self._reloader = None
+        self._lock = Lock()
+
+    @property
+    def sync_interval(self):
+        return getattr(
+            settings,
+            'TOKEN_REVOCATION_SYNC_INTERVAL',
+            TOKEN_REVOCATION_SYNC_INTERVAL
+        )
+
+    @property
+    def reload_interval(self):
+        return getattr(
+            settings,
+            'TOKEN_REVOCATION_RELOAD_INTERVAL',
+            TOKEN_REVOCATION_RELOAD_INTERVAL
+        )
+
+    @property
+    def sync_overlap(self):
+        return getattr(
+            settings,
+            'TOKEN_REVOCATION_SYNC_OVERLAP',
+            TOKEN_REVOCATION_SYNC_OVERLAP
+        )
+
+    def _build_bloom(self, entries):
+        capacity = TOKEN_REVOCATION_BLOOM_CAPACITY
+        while capacity < len(entries) * 2:
+            capacity *= 2
+        bloom = BloomFilter(capacity, TOKEN_REVOCATION_BLOOM_ERROR_RATE)
+        for jti in entries:
+            bloom.add(jti)
+        return bloom
+
+    def _rows(self, queryset):
+        return queryset.values_list(
+            'id', 'token__jti', 'token__expires_at', 'blacklisted_at'
+        ).order_by('id').iterator()
+
+    def _settled_id(self, rows):
+        # Наибольший id среди отзывов старше окна: строки после него
+        # перечитываются, пока не выйдут из окна
+        settled = time.time() - self.sync_overlap
+        return max(
+            (pk for pk, _, _, blacklisted_at in rows
+             if blacklisted_at.timestamp() < settled),
+            default=0,
+        )
+
+    def _reload(self, now):
+        from rest_framework_simplejwt.token_blacklist.models import (
+            BlacklistedToken,
+        )
+
+        entries = {}
+        rows = list(self._rows(
+            BlacklistedToken.objects.filter(
+                token__expires_at__gt=datetime.now(UTC)
+            )
+        ))
+        for _, jti, expires_at, _ in rows:
+            entries[jti] = expires_at.timestamp()
+        bloom = self._build_bloom(entries)
+        with self._lock:
+            # Отзывы, сделанные этим процессом во время перечитывания
+            for jti, expires_at in self._entries.items():
+                if jti not in entries and expires_at > time.time():
+                    entries[jti] = expires_at
+                    bloom.add(jti)
+            self._entries = entries
+            self._bloom = bloom
+            self._floor_id = max(self._floor_id, self._settled_id(rows))
+            self._loaded_at = now
+            self._synced_at = now
+
+    def _reload_in_background(self, now):
+        try:
+            self._reload(now)
+        except Exception:
+            # Повторим через reload_interval; до тех пор работает догрузка
+            logger.exception('Не удалось перечитать отозванные токены')
+            self._loaded_at = now
+        finally:
+            connections.close_all()
+
+    def _reloading(self):
+        return self._reloader is not None and self._reloader.is_alive()
+
+    def _start_reload(self, now):
+        with self._lock:
+            if self._reloading():
+                return
+            self._reloader = Thread(
+                target=self._reload_in_background,
+                args=(now,),
+                name='token-revocation-reload',
+                daemon=True,
+            )
+            self._reloader.start()
+
+    def _sync_new(self, now):
+        from rest_framework_simplejwt.token_blacklist.models import (
+            BlacklistedToken,
+        )
+
+        rows = list(self._rows(
+            BlacklistedToken.objects.filter(pk__gt=self._floor_id)
+        ))
+        with self._lock:
+            for _, jti, expires_at, _ in rows:
+                self._add(jti, expires_at.timestamp())
+            self._floor_id = max(self._floor_id, self._settled_id(rows))
+            self._synced_at = now
+
+    def _add(self, jti, expires_at):
+        if jti in self._entries:
+            return
+        self._entries[jti] = expires_at
+        if len(self._entries) > self._bloom.capacity:
+            self._bloom = self._build_bloom(self._entries)
+        else:
+            self._bloom.add(jti)
+
+    def _reload_due(self, now):
+        return self._loaded_at is None or now - self._loaded_at >= self.reload_interval
+
+    def sync(self, force=False):
+        """
+        Догрузить новые отзывы из БД, если подошло время.
+
+        force — догрузить сразу, не дожидаясь интервала. Первая загрузка
+        в процессе выполняется сразу, полные перечитывания — в фоне.
+        """
+        now = time.monotonic()
+        if self._bloom is None:
+            self._reload(now)
+            return
+        if self._reload_due(now):
+            self._start_reload(now)
+        if force or now - self._synced_at >= self.sync_interval:
+            self._sync_new(now)
+
+    def _check(self, jti):
+        bloom = self._bloom
+        if bloom is None or jti not in bloom:
+            return False
+        expires_at = self._entries.get(jti)
+        return expires_at is not None and expires_at > time.time()
+
+    def is_revoked(self, jti):
+        """Отозван ли токен с этим jti."""
+        self.sync()
+        return self._check(jti)
+
+    def revoke(self, jti, expires_at):
+        """
+        Отметить токен отозванным в этом процессе.
+
+        Запись в БД делает вызывающий код; остальные процессы увидят
+        отзыв при следующей догрузке.
+        """
+        if self._bloom is None:
+            self.sync()
+        with self._lock:
+            self._add(jti, expires_at)
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._bloom = None
+            self._floor_id = 0
+            self._loaded_at = None
+
+
+revocation_store = RevocationStore()
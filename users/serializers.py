@@ -1,17 +1,43 @@
 from django.contrib.auth.password_validation import validate_password
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import (
+    TokenObtainPairSerializer,
+    TokenRefreshSerializer,
+)
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from access.claims import add_permission_claims, permission_claims_enabled
+from access.epoch import policy_epoch
 from access.models import Role
 from access.serializers import RoleSerializer
+from api.serializers import DynamicFieldsMixin
 from users.models import User
+from users.tokens import RefreshToken
+
 
+class UserReadSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
+    """
+    Сериализатор для чтения данных пользователя.
 
-class UserReadSerializer(serializers.ModelSerializer):
-    """Сериализатор для чтения данных пользователя."""
+    Поддерживает ?fields= и ?expand=role (см. DynamicFieldsMixin).
+    """
 
     role = RoleSerializer(read_only=True)
 
+    collapsed_fields = {
+        'role': (
+            serializers.SlugRelatedField,
+            {'slug_field': 'name', 'read_only': True}
+        ),
+    }
+    related_columns = {
+        'role': (('role', 'role__name'), ('role', 'role__name')),
+    }
+
     class Meta:
         model = User
         fields = (
@@ -77,12 +103,40 @@ class UserUpdateSerializer(serializers.ModelSerializer):
 
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
     """Сериализатор токена с проверкой is_active."""
+    token_class = RefreshToken
 
     @classmethod
     def get_token(cls, user):
         if not user.is_active:
             raise serializers.ValidationError('Пользователь деактивирован.')
-        return super().get_token(user)
+        token = super().get_token(user)
+        if permission_claims_enabled():
+            # Claims копируются и в access токен, выпущенный из refresh
+            add_permission_claims(token, user)
+        return token
+
+
+class MyTokenRefreshSerializer(TokenRefreshSerializer):
+    """Сериализатор обновления токена, обновляющий claims с правами."""
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        try:
+            data = super().validate(attrs)
+            if not permission_claims_enabled():
+                return data
+
+            # Claims из refresh токена могли устареть — собираем заново
+            access = AccessToken(data['access'])
+            user = User.objects.select_related('role').get(
+                **{api_settings.USER_ID_FIELD: access[api_settings.USER_ID_CLAIM]}
+            )
+        except User.DoesNotExist as exc:
+            # Пользователь токена удалён: 401, а не 500
+            raise InvalidToken(_('User not found'), code='user_not_found') from exc
+        add_permission_claims(access, user)
+        data['access'] = str(access)
+        return data
 
 
 class UserRoleUpdateSerializer(serializers.ModelSerializer):
@@ -102,8 +156,11 @@ class UserRoleUpdateSerializer(serializers.ModelSerializer):
         """Обновление роли пользователя."""
         role = validated_data.get('role')
 
-        instance.role = role
-        instance.save()
+        with transaction.atomic():
+            instance.role = role
+            instance.save()
+            # Оповещаем процессы, что кэши авторизации устарели
+            policy_epoch.publish()
 
         return instance
 
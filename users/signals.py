@@ -0,0 +1,12 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.authentication import user_cache
+from users.models import User
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_cache(sender, instance, **kwargs):  # noqa: ARG001
+    """Убирает пользователя из кэша аутентификации при изменении."""
+    user_cache.delete(str(instance.pk))
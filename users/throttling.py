@@ -0,0 +1,217 @@
+import time
+from contextlib import suppress
+from threading import Lock
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from users.cache import LRUCache
+from users.constants import THROTTLE_CACHE_KEY_PREFIX, THROTTLE_MAX_KEYS
+
+RATE_PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'10/min' -> (10, 60)."""
+    count, period = rate.split('/')
+    return int(count), RATE_PERIODS[period[0]]
+
+
+def get_retry_after(current, previous, limit, window, elapsed):
+    """
+    Через сколько секунд оценка current + previous * (1 - доля окна)
+    станет меньше limit.
+    """
+    if current < limit:
+        # Ещё в этом окне, когда доля предыдущего опустится
+        # ниже limit - current
+        return window * (1 - elapsed - (limit - current) / previous)
+    # Только в следующем окне, когда текущее станет предыдущим
+    # и его взвешенная доля опустится ниже limit
+    return window * (1 - elapsed) + window * (1 - limit / current)
+
+
+class MemoryWindowBackend:
+    """
+    Счётчики скользящего окна в памяти процесса.
+
+    На ключ хранятся номер текущего окна и два числа — запросы
+    в текущем и предыдущем окне, так что проверка и учёт занимают O(1).
+    Число ключей ограничено: давно не встречавшиеся вытесняются.
+    """
+
+    def __init__(self, max_keys):
+        self._counters = LRUCache(max_size=max_keys, ttl=0)
+        self._lock = Lock()
+
+    def _counts(self, key, window, now):
+        bucket = int(now // window)
+        entry = self._counters.get(key)
+        if entry is None:
+            return bucket, 0, 0
+        entry_bucket, current, previous = entry
+        if entry_bucket == bucket:
+            return bucket, current, previous
+        if entry_bucket == bucket - 1:
+            return bucket, 0, current
+        return bucket, 0, 0
+
+    def incr(self, key, window, now):
+        with self._lock:
+            bucket, current, previous = self._counts(key, window, now)
+            self._counters.set(
+                key, (bucket, current + 1, previous), ttl=2 * window
+            )
+        return current + 1, previous
+
+    def decr(self, key, window, now):
+        with self._lock:
+            bucket, current, previous = self._counts(key, window, now)
+            if current:
+                self._counters.set(
+                    key, (bucket, current - 1, previous), ttl=2 * window
+                )
+
+
+class CacheWindowBackend:
+    """
+    Счётчики скользящего окна в кэше Django, общие для всех процессов.
+
+    Каждое окно — отдельный ключ с атомарным incr и временем жизни
+    в два окна.
+    """
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def _key(self, key, bucket):
+        return f'{THROTTLE_CACHE_KEY_PREFIX}:{key}:{bucket}'
+
+    def incr(self, key, window, now):
+        bucket = int(now // window)
+        cache_key = self._key(key, bucket)
+        self.cache.add(cache_key, 0, timeout=2 * window)
+        try:
+            current = self.cache.incr(cache_key)
+        except ValueError:
+            # Ключ успел истечь между add и incr
+            self.cache.set(cache_key, 1, timeout=2 * window)
+            current = 1
+        return current, self.cache.get(self._key(key, bucket - 1), 0)
+
+    def decr(self, key, window, now):
+        # Ключ мог истечь: тогда возвращать нечего
+        with suppress(ValueError):
+            self.cache.decr(self._key(key, int(now // window)))
+
+
+_backend = None
+_backend_lock = Lock()
+
+
+def get_throttle_backend():
+    """Хранилище счётчиков: кэш THROTTLE_CACHE_ALIAS или память процесса."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                alias = getattr(settings, 'THROTTLE_CACHE_ALIAS', None)
+                _backend = (
+                    CacheWindowBackend(alias) if alias
+                    else MemoryWindowBackend(
+                        getattr(settings, 'THROTTLE_MAX_KEYS', THROTTLE_MAX_KEYS)
+                    )
+                )
+    return _backend
+
+
+class SlidingWindowThrottle(BaseThrottle):
+    """
+    Ограничение частоты по нескольким ключам со скользящим окном.
+
+    get_keys() возвращает пары (scope, идентификатор); лимит каждого
+    scope берётся из REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'], scope
+    без лимита не проверяется. Запрос отклоняется, если превышен
+    хотя бы один лимит; отклонённые запросы не учитываются.
+
+    Число запросов за окно оценивается как текущее окно плюс
+    предыдущее, взвешенное долей, которая ещё попадает в окно.
+    Счётчик увеличивается атомарно до проверки, и решение принимается
+    по его новому значению: параллельные запросы видят разные значения
+    и вместе не превышают лимит. Отклонённый запрос возвращает
+    свои увеличения обратно.
+    """
+
+    def __init__(self):
+        self.retry_after = None
+
+    def get_keys(self, request):
+        raise NotImplementedError
+
+    def get_rate(self, scope):
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        return parse_rate(rate) if rate else None
+
+    def allow_request(self, request, view):
+        backend = get_throttle_backend()
+        now = time.time()
+        counted = []
+        for scope, ident in self.get_keys(request):
+            rate = self.get_rate(scope)
+            if rate is None or ident is None:
+                continue
+            limit, window = rate
+            key = f'{scope}:{ident}'
+            current, previous = backend.incr(key, window, now)
+            counted.append((key, window))
+            # Запросы до этого: current уже учитывает текущий
+            current -= 1
+            elapsed = (now % window) / window
+            if current + previous * (1 - elapsed) >= limit:
+                for counted_key, counted_window in counted:
+                    backend.decr(counted_key, counted_window, now)
+                self.retry_after = get_retry_after(
+                    current, previous, limit, window, elapsed
+                )
+                return False
+        return True
+
+    def wait(self):
+        return self.retry_after
+
+
+class LoginRateThrottle(SlidingWindowThrottle):
+    """Лимиты входа: по IP, по email и общий."""
+
+    def get_keys(self, request):
+        # Тело может быть не объектом (например, JSON-массивом):
+        # тогда лимит по email не применяется, а ответит сериализатор
+        data = request.data if isinstance(request.data, dict) else {}
+        email = data.get('email')
+        return (
+            ('login_ip', self.get_ident(request)),
+            ('login_email', email.strip().lower() if isinstance(email, str) else None),
+            ('login', 'all'),
+        )
+
+
+class RefreshRateThrottle(SlidingWindowThrottle):
+    """Лимиты обновления токена: по IP и общий."""
+
+    def get_keys(self, request):
+        return (
+            ('refresh_ip', self.get_ident(request)),
+            ('refresh', 'all'),
+        )
+
+
+class RegistrationRateThrottle(SlidingWindowThrottle):
+    """Лимиты регистрации: по IP и общий."""
+
+    def get_keys(self, request):
+        return (
+            ('register_ip', self.get_ident(request)),
+            ('register', 'all'),
+        )
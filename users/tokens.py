@@ -0,0 +1,88 @@
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken as BaseRefreshToken
+
+from access.epoch import policy_epoch
+from users.constants import TOKEN_REVOKE_USERS_CHUNK_SIZE
+from users.models import User
+from users.revocation import revocation_store
+
+
+class RefreshToken(BaseRefreshToken):
+    """
+    Refresh токен, проверяющий отзыв по revocation_store.
+
+    В БД отзыв по-прежнему пишется в таблицы token_blacklist,
+    но проверка при /auth/refresh/ к ним не обращается.
+    """
+
+    def check_blacklist(self):
+        if revocation_store.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError('Токен отозван.')
+
+    def blacklist(self):
+        blacklisted = super().blacklist()
+        revocation_store.revoke(
+            self.payload[api_settings.JTI_CLAIM], self.payload['exp']
+        )
+        return blacklisted
+
+
+def revoke_user_tokens(user_ids):
+    """
+    Отозвать все действующие refresh токены пользователей.
+
+    Отзыв делается одним INSERT ... SELECT на каждые
+    TOKEN_REVOKE_USERS_CHUNK_SIZE пользователей, без загрузки токенов
+    в Python. Возвращает число отозванных токенов.
+    """
+    user_ids = list(user_ids)
+    quote = connection.ops.quote_name
+    blacklisted = quote(BlacklistedToken._meta.db_table)
+    outstanding = quote(OutstandingToken._meta.db_table)
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+
+    revoked = 0
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for start in range(0, len(user_ids), TOKEN_REVOKE_USERS_CHUNK_SIZE):
+                chunk = user_ids[start:start + TOKEN_REVOKE_USERS_CHUNK_SIZE]
+                placeholders = ', '.join(['%s'] * len(chunk))
+                cursor.execute(
+                    f'INSERT INTO {blacklisted} '  # noqa: S608
+                    f'(token_id, blacklisted_at) '
+                    f'SELECT o.id, %s FROM {outstanding} o '
+                    f'WHERE o.user_id IN ({placeholders}) '
+                    f'AND o.expires_at > %s '
+                    f'AND NOT EXISTS (SELECT 1 FROM {blacklisted} b '
+                    f'WHERE b.token_id = o.id)',
+                    [now, *chunk, now]
+                )
+                revoked += cursor.rowcount
+        # Этот процесс видит отзыв сразу, остальные — при догрузке
+        transaction.on_commit(lambda: revocation_store.sync(force=True))
+    return revoked
+
+
+def deactivate_users(user_ids):
+    """
+    Деактивировать пользователей и отозвать все их refresh токены.
+
+    Access токены деактивированных пользователей перестают приниматься
+    сразу: аутентификация проверяет is_active, а кэши пользователей
+    сбрасываются по эпохе политики доступа.
+    """
+    user_ids = list(user_ids)
+    with transaction.atomic():
+        deactivated = User.objects.filter(
+            pk__in=user_ids, is_active=True
+        ).update(is_active=False)
+        revoked = revoke_user_tokens(user_ids)
+        policy_epoch.publish()
+    return deactivated, revoked